@@ -0,0 +1,711 @@
+"""
+Asyncio Send Engine for the Automated Government Email System
+Keeps many SMTP conversations in flight over a single event loop, with a
+bounded number of concurrent sends, instead of blocking on socket I/O.
+"""
+
+import asyncio
+import base64
+import itertools
+import re
+import smtplib
+import socket
+import ssl
+import time
+
+from send_single_email import GovernmentEmailSender, ASYNC_SEND_CONFIG
+from mime_stream import DotStuffer, iter_file, iter_message
+from outbox import FAILED, PENDING, SENT, StoredMessage
+from smtp_pool import service_key
+from telemetry import ByteCounter, StageTimer
+
+CRLF = b"\r\n"
+_LINE_ENDINGS = re.compile(rb"\r\n|\n|\r(?!\n)")
+_LEADING_DOTS = re.compile(rb"(?m)^\.")
+
+
+def quote_data(data):
+    """Normalize line endings to CRLF and dot-stuff message data for DATA"""
+    data = _LEADING_DOTS.sub(b"..", _LINE_ENDINGS.sub(CRLF, data))
+    if not data.endswith(CRLF):
+        data += CRLF
+    return data
+
+
+class AsyncSMTPClient:
+    """Minimal ESMTP client built on asyncio streams"""
+
+    def __init__(self, hostname, port, timeout=60, ssl_context=None, connect_timeout=None):
+        self.hostname = hostname
+        self.port = port
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout or timeout
+        self.ssl_context = ssl_context
+        self.local_hostname = socket.getfqdn()
+        self.esmtp_features = {}
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        """Open the TCP connection and read the server greeting"""
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.hostname, self.port), self.connect_timeout
+        )
+        code, message = await self._read_reply()
+        if code != 220:
+            await self.close()
+            raise smtplib.SMTPConnectError(code, message)
+        return code, message
+
+    async def _read_reply(self):
+        """Read a (possibly multi-line) SMTP reply"""
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            lines.append(line[4:].strip())
+            if line[3:4] != b"-":
+                break
+        try:
+            code = int(line[:3])
+        except ValueError:
+            raise smtplib.SMTPResponseException(-1, line)
+        return code, b"\n".join(lines)
+
+    async def execute(self, command):
+        """Send a single command line and return the server reply"""
+        self.writer.write(command.encode("ascii") + CRLF)
+        await self.writer.drain()
+        return await self._read_reply()
+
+    async def ehlo(self):
+        """Identify ourselves and record the advertised ESMTP extensions"""
+        code, message = await self.execute(f"EHLO {self.local_hostname}")
+        if code != 250:
+            raise smtplib.SMTPHeloError(code, message)
+
+        self.esmtp_features = {}
+        for line in message.decode("latin-1").split("\n")[1:]:
+            feature, _, params = line.partition(" ")
+            self.esmtp_features[feature.lower()] = params.strip()
+        return code, message
+
+    async def starttls(self):
+        """Upgrade the connection to TLS"""
+        if "starttls" not in self.esmtp_features:
+            raise smtplib.SMTPNotSupportedError(
+                "STARTTLS extension not supported by server."
+            )
+        code, message = await self.execute("STARTTLS")
+        if code != 220:
+            raise smtplib.SMTPResponseException(code, message)
+
+        context = self.ssl_context or ssl.create_default_context()
+        await self.writer.start_tls(context, server_hostname=self.hostname)
+        self.esmtp_features = {}
+        return code, message
+
+    async def login(self, user, password):
+        """Authenticate with AUTH PLAIN, falling back to AUTH LOGIN"""
+        mechanisms = self.esmtp_features.get("auth", "").upper().split()
+
+        if "PLAIN" in mechanisms or not mechanisms:
+            token = base64.b64encode(f"\0{user}\0{password}".encode("utf-8"))
+            code, message = await self.execute(f"AUTH PLAIN {token.decode('ascii')}")
+        else:
+            code, message = await self.execute("AUTH LOGIN")
+            if code == 334:
+                user_token = base64.b64encode(user.encode("utf-8")).decode("ascii")
+                code, message = await self.execute(user_token)
+            if code == 334:
+                password_token = base64.b64encode(password.encode("utf-8"))
+                code, message = await self.execute(password_token.decode("ascii"))
+
+        if code not in (235, 503):
+            raise smtplib.SMTPAuthenticationError(code, message)
+        return code, message
+
+    async def _start_data(self, from_addr, to_addrs):
+        """Run the envelope and DATA command; returns the refused recipients"""
+        code, message = await self.execute(f"MAIL FROM:<{from_addr}>")
+        if code != 250:
+            await self.execute("RSET")
+            raise smtplib.SMTPSenderRefused(code, message, from_addr)
+
+        refused = {}
+        for recipient in to_addrs:
+            code, message = await self.execute(f"RCPT TO:<{recipient}>")
+            if code not in (250, 251):
+                refused[recipient] = (code, message)
+        if len(refused) == len(to_addrs):
+            await self.execute("RSET")
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, message = await self.execute("DATA")
+        if code != 354:
+            await self.execute("RSET")
+            raise smtplib.SMTPDataError(code, message)
+        return refused
+
+    async def _finish_data(self):
+        """Send the end-of-data marker and read the reply"""
+        self.writer.write(b"." + CRLF)
+        await self.writer.drain()
+        code, message = await self._read_reply()
+        if code != 250:
+            await self.execute("RSET")
+            raise smtplib.SMTPDataError(code, message)
+
+    async def sendmail(self, from_addr, to_addrs, msg):
+        """Send one message; returns the dict of refused recipients like smtplib"""
+        if isinstance(msg, str):
+            msg = msg.encode("utf-8")
+
+        refused = await self._start_data(from_addr, to_addrs)
+        self.writer.write(quote_data(msg))
+        await self._finish_data()
+        return refused
+
+    async def send_chunks(self, from_addr, to_addrs, chunks, stuffed=False):
+        """Send a message given as CRLF byte chunks, dot-stuffing it unless already stuffed
+
+        chunks is a blocking iterator - iter_message reads and encodes
+        attachments from disk - so each chunk is produced in a worker thread
+        and written with flow control, keeping the event loop free and only
+        one chunk in memory.
+        """
+        refused = await self._start_data(from_addr, to_addrs)
+
+        chunks = iter(chunks)
+        stuffer = DotStuffer()
+        tail = CRLF
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            if not stuffed:
+                chunk = stuffer.stuff(chunk)
+            if chunk:
+                tail = (tail + chunk)[-2:]
+                self.writer.write(chunk)
+                await self.writer.drain()
+        if tail != CRLF:
+            self.writer.write(CRLF)
+
+        await self._finish_data()
+        return refused
+
+    async def noop(self):
+        """Check that the server is still responsive"""
+        return await self.execute("NOOP")
+
+    async def quit(self):
+        """Say goodbye and close the connection"""
+        try:
+            await self.execute("QUIT")
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Close the underlying transport without a QUIT"""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+            self.writer = None
+
+
+class AsyncPooledSMTPSession:
+    """An authenticated async SMTP session checked out from the pool"""
+
+    def __init__(self, key, client, max_recipients=None):
+        self.key = key
+        self.client = client
+        self.last_used = time.monotonic()
+        self.messages_sent = 0
+        self.recipients_sent = 0
+        self.max_recipients = max_recipients  # Provider's RCPT limit per session, if any
+
+    async def sendmail(self, from_addr, to_addrs, msg):
+        """Send one message over this session and count it towards recycling"""
+        refused = await self.client.sendmail(from_addr, to_addrs, msg)
+        self.messages_sent += 1
+        self.recipients_sent += len(to_addrs)
+        return refused
+
+    async def send_chunks(self, from_addr, to_addrs, chunks, stuffed=False):
+        """Stream a message given as CRLF byte chunks over this session"""
+        refused = await self.client.send_chunks(from_addr, to_addrs, chunks, stuffed)
+        self.messages_sent += 1
+        self.recipients_sent += len(to_addrs)
+        return refused
+
+    def has_room_for(self, recipient_count):
+        """Whether another message to recipient_count recipients fits the session limit"""
+        if self.max_recipients is None:
+            return True
+        return self.recipients_sent + recipient_count <= self.max_recipients
+
+
+class AsyncSMTPConnectionPool:
+    """Asyncio counterpart of SMTPConnectionPool, sharing its configuration"""
+
+    def __init__(self, config=None, ssl_context=None, stage_timer=None):
+        config = config or {}
+        self.stage_timer = stage_timer or StageTimer(enabled=False)
+        self.timeout = config.get("timeout", 60)
+        self.connect_timeout = config.get("connect_timeout", self.timeout)
+        self.max_idle_seconds = config.get("max_idle_seconds", 120)
+        self.noop_after_seconds = config.get("noop_after_seconds", 15)
+        self.max_messages_per_session = config.get("max_messages_per_session", 50)
+        self.max_sessions_per_service = config.get("max_sessions_per_service", 4)
+        self.ssl_context = ssl_context
+
+        self._idle = {}
+        self._open = {}
+        self._condition = None
+
+    def _get_condition(self):
+        # Created lazily so the pool binds to the loop that actually uses it
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _open_session(self, service):
+        """Connect, upgrade to TLS and authenticate a new SMTP session"""
+        client = AsyncSMTPClient(
+            service["smtp_server"],
+            service["smtp_port"],
+            timeout=self.timeout,
+            ssl_context=self.ssl_context,
+            connect_timeout=self.connect_timeout,
+        )
+        timer = self.stage_timer
+        with timer.span("connect", service=service["name"], transport="smtp"):
+            await client.connect()
+        try:
+            with timer.span("ehlo", service=service["name"]):
+                await client.ehlo()
+            with timer.span("starttls", service=service["name"]):
+                await client.starttls()
+                await client.ehlo()
+            with timer.span("auth", service=service["name"]):
+                await client.login(service["email"], service["password"])
+        except Exception:
+            await client.close()
+            raise
+        return client
+
+    async def _is_healthy(self, session, recipient_count=1):
+        """Check whether an idle session can still be used"""
+        idle_for = time.monotonic() - session.last_used
+        if idle_for > self.max_idle_seconds:
+            return False
+        if session.messages_sent >= self.max_messages_per_session:
+            return False
+        if not session.has_room_for(recipient_count):
+            return False
+        if idle_for < self.noop_after_seconds:
+            return True
+        try:
+            code, _ = await session.client.noop()
+            return code == 250
+        except Exception:
+            return False
+
+    async def acquire(self, service, recipient_count=1):
+        """Check out an authenticated session for a service, opening one if needed
+
+        Idle sessions that cannot take recipient_count more recipients under
+        the service's max_recipients_per_session are recycled.
+        """
+        key = service_key(service)
+        condition = self._get_condition()
+
+        while True:
+            session = None
+            async with condition:
+                while True:
+                    idle_sessions = self._idle.setdefault(key, [])
+                    if idle_sessions:
+                        session = idle_sessions.pop()
+                        break
+                    if self._open.get(key, 0) < self.max_sessions_per_service:
+                        self._open[key] = self._open.get(key, 0) + 1
+                        break
+                    await condition.wait()
+
+            if session is None:
+                break
+
+            # Probed after releasing the condition, as in SMTPConnectionPool.acquire
+            if await self._is_healthy(session, recipient_count):
+                return session
+            await session.client.close()
+            async with condition:
+                self._open[key] -= 1
+                condition.notify()
+
+        try:
+            client = await self._open_session(service)
+        except Exception:
+            async with condition:
+                self._open[key] -= 1
+                condition.notify()
+            raise
+
+        return AsyncPooledSMTPSession(key, client, service.get("max_recipients_per_session"))
+
+    async def release(self, session):
+        """Return a session to the pool after a successful or recoverable send"""
+        session.last_used = time.monotonic()
+
+        if session.messages_sent >= self.max_messages_per_session or not session.has_room_for(1):
+            await self.discard(session)
+            return
+
+        condition = self._get_condition()
+        async with condition:
+            self._idle.setdefault(session.key, []).append(session)
+            condition.notify()
+
+    async def discard(self, session):
+        """Close a session that is broken or has reached its message limit"""
+        try:
+            await session.client.quit()
+        except Exception:
+            await session.client.close()
+
+        condition = self._get_condition()
+        async with condition:
+            self._open[session.key] -= 1
+            condition.notify()
+
+    async def close_all(self):
+        """Quit every idle session in the pool"""
+        condition = self._get_condition()
+        async with condition:
+            idle = [s for sessions in self._idle.values() for s in sessions]
+            for session in idle:
+                self._open[session.key] -= 1
+            self._idle = {}
+            condition.notify_all()
+
+        for session in idle:
+            try:
+                await session.client.quit()
+            except Exception:
+                await session.client.close()
+
+
+class AsyncGovernmentEmailSender(GovernmentEmailSender):
+    """GovernmentEmailSender whose sends run concurrently on an event loop"""
+
+    def __init__(self, email_services=None, ssl_context=None, cache_dir=None):
+        super().__init__(email_services, cache_dir=cache_dir)
+        self.max_concurrency = ASYNC_SEND_CONFIG.get("max_concurrency", 10)
+        self.async_smtp_pool = AsyncSMTPConnectionPool(
+            self.smtp_pool_config, ssl_context=ssl_context, stage_timer=self.stage_timer
+        )
+
+    async def _transmit_once(self, service, msg, recipients):
+        """Async counterpart of GovernmentEmailSender._transmit_once"""
+        if service.get("transport", "smtp") != "smtp":
+            # SMTPS, LMTP and local transports use the blocking implementations
+            return await asyncio.to_thread(
+                GovernmentEmailSender._transmit_once, self, service, msg, recipients
+            )
+
+        with self.stage_timer.span("pace", service=service["name"]):
+            await self.rate_limiter.wait_async(service)
+        started = time.monotonic()
+
+        try:
+            with self.stage_timer.span("acquire", service=service["name"]):
+                session = await self.async_smtp_pool.acquire(service, len(recipients))
+        except smtplib.SMTPAuthenticationError as e:
+            print(f"❌ Authentication failed for {service['name']}: {e}")
+            self.provider_health.record_failure(service, trip=True)
+            return "failed"
+        except (smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected) as e:
+            print(f"❌ Failed to connect to {service['name']} SMTP server: {e}")
+            self.provider_health.record_failure(service)
+            return "failed"
+        except Exception as e:
+            print(f"❌ Unexpected connection error with {service['name']}: {e}")
+            self.provider_health.record_failure(service)
+            return "failed"
+
+        try:
+            chunk_size = self.streaming_config.get("chunk_size_kb", 64) * 1024
+            with self.stage_timer.span(
+                "data", service=service["name"], recipients=len(recipients)
+            ) as span:
+                counter = ByteCounter()
+                if isinstance(msg, StoredMessage) and msg.dot_stuffed:
+                    # Already in DATA wire format - copied as it is read
+                    chunks = itertools.chain(
+                        [msg.header_bytes()],
+                        iter_file(
+                            msg.message_file,
+                            self.streaming_config.get("spool_buffer_kb", 256) * 1024,
+                        ),
+                    )
+                    refused = await session.send_chunks(
+                        service["email"], recipients, counter.wrap(chunks), stuffed=True
+                    )
+                elif isinstance(msg, StoredMessage):
+                    refused = await session.send_chunks(
+                        service["email"], recipients, counter.wrap(msg.iter_chunks(chunk_size))
+                    )
+                elif self.streaming_config.get("enabled", True):
+                    # Generated into DATA chunk by chunk, attachments streamed from disk
+                    refused = await session.send_chunks(
+                        service["email"], recipients, counter.wrap(iter_message(msg, chunk_size))
+                    )
+                else:
+                    # Serializing reads every attachment - keep it off the event loop
+                    data = await asyncio.to_thread(msg.as_bytes)
+                    counter.bytes = len(data)
+                    refused = await session.sendmail(service["email"], recipients, data)
+                span.add("bytes", counter.bytes)
+            await self.async_smtp_pool.release(session)
+        except smtplib.SMTPRecipientsRefused as e:
+            print(f"❌ Recipients refused by {service['name']}: {e}")
+            await self.async_smtp_pool.release(session)
+            return "rejected"
+        except smtplib.SMTPDataError as e:
+            print(f"❌ Data error with {service['name']}: {e}")
+            await self.async_smtp_pool.release(session)
+            self.provider_health.record_failure(service)
+            return "failed"
+        except Exception as e:
+            print(f"❌ Unexpected error sending email with {service['name']}: {e}")
+            await self.async_smtp_pool.discard(session)
+            self.provider_health.record_failure(service)
+            return "failed"
+
+        self.provider_health.record_success(service, time.monotonic() - started)
+        if refused:
+            # Accepted for the others - report who will not receive it
+            print(f"⚠️  {len(refused)}/{len(recipients)} recipients refused by {service['name']}:")
+            for recipient, (code, response) in refused.items():
+                print(f"   {recipient}: {code} {response.decode(errors='replace')}")
+        return "sent"
+
+    async def transmit_message(self, service, msg, recipients):
+        """Async counterpart of GovernmentEmailSender.transmit_message"""
+        outcome, _ = await self._transmit_with_failover(service, msg, recipients)
+        return outcome == "sent"
+
+    async def _transmit_with_failover(self, service, msg, recipients):
+        """Async counterpart of GovernmentEmailSender._transmit_with_failover"""
+        if self.failover_config.get("enabled", True):
+            candidates = self.provider_health.failover_order(service, self.email_services)
+        else:
+            candidates = [service]
+
+        if not candidates:
+            print("❌ No healthy email service available - all circuits are open")
+            return "failed", None
+
+        if self.quota_ledger is not None:
+            with_capacity = [
+                c for c in candidates if self.quota_ledger.has_capacity(c, len(recipients))
+            ]
+            if not with_capacity:
+                print("⏸️  Every available service has used its daily quota")
+                return "deferred", None
+            candidates = with_capacity
+
+        for attempt, candidate in enumerate(candidates):
+            if attempt or candidate is not service:
+                print(f"🔁 Failing over to {candidate['name']} ({candidate['email']})")
+            if msg["From"] != candidate["email"]:
+                msg.replace_header("From", candidate["email"])
+
+            quota_token = None
+            if self.quota_ledger is not None:
+                quota_token = self.quota_ledger.reserve(candidate, len(recipients))
+                if quota_token is None:
+                    # Another task took the last of this account's quota
+                    continue
+            if not self.provider_health.allow_request(candidate):
+                if quota_token is not None:
+                    self.quota_ledger.release(candidate, len(recipients), quota_token)
+                continue
+            try:
+                outcome = await self._transmit_once(candidate, msg, recipients)
+            finally:
+                self.provider_health.end_request(candidate)
+            if outcome != "sent" and quota_token is not None:
+                self.quota_ledger.release(candidate, len(recipients), quota_token)
+            if outcome in ("sent", "rejected"):
+                return outcome, candidate
+
+        return "failed", None
+
+    async def send_messages(self, messages):
+        """Send many (service, msg, recipients) jobs with bounded concurrency"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send_one(service, msg, recipients):
+            async with semaphore:
+                return await self.transmit_message(service, msg, recipients)
+
+        return await asyncio.gather(
+            *(send_one(service, msg, recipients) for service, msg, recipients in messages)
+        )
+
+    async def send_email_fan_out(self, service, template):
+        """Async counterpart of GovernmentEmailSender.send_email_fan_out"""
+        distribution = self._get_email_distribution_list()
+        recipients = distribution["to"] + distribution["cc"] + distribution["bcc"]
+
+        # Render the body and encode attachments once for every copy
+        shared_parts = await asyncio.to_thread(self.build_shared_parts, template)
+        print(f"📧 Fanning out {len(recipients)} individual emails (max {self.max_concurrency} in flight)")
+
+        services = self.assign_services(service, len(recipients))
+        results = await self.send_messages(
+            (
+                recipient_service,
+                self.build_recipient_message(
+                    recipient_service, template, shared_parts, recipient
+                ),
+                [recipient],
+            )
+            for recipient, recipient_service in zip(recipients, services)
+        )
+
+        failed = [recipient for recipient, sent in zip(recipients, results) if not sent]
+        delivered = len(recipients) - len(failed)
+        print(f"📬 Delivered {delivered}/{len(recipients)} individual emails")
+        for recipient in failed:
+            print(f"⚠️  Not delivered: {recipient}")
+
+        return {"delivered": delivered, "failed": failed, "total": len(recipients)}
+
+    async def send_email_batched(self, service, template):
+        """Async counterpart of GovernmentEmailSender.send_email_batched"""
+        batches = self.plan_recipient_batches()
+        # Encoding attachments reads media from disk - keep it off the event loop
+        shared_parts = await asyncio.to_thread(self.build_shared_parts, template)
+        if shared_parts["content_type"] == "html":
+            print(f"📧 Creating multipart HTML email")
+        else:
+            print(f"📧 Creating plain text email")
+
+        services = self.assign_services(service, len(batches))
+        results = await self.send_messages(
+            (
+                batch_service,
+                self.build_batch_message(batch_service, template, shared_parts, batch),
+                batch["recipients"],
+            )
+            for batch, batch_service in zip(batches, services)
+        )
+        return self.summarize_batches(batches, results)
+
+    async def _deliver_stored(self, message):
+        """Async counterpart of GovernmentEmailSender._deliver_stored"""
+        service = self.stored_message_service(message)
+        outcome, sent_via = await self._transmit_with_failover(
+            service, message, message.recipients
+        )
+        return self.record_delivery(message, outcome, sent_via)
+
+    async def drain_outbox(self):
+        """Deliver every ready outbox message with max_concurrency leasing tasks
+
+        The outbox is a local SQLite file, so leasing and recording outcomes
+        are short enough to run on the event loop thread.
+        """
+        max_wait, deadline = self.retry_wait_limits()
+        results = {SENT: 0, PENDING: 0, FAILED: 0}
+
+        async def work(worker_id):
+            while True:
+                message = self.outbox.lease(worker_id)
+                if message is None:
+                    # Wait for a retry that is due soon; leave later ones to the next run
+                    wait = self.outbox.next_ready_in()
+                    if not self.should_wait_for_retry(wait, max_wait, deadline):
+                        return
+                    await asyncio.sleep(max(wait, 0.1))
+                    continue
+                results[await self._deliver_stored(message)] += 1
+
+        print(f"📤 Draining outbox with {self.max_concurrency} tasks")
+        with self.stage_timer.span("drain", workers=self.max_concurrency):
+            await asyncio.gather(*(work(worker_id) for worker_id in range(self.max_concurrency)))
+        return results
+
+    async def send_email_via_outbox(self, service, template, campaign):
+        """Async counterpart of GovernmentEmailSender.send_email_via_outbox"""
+
+        def render():
+            # Spooling writes and fsyncs every message - done in a worker thread
+            try:
+                return self.render_campaign(service, template, campaign)
+            finally:
+                self.outbox.close()
+
+        await asyncio.to_thread(render)
+        return self.summarize_outbox(await self.drain_outbox(), campaign)
+
+    async def send_email(self, service, template, campaign=None):
+        """Async counterpart of GovernmentEmailSender.send_email"""
+        try:
+            content_type = template.get("content_type", "plain")
+
+            if self.outbox is not None and campaign is not None:
+                result = await self.send_email_via_outbox(service, template, campaign)
+                if not result["delivered"]:
+                    return False
+                total = result["total"]
+            elif self.email_distribution_config.get("fan_out", False):
+                result = await self.send_email_fan_out(service, template)
+                if not result["delivered"]:
+                    return False
+                total = result["total"]
+            else:
+                result = await self.send_email_batched(service, template)
+                if not result["delivered"]:
+                    return False
+                print(f"✅ Email sent successfully")
+                total = result["total"]
+
+            print(f"📧 Service: {service['name']}")
+            print(f"📧 Template: {template['name']} ({template['language']}) - {content_type.upper()}")
+            print(f"📧 Subject: {template['subject'][:50]}...")
+            print(f"👥 Recipients: {total}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Unexpected error in send_email: {e}")
+            return False
+
+    async def send_daily_emails(self):
+        """Async counterpart of GovernmentEmailSender.send_daily_emails"""
+        with self.timed_run("run.async"):
+            selection = self.prepare_daily_campaign()
+            if selection is None:
+                return False
+            service, template_type, template = selection
+
+            try:
+                success = await self.send_email(service, template, self.campaign_id(template_type))
+            finally:
+                await self.async_smtp_pool.close_all()
+                self._finish_run()
+
+        if success:
+            print("✅ Email campaign completed successfully")
+        else:
+            print("❌ Email campaign failed")
+
+        return success
@@ -0,0 +1,131 @@
+"""
+Attachment Cache for the Automated Government Email System
+Content-addressed on-disk cache of base64-encoded attachment payloads, so
+unchanged media costs a cache lookup instead of a read plus encode.
+"""
+
+import hashlib
+import json
+import threading
+from email import encoders
+from email.mime.base import MIMEBase
+from pathlib import Path
+
+INDEX_FILE = "index.json"
+BLOB_SUFFIX = ".b64"
+
+
+class AttachmentCache:
+    """Encoded attachment payloads keyed by path, size, mtime and content hash"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / INDEX_FILE
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self):
+        """Load the path -> (size, mtime, sha256) index"""
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Attachment cache index unreadable, rebuilding: {e}")
+            return {}
+
+    def _blob_path(self, content_hash):
+        return self.cache_dir / f"{content_hash}{BLOB_SUFFIX}"
+
+    def _lookup(self, file_path, stat):
+        """Content hash recorded for an unchanged file, or None"""
+        entry = self._index.get(str(file_path))
+        if (
+            entry
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and self._blob_path(entry["sha256"]).exists()
+        ):
+            return entry["sha256"]
+        return None
+
+    def get_encoded_path(self, file_path, content_hash=None):
+        """Path of the cached encoded payload for a file, encoding it on a miss"""
+        file_path = Path(file_path).absolute()
+        stat = file_path.stat()
+
+        # Counters share the index lock - attachments are built from worker threads
+        with self._lock:
+            cached_hash = self._lookup(file_path, stat)
+            if cached_hash and (content_hash is None or content_hash == cached_hash):
+                self.hits += 1
+                return self._blob_path(cached_hash)
+
+        # A hash supplied by the media manifest identifies the blob without a read
+        if content_hash and self._blob_path(content_hash).exists():
+            with self._lock:
+                self.hits += 1
+                self._index[str(file_path)] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": content_hash,
+                }
+            return self._blob_path(content_hash)
+
+        data = file_path.read_bytes()
+        content_hash = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(content_hash)
+
+        # Same content seen under another name or before a touch needs no re-encode
+        if not blob_path.exists():
+            part = MIMEBase("application", "octet-stream")
+            part.set_payload(data)
+            encoders.encode_base64(part)
+            tmp_path = blob_path.with_suffix(".tmp")
+            tmp_path.write_text(part.get_payload(), encoding="ascii")
+            tmp_path.replace(blob_path)
+
+        with self._lock:
+            self.misses += 1
+            self._index[str(file_path)] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": content_hash,
+            }
+        return blob_path
+
+    def get_encoded(self, file_path, content_hash=None):
+        """Base64 payload for a file, exactly as encoders.encode_base64 produces it"""
+        return self.get_encoded_path(file_path, content_hash).read_text(encoding="ascii")
+
+    def build_part(self, file_path, content_hash=None):
+        """Attachment MIME part whose encoded payload comes from the cache"""
+        part = MIMEBase("application", "octet-stream")
+        part.set_payload(self.get_encoded(file_path, content_hash))
+        part["Content-Transfer-Encoding"] = "base64"
+        return part
+
+    def save(self):
+        """Persist the index and drop blobs no longer referenced by existing files"""
+        with self._lock:
+            self._index = {
+                path: entry for path, entry in self._index.items() if Path(path).exists()
+            }
+            index = dict(self._index)
+
+        try:
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=2)
+            tmp_file.replace(self.index_file)
+
+            referenced = {entry["sha256"] for entry in index.values()}
+            for blob_path in self.cache_dir.glob(f"*{BLOB_SUFFIX}"):
+                if blob_path.stem not in referenced:
+                    blob_path.unlink()
+        except OSError as e:
+            print(f"⚠️  Could not save attachment cache: {e}")
@@ -0,0 +1,231 @@
+"""
+Send Path Benchmark for the Automated Government Email System
+Drives GovernmentEmailSender.transmit_message against the local SMTP sink
+and reports messages/sec, bytes/sec and per-stage latency percentiles across
+message sizes and recipient counts. Caches, state and the outbox live in a
+temporary directory, so a benchmark never touches the real .cache.
+
+Usage:
+    python benchmark.py --sizes 10,1024,5120 --recipients 1,10,50 --messages 50
+    python benchmark.py --mode spool         # outbox spool files copied to the socket
+    python benchmark.py --transport null     # everything but the network
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from email.mime.text import MIMEText
+from pathlib import Path
+
+from smtp_pool import service_key
+from smtp_sink import SMTPSinkServer
+from telemetry import NOOP_SPAN
+
+# Spans recorded by the sender for each message (see GovernmentEmailSender._transmit_once)
+STAGES = ("build", "spool", "pace", "acquire", "data")
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_shared_parts(sender, work_dir, size_kb):
+    """Body plus one synthetic attachment of size_kb, attached the way media files are"""
+    attachment = Path(work_dir) / f"benchmark-{size_kb}kb.bin"
+    if not attachment.exists():
+        attachment.write_bytes(os.urandom(size_kb * 1024))
+
+    body = MIMEText("<html><body><p>Benchmark message</p></body></html>", "html", "utf-8")
+    parts = [body] + sender._build_attachment_parts([attachment], NOOP_SPAN)
+    return {"content_type": "html", "parts": parts}
+
+
+def send_one(sender, service, msg, recipients, mode, key):
+    """Send one built message through transmit_message, via the outbox in spool mode"""
+    if mode == "spool":
+        sender._spool_message(key, "benchmark", service_key(service), recipients, msg)
+        msg = sender.outbox.lease("benchmark")
+        if not sender.transmit_message(service, msg, recipients):
+            return False
+        return sender.outbox.mark_sent(msg, service["name"])
+    return sender.transmit_message(service, msg, recipients)
+
+
+def run_case(sender, service, shared_parts, size_kb, recipient_count, messages, mode):
+    """Send messages of one size/recipient combination and collect stage timings"""
+    recipients = [f"recipient{i}@localhost.test" for i in range(recipient_count)]
+    template = {"subject": f"Benchmark {size_kb}KB x {recipient_count}"}
+    batch = {"to": recipients, "cc": [], "bcc": [], "recipients": recipients}
+    sender.stage_timer.reset()
+
+    started = time.perf_counter()
+    for number in range(messages):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            msg = sender.build_batch_message(service, template, shared_parts, batch)
+            sent = send_one(
+                sender, service, msg, recipients, mode, f"{size_kb}:{recipient_count}:{number}"
+            )
+        if not sent:
+            print(output.getvalue(), end="")
+            raise RuntimeError(f"Benchmark message {number + 1} was not delivered")
+    elapsed = time.perf_counter() - started
+
+    timings = {stage: [] for stage in STAGES}
+    total_bytes = 0
+    for span in sender.stage_timer.spans:
+        if span.name in timings:
+            timings[span.name].append(span.duration)
+        if span.name == "data":
+            total_bytes += span.attributes.get("bytes", 0)
+
+    return {
+        "size_kb": size_kb,
+        "recipients": recipient_count,
+        "messages": messages,
+        "mode": mode,
+        "seconds": elapsed,
+        "messages_per_sec": messages / elapsed,
+        "bytes_per_sec": total_bytes / elapsed,
+        "stages": {
+            stage: {
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "mean_ms": statistics.fmean(samples) * 1000,
+            }
+            for stage, samples in timings.items()
+            if samples
+        },
+    }
+
+
+def print_report(results):
+    """Print a human-readable summary table"""
+    print("\n📊 Benchmark Results")
+    print("=" * 60)
+    for result in results:
+        print(
+            f"\n📦 {result['size_kb']}KB x {result['recipients']} recipients ({result['mode']}) - "
+            f"{result['messages']} messages in {result['seconds']:.2f}s"
+        )
+        print(
+            f"   🚀 {result['messages_per_sec']:.1f} msg/s, "
+            f"{result['bytes_per_sec'] / (1024 * 1024):.2f} MB/s"
+        )
+        for stage, stats in result["stages"].items():
+            print(
+                f"   {stage:<10} p50 {stats['p50_ms']:8.2f}ms  "
+                f"p95 {stats['p95_ms']:8.2f}ms  p99 {stats['p99_ms']:8.2f}ms"
+            )
+
+
+def parse_int_list(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the email send path against a local SMTP sink")
+    parser.add_argument("--sizes", type=parse_int_list, default=[10, 1024, 5120], help="Attachment sizes in KB")
+    parser.add_argument("--recipients", type=parse_int_list, default=[1, 25], help="Recipient counts")
+    parser.add_argument("--messages", type=int, default=20, help="Messages per size/recipient combination")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial sink latency per reply")
+    parser.add_argument("--no-pool", action="store_true", help="Open a new SMTP session for every message")
+    parser.add_argument(
+        "--transport",
+        choices=["smtp", "smtps", "lmtp", "null", "file"],
+        default="smtp",
+        help="Send to the sink over SMTP/SMTPS/LMTP, or through a local null or file transport",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["stream", "string", "spool"],
+        default="stream",
+        help="Stream messages into DATA, send them as one string, or render to outbox spool files first",
+    )
+    parser.add_argument("--json", metavar="FILE", help="Also write results as JSON to FILE")
+    args = parser.parse_args()
+
+    # Imported here so sender start-up output appears after argument errors
+    from send_single_email import GovernmentEmailSender
+    from transports import LOCAL_SERVICE_DEFAULTS, LOCAL_TRANSPORTS
+
+    if args.transport in LOCAL_TRANSPORTS:
+        server = None
+        service = dict(
+            LOCAL_SERVICE_DEFAULTS,
+            name=f"{args.transport.capitalize()} transport",
+            email="benchmark@localhost.test",
+            transport=args.transport,
+        )
+    else:
+        server = SMTPSinkServer(latency=args.latency_ms / 1000, protocol=args.transport).start()
+        print(f"📭 {args.transport.upper()} sink listening on 127.0.0.1:{server.port}")
+        service = server.service()
+    # Measure the send path, not the anti-spam pacing or the daily quota
+    service.update(paced=False, daily_quota=10**9)
+
+    with tempfile.TemporaryDirectory(prefix="email-benchmark-") as work_dir:
+        try:
+            sender = GovernmentEmailSender(email_services=[service], cache_dir=work_dir)
+            sender.stage_timer.enabled = True
+            if args.mode == "string":
+                sender.streaming_config = dict(sender.streaming_config, enabled=False)
+            if args.mode == "spool" and sender.outbox is None:
+                sender.outbox = sender.open_outbox()
+            if args.no_pool:
+                sender.smtp_pool.max_messages_per_session = 1
+
+            results = []
+            for size_kb in args.sizes:
+                shared_parts = build_shared_parts(sender, work_dir, size_kb)
+                for recipient_count in args.recipients:
+                    results.append(
+                        run_case(
+                            sender,
+                            service,
+                            shared_parts,
+                            size_kb,
+                            recipient_count,
+                            args.messages,
+                            args.mode,
+                        )
+                    )
+            sender.smtp_pool.close_all()
+            if sender.outbox is not None:
+                sender.outbox.close()
+        finally:
+            if server is not None:
+                server.stop()
+
+    print_report(results)
+    if server is None:
+        transport = sender.transport_for(service)
+        print(f"\n📭 {service['name']} accepted {transport.messages_sent} messages")
+    else:
+        print(
+            f"\n📭 Sink received {server.stats.messages} messages over "
+            f"{server.stats.connections} connections"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
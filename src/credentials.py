@@ -0,0 +1,100 @@
+"""
+Account Credentials for the Automated Government Email System
+Collects every sending account for each provider, from indexed environment
+variables (GMAIL_EMAIL, GMAIL_EMAIL_2, GMAIL_EMAIL_3, ...) and an optional
+JSON credentials file, so daily capacity grows with each account added.
+
+Credentials file format (a file path, or the JSON itself in a secret):
+
+    {
+        "Gmail": [
+            {"email": "first@gmail.com", "password": "app password"},
+            {"email": "second@gmail.com", "password": "app password", "daily_quota": 300}
+        ],
+        "Outlook": [{"email": "someone@outlook.com", "password": "..."}]
+    }
+"""
+
+import json
+import os
+from pathlib import Path
+
+CREDENTIALS_FILE_ENV = "EMAIL_CREDENTIALS_FILE"  # Path of a credentials file
+CREDENTIALS_JSON_ENV = "EMAIL_CREDENTIALS_JSON"  # Credentials file contents (GitHub secret)
+
+
+def indexed_env_accounts(provider, max_accounts=20):
+    """Accounts from env_email/env_password, then the same names suffixed _2, _3, ...
+
+    A missing index is skipped rather than ending the scan, so one account
+    can be removed without renumbering the others.
+    """
+    accounts = []
+    for index in range(1, max_accounts + 1):
+        suffix = "" if index == 1 else f"_{index}"
+        email = os.getenv(provider["env_email"] + suffix)
+        password = os.getenv(provider["env_password"] + suffix)
+        if email and password:
+            accounts.append({"email": email.strip(), "password": password})
+    return accounts
+
+
+def load_credentials_file(path=None):
+    """Accounts per provider name from the credentials file or secret, {} if there is none"""
+    text = os.getenv(CREDENTIALS_JSON_ENV)
+    path = os.getenv(CREDENTIALS_FILE_ENV) or path
+    source = CREDENTIALS_JSON_ENV
+    if not text and path:
+        path = Path(path)
+        if not path.is_absolute():
+            path = Path(__file__).parent.parent / path
+        source = str(path)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError as e:
+            print(f"⚠️  Could not read credentials file {path}: {e}")
+            return {}
+    if not text:
+        return {}
+
+    try:
+        saved = json.loads(text)
+        return {
+            provider: [dict(account) for account in accounts]
+            for provider, accounts in saved.items()
+        }
+    except (ValueError, AttributeError, TypeError) as e:
+        # Never echo the contents - they hold passwords
+        print(f"⚠️  Ignoring malformed credentials in {source}: {type(e).__name__}")
+        return {}
+
+
+def provider_accounts(provider, file_accounts, max_accounts=20):
+    """Every account of one provider - environment first, then the credentials file
+
+    Accounts are de-duplicated by address; each keeps its own settings
+    (for example a lower daily_quota for a new account).
+    """
+    accounts = []
+    seen = set()
+    for account in indexed_env_accounts(provider, max_accounts) + file_accounts.get(
+        provider["name"], []
+    ):
+        email = account.get("email")
+        if not email or not account.get("password"):
+            print(f"⚠️  Skipping {provider['name']} account without an email and password")
+            continue
+        if email.lower() in seen:
+            continue
+        seen.add(email.lower())
+        accounts.append(account)
+    return accounts
+
+
+def account_name(provider_name, number):
+    """Display name of a provider's nth account - the first keeps the provider's name
+
+    Numbers follow the accounts currently configured, so state is keyed by
+    provider and address (smtp_pool.service_key), never by this name.
+    """
+    return provider_name if number == 1 else f"{provider_name} #{number}"
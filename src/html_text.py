@@ -0,0 +1,142 @@
+"""
+HTML to Plain Text Conversion for the Automated Government Email System
+Single-pass html.parser converter that produces the text/plain alternative
+of HTML emails: entities decoded, block elements on their own lines, list
+items bulleted or numbered, and head/style/script content dropped.
+"""
+
+from functools import lru_cache
+from html.parser import HTMLParser
+
+# Elements that start and end on their own line
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "header", "li",
+    "main", "nav", "section", "tr",
+}
+# Blocks separated from their neighbours by a blank line
+PARAGRAPH_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "ol", "ul", "table", "pre", "hr"}
+# Elements whose content never appears in the text version
+SKIP_TAGS = {"head", "script", "style", "title", "template"}
+VOID_TAGS = {"br", "hr", "img", "meta", "link", "input", "col", "area", "base", "wbr"}
+
+
+class HTMLTextConverter(HTMLParser):
+    """Collects the readable text of an HTML document line by line"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self.current = []
+        self.indent = ""  # Leading indent of the current line (nested list items)
+        self.blank_pending = False
+        self.skip_depth = 0
+        self.pre_depth = 0
+        self.lists = []  # [tag, items seen] for each open ol/ul
+        self.links = []  # (href, index into current) for each open <a>
+
+    def _flush(self):
+        """End the current line, if it has any text"""
+        text = "".join(self.current)
+        self.current = []
+        text = text.rstrip() if self.pre_depth else " ".join(text.split())
+        indent, self.indent = self.indent, ""
+        if not text:
+            return
+        text = indent + text
+        if self.blank_pending and self.lines:
+            self.lines.append("")
+        self.blank_pending = False
+        self.lines.append(text)
+
+    def _break(self, paragraph=False):
+        self._flush()
+        if paragraph:
+            self.blank_pending = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+
+        if tag == "br":
+            self._flush()
+        elif tag == "li":
+            self._break()
+            self.indent = "  " * max(0, len(self.lists) - 1)
+            if self.lists and self.lists[-1][0] == "ol":
+                self.lists[-1][1] += 1
+                self.current.append(f"{self.lists[-1][1]}. ")
+            else:
+                self.current.append("• ")
+        elif tag in ("ol", "ul"):
+            # Nested lists continue the enclosing list without a blank line
+            self._break(paragraph=not self.lists)
+            self.lists.append([tag, 0])
+        elif tag in PARAGRAPH_TAGS:
+            self._break(paragraph=True)
+            if tag == "pre":
+                self.pre_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._break()
+        elif tag in ("td", "th"):
+            self.current.append(" ")
+        elif tag == "a":
+            self.links.append((dict(attrs).get("href"), len(self.current)))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+
+        if tag in ("ol", "ul"):
+            if self.lists and self.lists[-1][0] == tag:
+                self.lists.pop()
+            self._break(paragraph=not self.lists)
+        elif tag in PARAGRAPH_TAGS:
+            if tag == "pre":
+                self._flush()
+                self.pre_depth = max(0, self.pre_depth - 1)
+            self._break(paragraph=True)
+        elif tag in BLOCK_TAGS:
+            self._break()
+        elif tag == "a" and self.links:
+            href, start = self.links.pop()
+            text = "".join(self.current[min(start, len(self.current)):]).strip()
+            # Keep the target of links whose text does not already show it
+            if href and not href.startswith(("#", "mailto:")) and href not in text:
+                self.current.append(f" ({href})")
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if not self.pre_depth:
+            self.current.append(data)
+            return
+        lines = data.split("\n")
+        for line in lines[:-1]:
+            self.current.append(line)
+            self._flush()
+        self.current.append(lines[-1])
+
+    def get_text(self):
+        self.close()
+        self._flush()
+        return "\n".join(self.lines)
+
+
+@lru_cache(maxsize=32)
+def html_to_text(html_content):
+    """Plain-text rendering of an HTML document (cached by content)"""
+    converter = HTMLTextConverter()
+    converter.feed(html_content)
+    return converter.get_text()
@@ -0,0 +1,76 @@
+"""
+Weighted Load Balancing for the Automated Government Email System
+Spreads a run's messages across every configured email service in
+proportion to each provider's sustainable sending rate.
+"""
+
+import threading
+from functools import reduce
+from math import gcd
+
+DEFAULT_MESSAGES_PER_MINUTE = 20
+DEFAULT_DAILY_QUOTA = 500
+MINUTES_PER_DAY = 24 * 60
+
+
+def service_weight(service, quota_window_minutes=MINUTES_PER_DAY):
+    """Sustainable messages per minute for a service, from throughput and quota"""
+    if service.get("weight"):
+        return float(service["weight"])
+
+    per_minute = service.get("messages_per_minute", DEFAULT_MESSAGES_PER_MINUTE)
+    quota_rate = service.get("daily_quota", DEFAULT_DAILY_QUOTA) / quota_window_minutes
+    return min(per_minute, quota_rate)
+
+
+class WeightedServiceBalancer:
+    """Smooth weighted round-robin over the configured email services"""
+
+    def __init__(self, services, quota_window_minutes=MINUTES_PER_DAY, offset=0):
+        if not services:
+            raise ValueError("No email services available")
+
+        self.services = list(services)
+        self.weights = self._integer_weights(
+            [service_weight(s, quota_window_minutes) for s in self.services]
+        )
+        self.total_weight = sum(self.weights)
+        self._current = [0] * len(self.services)
+        self._lock = threading.Lock()
+
+        # Rotate the starting point so one-message runs still share the load
+        for _ in range(offset % self.total_weight):
+            self._advance()
+
+    @staticmethod
+    def _integer_weights(weights):
+        """Scale weights to small integers so the rotation period stays short"""
+        smallest = min(w for w in weights if w > 0) if any(weights) else 1
+        scaled = [max(1, round(w / smallest * 10)) for w in weights]
+        divisor = reduce(gcd, scaled)
+        return [w // divisor for w in scaled]
+
+    def _advance(self):
+        """Pick the next index using nginx-style smooth weighted round-robin"""
+        for i, weight in enumerate(self.weights):
+            self._current[i] += weight
+        best = max(range(len(self.services)), key=lambda i: self._current[i])
+        self._current[best] -= self.total_weight
+        return best
+
+    def next_service(self):
+        """Return the service that should carry the next message"""
+        with self._lock:
+            return self.services[self._advance()]
+
+    def assign(self, count):
+        """Return a service for each of the next count messages"""
+        with self._lock:
+            return [self.services[self._advance()] for _ in range(count)]
+
+    def describe(self):
+        """Human-readable share of traffic per service"""
+        return [
+            f"{service['name']} ({service['email']}): {weight / self.total_weight:.0%}"
+            for service, weight in zip(self.services, self.weights)
+        ]
@@ -0,0 +1,164 @@
+"""
+Media Manifest for the Automated Government Email System
+Persisted index of the media folder (size, mtime, content hash, MIME type
+and the location parsed from each filename), refreshed incrementally so a
+run only re-reads files that actually changed.
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+HASH_READ_SIZE = 1024 * 1024
+
+# "Major Pothole - Ali View Main Blvd - 31.4926619,74.4020901"
+FILENAME_PATTERN = re.compile(
+    r"^(?P<issue>.+?) - (?P<location>.+) - "
+    r"(?P<latitude>-?\d+(?:\.\d+)?),\s*(?P<longitude>-?\d+(?:\.\d+)?)$"
+)
+
+
+def parse_media_filename(file_name):
+    """Issue, location and coordinates encoded in a media filename (None if absent)"""
+    match = FILENAME_PATTERN.match(Path(file_name).stem)
+    if not match:
+        return {"issue": None, "location": None, "latitude": None, "longitude": None}
+    return {
+        "issue": match["issue"],
+        "location": match["location"],
+        "latitude": float(match["latitude"]),
+        "longitude": float(match["longitude"]),
+    }
+
+
+def hash_file(file_path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_READ_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaManifest:
+    """Media folder index persisted between runs and refreshed from mtimes"""
+
+    def __init__(self, state_file=None, extensions=None, trust_directory_mtime=False):
+        self.state_file = Path(state_file) if state_file else None
+        self.extensions = extensions
+        # Skip per-file stats while the folder mtime is unchanged. Only safe when
+        # files are added/removed/renamed rather than rewritten in place.
+        self.trust_directory_mtime = trust_directory_mtime
+        self.media_dir = None
+        self.dir_mtime_ns = None
+        self.files = {}
+        self.rehashed = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Restore the manifest written by an earlier run"""
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") != MANIFEST_VERSION:
+                return
+            self.media_dir = Path(saved["media_dir"]) if saved.get("media_dir") else None
+            self.dir_mtime_ns = saved.get("dir_mtime_ns")
+            self.files = saved.get("files", {})
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Media manifest unreadable, rebuilding: {e}")
+
+    def save(self):
+        """Persist the manifest if the last refresh changed it"""
+        if not self.state_file or not self._dirty:
+            return
+        snapshot = {
+            "version": MANIFEST_VERSION,
+            "media_dir": str(self.media_dir) if self.media_dir else None,
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "files": self.files,
+        }
+        try:
+            tmp_file = self.state_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+            tmp_file.replace(self.state_file)
+            self._dirty = False
+        except OSError as e:
+            print(f"⚠️  Could not save media manifest: {e}")
+
+    def cached_media_dir(self):
+        """Media directory found by an earlier run, if it still exists"""
+        if self.media_dir and self.media_dir.is_dir():
+            return self.media_dir
+        return None
+
+    def _build_entry(self, entry, stat):
+        """Manifest record for a new or changed file"""
+        record = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": None,
+            "mime_type": mimetypes.guess_type(entry.name)[0] or "application/octet-stream",
+        }
+        record.update(parse_media_filename(entry.name))
+        # Only supported media gets hashed - skipped files are never attached
+        if self.extensions is None or Path(entry.name).suffix.lower() in self.extensions:
+            record["sha256"] = hash_file(entry.path)
+            self.rehashed += 1
+        return record
+
+    def refresh(self, media_dir):
+        """Bring the manifest in line with media_dir, re-reading only changed files"""
+        media_dir = Path(media_dir).absolute()
+        dir_mtime_ns = media_dir.stat().st_mtime_ns
+        self.rehashed = 0
+
+        if (
+            self.trust_directory_mtime
+            and media_dir == self.media_dir
+            and dir_mtime_ns == self.dir_mtime_ns
+        ):
+            return self.files
+
+        if media_dir != self.media_dir:
+            self.files = {}
+        previous = self.files
+        files = {}
+
+        with os.scandir(media_dir) as entries:
+            for entry in entries:
+                # Skip directories and hidden files
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                record = previous.get(entry.name)
+                if (
+                    record is None
+                    or record["size"] != stat.st_size
+                    or record["mtime_ns"] != stat.st_mtime_ns
+                ):
+                    record = self._build_entry(entry, stat)
+                files[entry.name] = record
+
+        if files != previous or media_dir != self.media_dir or dir_mtime_ns != self.dir_mtime_ns:
+            self._dirty = True
+        self.media_dir = media_dir
+        self.dir_mtime_ns = dir_mtime_ns
+        self.files = files
+        return files
+
+    def content_hash(self, file_path):
+        """Recorded SHA-256 for a file in the media directory, or None"""
+        file_path = Path(file_path)
+        if self.media_dir is None or file_path.absolute().parent != self.media_dir:
+            return None
+        record = self.files.get(file_path.name)
+        return record["sha256"] if record else None
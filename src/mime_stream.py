@@ -0,0 +1,320 @@
+"""
+Streaming MIME Serialization for the Automated Government Email System
+Writes a message to the SMTP DATA phase in chunks as it is generated,
+streaming attachments from disk, so peak memory stays roughly constant
+regardless of how much media is attached.
+"""
+
+import base64
+import io
+import os
+from email.generator import BytesGenerator
+from email.mime.base import MIMEBase
+from pathlib import Path
+
+# smtplib and ssl are imported by the functions that talk to a server, so
+# rendering messages into the outbox never loads them
+
+CRLF = b"\r\n"
+RAW_READ_SIZE = 57 * 1024  # Multiple of 57 bytes -> whole 76-character base64 lines
+SPOOL_BUFFER_SIZE = 256 * 1024
+
+
+class StreamedAttachment(MIMEBase):
+    """Base64 attachment whose payload stays on disk until it is sent
+
+    source_path is either the original file or, when source_is_encoded is
+    True, a file already holding the encoded payload (an attachment cache blob).
+    """
+
+    def __init__(self, source_path, source_is_encoded=False):
+        self._inline_payload = None
+        super().__init__("application", "octet-stream")
+        self.source_path = Path(source_path)
+        self.source_is_encoded = source_is_encoded
+        self["Content-Transfer-Encoding"] = "base64"
+
+    # email.generator reads _payload directly - load it on demand so
+    # non-streaming serialization (as_string/as_bytes) keeps working
+    @property
+    def _payload(self):
+        if self._inline_payload is not None or not hasattr(self, "source_path"):
+            return self._inline_payload
+        return b"".join(self.iter_encoded(linesep=b"\n")).decode("ascii")
+
+    @_payload.setter
+    def _payload(self, value):
+        self._inline_payload = value
+
+    def is_multipart(self):
+        # Avoid Message.is_multipart, which would load the payload to check it
+        return False
+
+    def iter_encoded(self, chunk_size=RAW_READ_SIZE, linesep=CRLF):
+        """Yield the encoded payload in chunks, exactly as encode_base64 lays it out"""
+        with open(self.source_path, "rb") as f:
+            if self.source_is_encoded:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk.replace(b"\n", linesep) if linesep != b"\n" else chunk
+
+            pending = b""
+            last_byte = b""
+            while True:
+                data = f.read(RAW_READ_SIZE)
+                if not data:
+                    break
+                last_byte = data[-1:]
+                if pending:
+                    yield pending
+                pending = base64.encodebytes(data)
+                if linesep != b"\n":
+                    pending = pending.replace(b"\n", linesep)
+
+            # encode_base64 drops the final newline unless the data itself ends with one
+            if pending:
+                if last_byte != b"\n" and pending.endswith(linesep):
+                    pending = pending[: -len(linesep)]
+                yield pending
+
+
+def _header_bytes(part, policy):
+    """Folded header block of a part, followed by the blank separator line"""
+    return b"".join(policy.fold_binary(name, value) for name, value in part.raw_items()) + CRLF
+
+
+def iter_part(part, policy):
+    """Yield a part (recursively) as CRLF-terminated byte chunks"""
+    if part.is_multipart():
+        boundary = part.get_boundary()
+        if not boundary:
+            boundary = f"==============={os.urandom(16).hex()}=="
+            part.set_boundary(boundary)
+        boundary = boundary.encode("ascii")
+
+        yield _header_bytes(part, policy)
+        if part.preamble is not None:
+            yield part.preamble.encode("ascii", "surrogateescape") + CRLF
+
+        for index, subpart in enumerate(part.get_payload()):
+            yield (CRLF if index else b"") + b"--" + boundary + CRLF
+            yield from iter_part(subpart, policy)
+        yield CRLF + b"--" + boundary + b"--" + CRLF
+
+        if part.epilogue is not None:
+            yield part.epilogue.encode("ascii", "surrogateescape")
+
+    elif isinstance(part, StreamedAttachment) and part._inline_payload is None:
+        yield _header_bytes(part, policy)
+        yield from part.iter_encoded()
+
+    else:
+        # Small in-memory part - let the standard generator lay it out
+        buffer = io.BytesIO()
+        BytesGenerator(buffer, mangle_from_=False, policy=policy).flatten(part)
+        yield buffer.getvalue()
+
+
+def iter_message(msg, chunk_size=64 * 1024):
+    """Yield the serialized message in chunks of roughly chunk_size bytes"""
+    policy = msg.policy.clone(linesep="\r\n")
+    buffered = []
+    buffered_size = 0
+
+    for piece in iter_part(msg, policy):
+        buffered.append(piece)
+        buffered_size += len(piece)
+        if buffered_size >= chunk_size:
+            yield b"".join(buffered)
+            buffered = []
+            buffered_size = 0
+
+    if buffered:
+        yield b"".join(buffered)
+
+
+class DotStuffer:
+    """Incrementally dot-stuffs CRLF data across chunk boundaries (RFC 5321 4.5.2)"""
+
+    def __init__(self):
+        self.tail = CRLF  # Data starts at the beginning of a line
+
+    def stuff(self, chunk):
+        if not chunk:
+            return chunk
+        if self.tail == CRLF and chunk[:1] == b".":
+            chunk = b"." + chunk
+        elif self.tail[-1:] == b"\r" and chunk[:2] == b"\n.":
+            chunk = b"\n." + chunk[1:]
+        chunk = chunk.replace(b"\r\n.", b"\r\n..")
+        self.tail = (self.tail + chunk)[-2:]
+        return chunk
+
+    @property
+    def at_line_start(self):
+        return self.tail == CRLF
+
+
+def iter_file(file_path, chunk_size=64 * 1024):
+    """Yield an already serialized (CRLF) message file in chunks"""
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            yield chunk
+
+
+def iter_spool_file(file_path, chunk_size=SPOOL_BUFFER_SIZE):
+    """Yield a file written by write_spool_file with its dot-stuffing undone
+
+    For delivery paths other than SMTP DATA (a local MTA, a file).
+    """
+    buffered = []
+    buffered_size = 0
+    with open(file_path, "rb") as f:
+        for line in f:
+            if line[:1] == b".":
+                line = line[1:]
+            buffered.append(line)
+            buffered_size += len(line)
+            if buffered_size >= chunk_size:
+                yield b"".join(buffered)
+                buffered = []
+                buffered_size = 0
+    if buffered:
+        yield b"".join(buffered)
+
+
+def send_message_streaming(server, from_addr, to_addrs, msg, chunk_size=64 * 1024):
+    """Like smtplib.SMTP.sendmail, but generates msg straight into the DATA phase
+
+    Returns the dict of refused recipients and raises the same exceptions as
+    sendmail, leaving the session reset and reusable after envelope errors.
+    """
+    return send_chunks_streaming(server, from_addr, to_addrs, iter_message(msg, chunk_size))
+
+
+def write_spool_file(file, chunks):
+    """Write CRLF message chunks exactly as they go on the wire in DATA
+
+    The result is dot-stuffed and ends with CRLF, so send_spool_file can
+    copy it to the socket untouched. Returns the number of bytes written.
+    """
+    stuffer = DotStuffer()
+    written = 0
+    for chunk in chunks:
+        written += file.write(stuffer.stuff(chunk))
+    if not stuffer.at_line_start:
+        written += file.write(CRLF)
+    return written
+
+
+def _copy_file_to_socket(sock, file, buffer_size=SPOOL_BUFFER_SIZE):
+    """Copy a file to a socket - zero-copy sendfile() on plain sockets
+
+    TLS sockets cannot use the kernel's sendfile, and the standard library
+    fallback sends 8 KB at a time, so they get a loop over one reusable
+    buffer instead.
+    """
+    import ssl
+
+    if not isinstance(sock, ssl.SSLSocket):
+        return sock.sendfile(file)
+
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    total = 0
+    while True:
+        size = file.readinto(buffer)
+        if not size:
+            return total
+        sock.sendall(view[:size])
+        total += size
+
+
+def _start_data(server, from_addr, to_addrs):
+    """Run the envelope and DATA command; returns the refused recipients"""
+    import smtplib
+
+    server.ehlo_or_helo_if_needed()
+
+    code, response = server.mail(from_addr)
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPSenderRefused(code, response, from_addr)
+
+    refused = {}
+    for recipient in to_addrs:
+        code, response = server.rcpt(recipient)
+        if code not in (250, 251):
+            refused[recipient] = (code, response)
+    if len(refused) == len(to_addrs):
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused(refused)
+
+    server.putcmd("data")
+    code, response = server.getreply()
+    if code != 354:
+        server.rset()
+        raise smtplib.SMTPDataError(code, response)
+    return refused
+
+
+def _finish_data(server, to_addrs, refused):
+    """Read the reply to the end-of-data marker; returns the refused recipients
+
+    An LMTP server replies once per accepted recipient (RFC 2033 4.2), so a
+    message can be delivered to some recipients and refused for others.
+    """
+    import smtplib
+
+    if not isinstance(server, smtplib.LMTP):
+        code, response = server.getreply()
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPDataError(code, response)
+        return refused
+
+    refused = dict(refused)
+    for recipient in [r for r in to_addrs if r not in refused]:
+        code, response = server.getreply()
+        if code != 250:
+            refused[recipient] = (code, response)
+    if len(refused) == len(to_addrs):
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused(refused)
+    return refused
+
+
+def send_chunks_streaming(server, from_addr, to_addrs, chunks):
+    """Send a message given as CRLF byte chunks, dot-stuffing it on the way out"""
+    refused = _start_data(server, from_addr, to_addrs)
+
+    stuffer = DotStuffer()
+    pending = b""
+    for chunk in chunks:
+        if pending:
+            server.send(pending)
+        pending = stuffer.stuff(chunk)
+    # The end-of-data marker goes out with the last chunk rather than in a
+    # packet of its own that Nagle's algorithm would hold back
+    server.send(pending + (b"" if stuffer.at_line_start else CRLF) + b"." + CRLF)
+
+    return _finish_data(server, to_addrs, refused)
+
+
+def send_spool_file(server, from_addr, to_addrs, file_path, header=b"", buffer_size=SPOOL_BUFFER_SIZE):
+    """Send a file written by write_spool_file, copying it to the socket as-is
+
+    header (complete CRLF-terminated header lines, not starting with ".")
+    is sent ahead of the file.
+    """
+    refused = _start_data(server, from_addr, to_addrs)
+
+    with open(file_path, "rb") as f:
+        if header:
+            server.send(header)
+        _copy_file_to_socket(server.sock, f, buffer_size)
+    server.send(b"." + CRLF)
+
+    return _finish_data(server, to_addrs, refused)
@@ -0,0 +1,356 @@
+"""
+Persistent Outbox for the Automated Government Email System
+SQLite queue of rendered messages. send_daily_emails enqueues each message
+under an idempotency key derived from its campaign and recipients, and workers
+drain the queue with time-limited leases, so a crashed or cancelled run
+resumes where it stopped instead of re-sending or dropping messages.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from mime_stream import iter_file, iter_message, write_spool_file
+
+PENDING = "pending"
+LEASED = "leased"
+SENT = "sent"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    campaign TEXT NOT NULL,
+    service_key TEXT,
+    recipients TEXT NOT NULL,
+    subject TEXT,
+    message_file TEXT NOT NULL,
+    dot_stuffed INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    sent_via TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_ready ON messages (status, available_at);
+CREATE INDEX IF NOT EXISTS messages_campaign ON messages (campaign);
+"""
+
+# Columns added after the first release, for outbox databases created before them
+MIGRATIONS = {
+    "dot_stuffed": "ALTER TABLE messages ADD COLUMN dot_stuffed INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def idempotency_key(campaign, recipients):
+    """Key for one message of a campaign - the same on every run that renders it
+
+    campaign already names the date and template, so the key only adds a hash
+    of the recipients (order-independent, case-insensitive).
+    """
+    digest = hashlib.sha256("\n".join(sorted(r.lower() for r in recipients)).encode("utf-8"))
+    return f"{campaign}:{digest.hexdigest()[:16]}"
+
+
+class StoredMessage:
+    """A leased outbox message, stored on disk without its From header
+
+    Offers the parts of the Message interface transmit_message relies on, so
+    failover can pick a different sender; the From header is written at send
+    time. Files spooled with dot_stuffed set are already in DATA wire format.
+    """
+
+    def __init__(self, row):
+        self.id = row["id"]
+        self.idempotency_key = row["idempotency_key"]
+        self.campaign = row["campaign"]
+        self.service_key = row["service_key"]
+        self.recipients = json.loads(row["recipients"])
+        self.subject = row["subject"]
+        self.message_file = Path(row["message_file"])
+        self.dot_stuffed = bool(row["dot_stuffed"])
+        self.attempts = row["attempts"]
+        self.lease_owner = row["lease_owner"]
+        self.from_addr = None
+
+    def __getitem__(self, name):
+        return self.from_addr if name.lower() == "from" else None
+
+    def replace_header(self, name, value):
+        if name.lower() != "from":
+            raise KeyError(name)
+        self.from_addr = value
+
+    def header_bytes(self):
+        """The From header line written ahead of the stored message"""
+        return f"From: {self.from_addr}\r\n".encode("utf-8")
+
+    def iter_chunks(self, chunk_size=64 * 1024):
+        """The stored message with the current From header prepended (not dot-stuffed)"""
+        if self.dot_stuffed:
+            raise ValueError("Dot-stuffed spool files are sent with send_spool_file")
+        yield self.header_bytes()
+        yield from iter_file(self.message_file, chunk_size)
+
+
+class Outbox:
+    """Durable message queue drained by leasing workers"""
+
+    def __init__(
+        self,
+        db_path,
+        spool_dir,
+        lease_seconds=300,
+        max_attempts=5,
+        retry_delay_seconds=30,
+    ):
+        self.db_path = Path(db_path)
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(messages)")}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    connection.execute(statement)
+
+    def _connection(self):
+        """SQLite connection for the calling thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode - transactions are opened explicitly where needed
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def spool_path(self, idempotency_key):
+        """Where the message queued under idempotency_key is spooled"""
+        digest = hashlib.sha256(idempotency_key.encode("utf-8")).hexdigest()
+        return self.spool_dir / f"{digest[:32]}.eml"
+
+    def enqueue(self, idempotency_key, campaign, service_key, recipients, msg):
+        """Store a built message for delivery; returns False if the key is already queued
+
+        The From header is removed from msg - the sending account is chosen
+        when the message is transmitted.
+        """
+        connection = self._connection()
+        if connection.execute(
+            "SELECT 1 FROM messages WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone():
+            return False
+
+        del msg["From"]
+        message_file = self.spool_path(idempotency_key)
+        tmp_file = message_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            # Rendered once into wire format - transmitting is then a plain file copy
+            write_spool_file(f, iter_message(msg))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_file.replace(message_file)
+
+        now = time.time()
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO messages (idempotency_key, campaign, service_key, recipients,"
+            " subject, message_file, dot_stuffed, status, available_at, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?, ?, ?)",
+            (
+                idempotency_key,
+                campaign,
+                service_key,
+                json.dumps(recipients),
+                msg["Subject"],
+                str(message_file),
+                PENDING,
+                now,
+                now,
+                now,
+            ),
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, worker_id):
+        """Claim the next ready message for a worker, or None when nothing is ready
+
+        Messages whose lease expired (their worker died) are claimed again,
+        unless that lease was their last attempt - those are marked failed.
+        """
+        connection = self._connection()
+        owner = f"{self.owner_prefix}:{worker_id}"
+        now = time.time()
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "UPDATE messages SET status = ?, lease_owner = NULL, lease_expires = NULL,"
+                " last_error = ?, updated_at = ?"
+                " WHERE status = ? AND lease_expires <= ? AND attempts >= ?",
+                (FAILED, "lease expired on the last attempt", now, LEASED, now, self.max_attempts),
+            )
+            row = connection.execute(
+                "SELECT id, attempts FROM messages"
+                " WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires <= ?)"
+                " ORDER BY id LIMIT 1",
+                (PENDING, now, LEASED, now),
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+
+            connection.execute(
+                "UPDATE messages SET status = ?, lease_owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, owner, now + self.lease_seconds, now, row["id"]),
+            )
+            leased = connection.execute(
+                "SELECT * FROM messages WHERE id = ?", (row["id"],)
+            ).fetchone()
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return StoredMessage(leased)
+
+    def _finish(self, message, status, **fields):
+        """Move a leased message to a new status if this worker still holds its lease"""
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        cursor = self._connection().execute(
+            f"UPDATE messages SET status = ?, lease_owner = NULL, lease_expires = NULL,"
+            f" updated_at = ?{', ' if fields else ''}{assignments}"
+            f" WHERE id = ? AND status = ? AND lease_owner = ?",
+            (status, time.time(), *fields.values(), message.id, LEASED, message.lease_owner),
+        )
+        return cursor.rowcount == 1
+
+    def mark_sent(self, message, sent_via):
+        """Record a delivered message; its spool file is no longer needed"""
+        if not self._finish(message, SENT, sent_via=sent_via, last_error=None):
+            print(f"⚠️  Outbox lease on {message.idempotency_key} was lost before completion")
+            return False
+        message.message_file.unlink(missing_ok=True)
+        return True
+
+    def mark_failed(self, message, error, retry=True):
+        """Schedule a retry with exponential backoff, or give up on the message"""
+        if retry and message.attempts < self.max_attempts:
+            delay = self.retry_delay_seconds * 2 ** (message.attempts - 1)
+            self._finish(
+                message, PENDING, available_at=time.time() + delay, last_error=str(error)
+            )
+            return delay
+        self._finish(message, FAILED, last_error=str(error))
+        return None
+
+    def defer(self, message, available_at, reason):
+        """Return a message to the queue until available_at without counting the attempt"""
+        return self._finish(
+            message,
+            PENDING,
+            available_at=available_at,
+            attempts=message.attempts - 1,
+            last_error=reason,
+        )
+
+    def next_ready_in(self):
+        """Seconds until the next pending or leased message becomes claimable, or None"""
+        row = self._connection().execute(
+            "SELECT MIN(CASE WHEN status = ? THEN available_at ELSE lease_expires END)"
+            " FROM messages WHERE status IN (?, ?)",
+            (PENDING, PENDING, LEASED),
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def counts(self, campaign=None):
+        """Number of messages by status, optionally for one campaign"""
+        query = "SELECT status, COUNT(*) FROM messages"
+        parameters = ()
+        if campaign is not None:
+            query += " WHERE campaign = ?"
+            parameters = (campaign,)
+        rows = self._connection().execute(query + " GROUP BY status", parameters).fetchall()
+        counts = {PENDING: 0, LEASED: 0, SENT: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def recipient_count(self, campaign, status=None):
+        """Number of recipients across a campaign's messages, optionally in one status"""
+        query = "SELECT recipients FROM messages WHERE campaign = ?"
+        parameters = (campaign,)
+        if status is not None:
+            query += " AND status = ?"
+            parameters += (status,)
+        rows = self._connection().execute(query, parameters).fetchall()
+        return sum(len(json.loads(row["recipients"])) for row in rows)
+
+    def manifest(self):
+        """One record per queued message, oldest first"""
+        rows = self._connection().execute(
+            "SELECT idempotency_key, campaign, service_key, recipients, subject, message_file,"
+            " dot_stuffed, status, attempts, last_error, sent_via, created_at, updated_at"
+            " FROM messages ORDER BY id"
+        ).fetchall()
+        manifest = []
+        for row in rows:
+            record = dict(row)
+            record["recipients"] = json.loads(record["recipients"])
+            record["message_file"] = Path(record["message_file"]).name
+            record["dot_stuffed"] = bool(record["dot_stuffed"])
+            manifest.append(record)
+        return manifest
+
+    def write_manifest(self, path=None):
+        """Write manifest() as JSON next to the spool files (manifest.json)"""
+        path = Path(path) if path else self.spool_dir / "manifest.json"
+        try:
+            tmp_file = path.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.manifest(), f, indent=2, ensure_ascii=False)
+            tmp_file.replace(path)
+        except OSError as e:
+            print(f"⚠️  Could not write outbox manifest: {e}")
+        return path
+
+    def purge(self, retention_days):
+        """Forget finished messages older than retention_days"""
+        cutoff = time.time() - retention_days * 86400
+        connection = self._connection()
+        stale = connection.execute(
+            "SELECT message_file FROM messages WHERE status IN (?, ?) AND updated_at < ?",
+            (SENT, FAILED, cutoff),
+        ).fetchall()
+        for row in stale:
+            Path(row["message_file"]).unlink(missing_ok=True)
+        connection.execute(
+            "DELETE FROM messages WHERE status IN (?, ?) AND updated_at < ?",
+            (SENT, FAILED, cutoff),
+        )
+        return len(stale)
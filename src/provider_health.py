@@ -0,0 +1,186 @@
+"""
+Provider Health Tracking for the Automated Government Email System
+Keeps a rolling health score per email service (latency, error rate and
+consecutive failures) and a circuit breaker that skips dead providers.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+from smtp_pool import service_key
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    """Rolling health statistics and circuit breaker state for one service"""
+
+    def __init__(self, window_size=20, state=None):
+        state = state or {}
+        self.latency_ewma = state.get("latency_ewma")
+        self.outcomes = deque(state.get("outcomes", []), maxlen=window_size)
+        self.consecutive_failures = state.get("consecutive_failures", 0)
+        self.circuit = state.get("circuit", CLOSED)
+        self.opened_at = state.get("opened_at", 0)
+
+    def error_rate(self):
+        """Fraction of recent sends that failed"""
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def score(self, latency_reference=2.0):
+        """Health score between 0 and 1 - higher is healthier"""
+        latency = self.latency_ewma or 0.0
+        latency_factor = 1 / (1 + latency / latency_reference)
+        return (1 - self.error_rate()) * latency_factor / (1 + self.consecutive_failures)
+
+    def to_dict(self):
+        """Serializable snapshot used for persistence between runs"""
+        return {
+            "latency_ewma": self.latency_ewma,
+            "outcomes": list(self.outcomes),
+            "consecutive_failures": self.consecutive_failures,
+            "circuit": self.circuit,
+            "opened_at": self.opened_at,
+        }
+
+
+class ProviderHealthRegistry:
+    """Health scores and circuit breakers for every configured service"""
+
+    def __init__(self, config=None, state_file=None):
+        config = config or {}
+        self.failure_threshold = config.get("failure_threshold", 3)
+        self.cooldown_seconds = config.get("cooldown_seconds", 900)
+        self.window_size = config.get("window_size", 20)
+        self.latency_smoothing = config.get("latency_smoothing", 0.3)
+        self.latency_reference = config.get("latency_reference_seconds", 2.0)
+        self.state_file = state_file
+
+        self._providers = {}
+        self._probes = set()  # Keys of half-open services with a trial send in flight
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Restore health state persisted by earlier runs"""
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            for key, state in saved.items():
+                self._providers[key] = ProviderHealth(self.window_size, state)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load provider health state: {e}")
+
+    def save(self):
+        """Persist health state so the next run skips providers known to be down"""
+        if not self.state_file:
+            return
+        with self._lock:
+            snapshot = {key: health.to_dict() for key, health in self._providers.items()}
+        try:
+            tmp_file = self.state_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+            tmp_file.replace(self.state_file)
+        except OSError as e:
+            print(f"⚠️  Could not save provider health state: {e}")
+
+    def _get(self, service):
+        """Health record for a service, created on first use - lock held"""
+        key = service_key(service)
+        if key not in self._providers:
+            self._providers[key] = ProviderHealth(self.window_size)
+        return self._providers[key]
+
+    def get(self, service):
+        """Health record for a service, created on first use"""
+        with self._lock:
+            return self._get(service)
+
+    def _is_available(self, service, now):
+        health = self._get(service)
+        if health.circuit == CLOSED:
+            return True
+        if service_key(service) in self._probes:
+            return False  # A trial send is already in flight
+        return health.circuit == HALF_OPEN or now - health.opened_at >= self.cooldown_seconds
+
+    def is_available(self, service):
+        """Whether allow_request would let a send through, without changing any state"""
+        with self._lock:
+            return self._is_available(service, time.time())
+
+    def allow_request(self, service):
+        """Whether the circuit breaker lets a send through to this service
+
+        Call it only for the service actually about to be tried: once the
+        cooldown has passed it half-opens the circuit and claims the single
+        trial send, which end_request() hands back.
+        """
+        with self._lock:
+            if not self._is_available(service, time.time()):
+                return False
+            health = self._get(service)
+            if health.circuit != CLOSED:
+                health.circuit = HALF_OPEN
+                self._probes.add(service_key(service))
+            return True
+
+    def end_request(self, service):
+        """Finish a send allowed by allow_request, whatever its outcome"""
+        with self._lock:
+            self._probes.discard(service_key(service))
+
+    def record_success(self, service, latency):
+        """Record a successful send and close the circuit"""
+        with self._lock:
+            health = self._get(service)
+            health.outcomes.append(1)
+            health.consecutive_failures = 0
+            health.circuit = CLOSED
+            if health.latency_ewma is None:
+                health.latency_ewma = latency
+            else:
+                health.latency_ewma += self.latency_smoothing * (latency - health.latency_ewma)
+
+    def record_failure(self, service, trip=False):
+        """Record a failed send, opening the circuit once failures pile up"""
+        with self._lock:
+            health = self._get(service)
+            health.outcomes.append(0)
+            health.consecutive_failures += 1
+            if (
+                trip
+                or health.circuit == HALF_OPEN
+                or health.consecutive_failures >= self.failure_threshold
+            ):
+                if health.circuit != OPEN:
+                    print(f"🔌 Circuit opened for {service['name']} ({service['email']})")
+                health.circuit = OPEN
+                health.opened_at = time.time()
+
+    def failover_order(self, preferred, services):
+        """Services to try in order: preferred first, then healthiest, skipping tripped ones
+
+        Ordering has no side effects - each service is claimed with
+        allow_request() only when it is actually tried.
+        """
+        with self._lock:
+            now = time.time()
+            scores = {
+                id(s): self._get(s).score(self.latency_reference) for s in services
+            }
+            others = sorted(
+                (s for s in services if s is not preferred),
+                key=lambda s: scores[id(s)],
+                reverse=True,
+            )
+            return [s for s in [preferred] + others if self._is_available(s, now)]
@@ -0,0 +1,151 @@
+"""
+Quota Ledger for the Automated Government Email System
+Records the messages and recipients each email service has sent over a
+rolling window (a day by default), persisted between runs, so routing only
+hands a message to an account that still has daily capacity for it.
+"""
+
+import json
+import threading
+import time
+
+from smtp_pool import service_key
+
+BUCKET_SECONDS = 3600  # Usage is counted in hourly buckets
+DEFAULT_DAILY_QUOTA = 500
+
+
+class QuotaLedger:
+    """Messages and recipients sent per service within the quota window"""
+
+    def __init__(self, state_file=None, window_hours=24):
+        self.state_file = state_file
+        self.window_seconds = window_hours * 3600
+        self._usage = {}  # service key -> {bucket start: [messages, recipients]}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Restore usage recorded by earlier runs"""
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self._usage = {
+                key: {int(bucket): counts for bucket, counts in buckets.items()}
+                for key, buckets in saved.items()
+            }
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️  Could not load quota ledger: {e}")
+
+    def save(self):
+        """Persist usage still inside the window"""
+        if not self.state_file:
+            return
+        with self._lock:
+            self._expire(time.time())
+            snapshot = {
+                key: {str(bucket): counts for bucket, counts in buckets.items()}
+                for key, buckets in self._usage.items()
+                if buckets
+            }
+        try:
+            tmp_file = self.state_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+            tmp_file.replace(self.state_file)
+        except OSError as e:
+            print(f"⚠️  Could not save quota ledger: {e}")
+
+    def _expire(self, now):
+        """Drop buckets that have left the window"""
+        oldest = now - self.window_seconds
+        for buckets in self._usage.values():
+            for bucket in [b for b in buckets if b + BUCKET_SECONDS <= oldest]:
+                del buckets[bucket]
+
+    @staticmethod
+    def _limits(service):
+        messages = service.get("daily_quota", DEFAULT_DAILY_QUOTA)
+        return messages, service.get("daily_recipient_quota", messages)
+
+    def _used(self, service):
+        """(messages, recipients) sent by a service within the window - lock held"""
+        buckets = self._usage.get(service_key(service), {})
+        return (
+            sum(counts[0] for counts in buckets.values()),
+            sum(counts[1] for counts in buckets.values()),
+        )
+
+    def usage(self, service):
+        """Messages and recipients a service has sent within the window"""
+        with self._lock:
+            self._expire(time.time())
+            messages, recipients = self._used(service)
+        return {"messages": messages, "recipients": recipients}
+
+    def remaining(self, service):
+        """Messages and recipients a service may still send within the window"""
+        message_limit, recipient_limit = self._limits(service)
+        used = self.usage(service)
+        return {
+            "messages": max(0, message_limit - used["messages"]),
+            "recipients": max(0, recipient_limit - used["recipients"]),
+        }
+
+    def has_capacity(self, service, recipient_count=1):
+        """Whether a service can send one more message to recipient_count recipients"""
+        remaining = self.remaining(service)
+        return remaining["messages"] >= 1 and remaining["recipients"] >= recipient_count
+
+    def reserve(self, service, recipient_count):
+        """Count a message against a service's quota before sending it
+
+        Returns a token for release(), or None when the service has no
+        capacity left for it.
+        """
+        message_limit, recipient_limit = self._limits(service)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            messages, recipients = self._used(service)
+            if messages + 1 > message_limit or recipients + recipient_count > recipient_limit:
+                return None
+            bucket = int(now // BUCKET_SECONDS * BUCKET_SECONDS)
+            counts = self._usage.setdefault(service_key(service), {}).setdefault(bucket, [0, 0])
+            counts[0] += 1
+            counts[1] += recipient_count
+        return bucket
+
+    def release(self, service, recipient_count, token):
+        """Give back a reservation for a message that was not sent"""
+        with self._lock:
+            counts = self._usage.get(service_key(service), {}).get(token)
+            if counts:
+                counts[0] = max(0, counts[0] - 1)
+                counts[1] = max(0, counts[1] - recipient_count)
+
+    def next_window_at(self, services):
+        """Earliest time (epoch seconds) at which one of the services regains capacity"""
+        with self._lock:
+            self._expire(time.time())
+            times = [
+                min(buckets) + BUCKET_SECONDS + self.window_seconds
+                for buckets in (self._usage.get(service_key(s), {}) for s in services)
+                if buckets
+            ]
+        return min(times, default=time.time())
+
+    def describe(self, services):
+        """Human-readable usage per service"""
+        lines = []
+        for service in services:
+            used = self.usage(service)
+            message_limit, recipient_limit = self._limits(service)
+            lines.append(
+                f"{service['name']} ({service['email']}): "
+                f"{used['messages']}/{message_limit} messages, "
+                f"{used['recipients']}/{recipient_limit} recipients"
+            )
+        return lines
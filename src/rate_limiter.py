@@ -0,0 +1,87 @@
+"""
+Send Rate Limiting for the Automated Government Email System
+Per-provider token buckets with jitter that pace consecutive sends, so a
+run only waits when another message is actually pending for a provider.
+"""
+
+import random
+import threading
+import time
+
+from smtp_pool import service_key
+
+
+class TokenBucket:
+    """Token bucket handing out send slots, with random jitter on paced slots"""
+
+    def __init__(self, rate, capacity, jitter=0.0):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.jitter = jitter
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long to wait before it may be used"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+
+            # Bucket is empty - the slot lies in the future, spread it out a little
+            return -self.tokens / self.rate + random.uniform(0, self.jitter)
+
+
+class SendRateLimiter:
+    """One token bucket per email service, configured from ANTI_SPAM_CONFIG"""
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.min_delay = config.get("min_delay", 10)
+        self.max_delay = config.get("max_delay", 60)
+        self.burst_size = config.get("burst_size", 1)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, service):
+        """Token bucket for a service, created on first use"""
+        key = service_key(service)
+        with self._lock:
+            if key not in self._buckets:
+                # Space paced sends min_delay..max_delay apart, never faster than
+                # the provider's own messages_per_minute limit
+                interval = max(self.min_delay, 60 / service.get("messages_per_minute", 60))
+                self._buckets[key] = TokenBucket(
+                    rate=1 / interval if interval > 0 else 1e9,
+                    capacity=self.burst_size,
+                    jitter=max(0, self.max_delay - self.min_delay),
+                )
+            return self._buckets[key]
+
+    def wait(self, service):
+        """Block until the next send to this service is allowed"""
+        if service.get("paced", True) is False:
+            # A local relay queues the mail itself - it paces the remote delivery
+            return 0.0
+        delay = self._bucket(service).reserve()
+        if delay > 0:
+            print(f"⏱️ Pacing {service['name']}: next send in {delay:.1f} seconds")
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, service):
+        """Async counterpart of wait - yields to other sends while pacing"""
+        import asyncio
+
+        if service.get("paced", True) is False:
+            return 0.0
+        delay = self._bucket(service).reserve()
+        if delay > 0:
+            print(f"⏱️ Pacing {service['name']}: next send in {delay:.1f} seconds")
+            await asyncio.sleep(delay)
+        return delay
@@ -0,0 +1,40 @@
+"""
+Recipient Batching for the Automated Government Email System
+Splits a distribution list (TO, CC and BCC) into batches no larger than the
+number of RCPT TO commands every configured provider accepts per message.
+"""
+
+DEFAULT_MAX_RECIPIENTS = 100
+UNDISCLOSED_RECIPIENTS = "undisclosed-recipients:;"
+
+
+def recipient_limit(services, default=DEFAULT_MAX_RECIPIENTS):
+    """Largest batch every service accepts (failover may move a batch between them)"""
+    limits = [service.get("max_recipients_per_message", default) for service in services]
+    return max(1, min(limits, default=default))
+
+
+def split_distribution(distribution, max_recipients):
+    """Split a distribution from _get_email_distribution_list into batches
+
+    Addresses keep their TO/CC/BCC role and their order. Each batch is a dict
+    with "to", "cc", "bcc" and "recipients" (the envelope recipients).
+    """
+    batches = []
+    current = {"to": [], "cc": [], "bcc": []}
+    count = 0
+
+    for field in ("to", "cc", "bcc"):
+        for address in distribution[field]:
+            if count == max_recipients:
+                batches.append(current)
+                current = {"to": [], "cc": [], "bcc": []}
+                count = 0
+            current[field].append(address)
+            count += 1
+    if count:
+        batches.append(current)
+
+    for batch in batches:
+        batch["recipients"] = batch["to"] + batch["cc"] + batch["bcc"]
+    return batches
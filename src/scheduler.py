@@ -0,0 +1,133 @@
+"""
+Local Daemon Scheduler for the Automated Government Email System
+Timer-heap scheduler that sleeps until the next due time, computed in the
+configured timezone (Asia/Karachi), instead of polling every minute. Runs
+missed while the machine was suspended are caught up, and every run
+reports how far it drifted from its due time.
+"""
+
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+class WeeklyTrigger:
+    """Fires at a wall-clock time on given weekdays in one timezone"""
+
+    def __init__(self, days, at, tz):
+        self.weekdays = sorted({WEEKDAYS.index(day.lower()) for day in days})
+        hour, minute = (int(part) for part in at.split(":"))
+        self.at = (hour, minute)
+        self.tz = tz
+
+    def next_after(self, moment):
+        """First due time strictly after moment (an aware datetime), as an aware datetime"""
+        local = moment.astimezone(self.tz)
+        for offset in range(8):
+            day = local.date() + timedelta(days=offset)
+            if day.weekday() not in self.weekdays:
+                continue
+            due = datetime(day.year, day.month, day.day, *self.at, tzinfo=self.tz)
+            if hasattr(self.tz, "localize"):
+                # pytz timezones need localize() to pick the right UTC offset
+                due = self.tz.localize(due.replace(tzinfo=None))
+            if due > moment:
+                return due
+        raise ValueError("WeeklyTrigger has no weekdays configured")
+
+    def describe(self):
+        days = ", ".join(WEEKDAYS[day].capitalize() for day in self.weekdays)
+        return f"{days} at {self.at[0]:02d}:{self.at[1]:02d} {self.tz}"
+
+
+class ScheduledJob:
+    def __init__(self, name, trigger, callback):
+        self.name = name
+        self.trigger = trigger
+        self.callback = callback
+        self.next_run = None
+        self.runs = 0
+
+
+class TimerScheduler:
+    """Heap of jobs ordered by next due time; sleeps until the earliest one"""
+
+    def __init__(self, max_sleep_seconds=300, catch_up_window_hours=12, clock=None, sleep=None):
+        # Sleeping is capped so a suspend (the monotonic clock stops) is noticed
+        # within max_sleep_seconds of resuming rather than one full interval late
+        self.max_sleep_seconds = max_sleep_seconds
+        self.catch_up_window = timedelta(hours=catch_up_window_hours)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._stop = threading.Event()
+        self._sleep = sleep or self._stop.wait
+        self._heap = []
+        self._counter = itertools.count()
+
+    def add_job(self, name, trigger, callback):
+        job = ScheduledJob(name, trigger, callback)
+        self._push(job, trigger.next_after(self.clock()))
+        return job
+
+    def _push(self, job, due):
+        job.next_run = due
+        heapq.heappush(self._heap, (due.timestamp(), next(self._counter), job))
+
+    def next_due(self):
+        return self._heap[0][2].next_run if self._heap else None
+
+    def stop(self):
+        self._stop.set()
+
+    def run_pending(self):
+        """Run every job that is due; returns the number of jobs run"""
+        ran = 0
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now.timestamp():
+            _, _, job = heapq.heappop(self._heap)
+            due = job.next_run
+
+            # Several occurrences missed in one suspend are coalesced into the latest
+            missed = 0
+            while True:
+                following = job.trigger.next_after(due)
+                if following > now:
+                    break
+                due = following
+                missed += 1
+            if missed:
+                print(f"⏭️  {missed} earlier {job.name} run(s) missed while suspended, coalesced into one")
+            lateness = now - due
+
+            if lateness > self.catch_up_window:
+                print(
+                    f"⏭️  Skipping missed {job.name} run due {due:%Y-%m-%d %H:%M %Z} "
+                    f"({lateness.total_seconds() / 3600:.1f}h late, beyond the catch-up window)"
+                )
+            else:
+                if lateness.total_seconds() >= self.max_sleep_seconds:
+                    print(f"⏪ Catching up {job.name} run due {due:%Y-%m-%d %H:%M %Z} (missed while suspended)")
+                print(f"⏰ Running {job.name} (drift {lateness.total_seconds():+.3f}s from {due:%H:%M:%S %Z})")
+                try:
+                    job.callback()
+                except Exception as e:
+                    print(f"❌ Scheduled job {job.name} failed: {e}")
+                job.runs += 1
+                ran += 1
+
+            now = self.clock()
+            self._push(job, job.trigger.next_after(max(now, due)))
+            print(f"📅 Next {job.name} run: {job.next_run:%A %Y-%m-%d %H:%M %Z}")
+        return ran
+
+    def run_forever(self):
+        """Sleep until each due time and run the jobs, until stop() is called"""
+        while not self._stop.is_set():
+            self.run_pending()
+            if not self._heap:
+                return
+            remaining = self._heap[0][0] - self.clock().timestamp()
+            if remaining > 0:
+                self._sleep(min(remaining, self.max_sleep_seconds))
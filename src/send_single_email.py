@@ -5,19 +5,33 @@ in Bedian Road & Ali View Garden area, Lahore.
 """
 
 import os
-import smtplib
 import random
+import threading
 import time
 import re
+from collections import ChainMap
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from datetime import datetime, timedelta, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
 from email.mime.base import MIMEBase
 from email import encoders
-import schedule
-import pytz
+from load_balancer import WeightedServiceBalancer
+from attachment_cache import AttachmentCache
+from mime_stream import StreamedAttachment, iter_message
+from media_manifest import MediaManifest
+from template_engine import CompiledTemplate, compile_template
+from template_store import CompiledTemplateCache
+from recipient_batches import UNDISCLOSED_RECIPIENTS, recipient_limit, split_distribution
+
+# The SMTP pool, provider health, quota ledger, outbox, credentials, local
+# transports and telemetry are imported by the methods that use them, so
+# importing this module (spool.py, startup_report.py) stays cheap
+
+# Modules only some code paths need (the scheduler, concurrent.futures, asyncio, the
+# template build stage) are imported where they are used to keep start-up fast
 
 # Import configuration
 try:
@@ -32,6 +46,24 @@ try:
         CC_EMAILS,
         BCC_EMAILS,
         EMAIL_DISTRIBUTION_CONFIG,
+        SMTP_POOL_CONFIG,
+        ASYNC_SEND_CONFIG,
+        EMAIL_SERVICES,
+        ACCOUNTS_CONFIG,
+        LOAD_BALANCING_CONFIG,
+        FAILOVER_CONFIG,
+        CACHE_CONFIG,
+        ATTACHMENT_CACHE_CONFIG,
+        STREAMING_CONFIG,
+        MEDIA_MANIFEST_CONFIG,
+        TEMPLATE_CACHE_CONFIG,
+        TEMPLATE_BUILD_CONFIG,
+        EMAIL_SCHEDULE,
+        OUTBOX_CONFIG,
+        QUOTA_CONFIG,
+        RELAY_SERVICES,
+        TRANSPORT_CONFIG,
+        TELEMETRY_CONFIG,
     )
 except ImportError:
     # Fallback configuration if config.py is not available
@@ -48,6 +80,7 @@ except ImportError:
     ANTI_SPAM_CONFIG = {
         "min_delay": 10,
         "max_delay": 60,
+        "burst_size": 1,
         "max_attachments": 2,
     }
 
@@ -107,17 +140,190 @@ except ImportError:
         ],
     }
 
+    SMTP_POOL_CONFIG = {
+        "timeout": 60,
+        "connect_timeout": 10,
+        "max_idle_seconds": 120,
+        "noop_after_seconds": 15,
+        "max_messages_per_session": 50,
+        "max_sessions_per_service": 4,
+    }
 
-class GovernmentEmailSender:
-    def __init__(self):
-        # Email configuration - these will be set via GitHub Secrets
-        self.gmail_email = os.getenv("GMAIL_EMAIL")
-        self.gmail_password = os.getenv("GMAIL_APP_PASSWORD")
-        self.outlook_email = os.getenv("OUTLOOK_EMAIL")
-        self.outlook_password = os.getenv("OUTLOOK_PASSWORD")
-        self.yahoo_email = os.getenv("YAHOO_EMAIL")
-        self.yahoo_password = os.getenv("YAHOO_PASSWORD")
+    ASYNC_SEND_CONFIG = {
+        "enabled": False,
+        "max_concurrency": 10,
+    }
+
+    EMAIL_SERVICES = [
+        {
+            "name": "Gmail",
+            "smtp_server": "smtp.gmail.com",
+            "smtp_port": 587,
+            "env_email": "GMAIL_EMAIL",
+            "env_password": "GMAIL_APP_PASSWORD",
+        },
+        {
+            "name": "Outlook",
+            "smtp_server": "smtp-mail.outlook.com",
+            "smtp_port": 587,
+            "env_email": "OUTLOOK_EMAIL",
+            "env_password": "OUTLOOK_PASSWORD",
+        },
+        {
+            "name": "Yahoo",
+            "smtp_server": "smtp.mail.yahoo.com",
+            "smtp_port": 587,
+            "env_email": "YAHOO_EMAIL",
+            "env_password": "YAHOO_PASSWORD",
+        },
+    ]
+
+    ACCOUNTS_CONFIG = {
+        "max_accounts_per_provider": 20,
+        "credentials_file": "",
+    }
+
+    RELAY_SERVICES = []
+
+    TRANSPORT_CONFIG = {
+        "sendmail_command": "/usr/sbin/sendmail",
+        "sendmail_timeout": 60,
+        "file_directory": "sent_mail",
+    }
+
+    LOAD_BALANCING_CONFIG = {
+        "enabled": True,
+        "quota_window_minutes": 1440,
+    }
+
+    FAILOVER_CONFIG = {
+        "enabled": True,
+        "failure_threshold": 3,
+        "cooldown_seconds": 900,
+        "window_size": 20,
+        "latency_smoothing": 0.3,
+        "latency_reference_seconds": 2.0,
+        "state_file": "provider_health.json",
+    }
 
+    CACHE_CONFIG = {
+        "cache_dir": ".cache",
+    }
+
+    ATTACHMENT_CACHE_CONFIG = {
+        "enabled": True,
+        "directory": "attachments",
+    }
+
+    STREAMING_CONFIG = {
+        "enabled": True,
+        "chunk_size_kb": 64,
+        "spool_buffer_kb": 256,
+    }
+
+    MEDIA_MANIFEST_CONFIG = {
+        "enabled": True,
+        "state_file": "media_manifest.json",
+        "trust_directory_mtime": False,
+    }
+
+    QUOTA_CONFIG = {
+        "enabled": True,
+        "state_file": "quota_ledger.json",
+        "window_hours": 24,
+    }
+
+    OUTBOX_CONFIG = {
+        "enabled": True,
+        "database": "outbox.sqlite3",
+        "spool_directory": "outbox",
+        "workers": 4,
+        "lease_seconds": 300,
+        "max_attempts": 5,
+        "retry_delay_seconds": 30,
+        "max_retry_wait_seconds": 120,
+        "one_shot_retry_wait_seconds": 0,
+        "max_total_wait_seconds": 300,
+        "retention_days": 30,
+    }
+
+    TEMPLATE_CACHE_CONFIG = {
+        "enabled": True,
+        "directory": "templates",
+    }
+
+    TELEMETRY_CONFIG = {
+        "enabled": True,
+        "spans_file": "telemetry/spans.jsonl",
+        "max_spans_file_mb": 20,
+        "prometheus_file": "telemetry/email_system.prom",
+        "state_file": "telemetry/stage_metrics.json",
+        "print_summary": True,
+    }
+
+    TEMPLATE_BUILD_CONFIG = {
+        "inline_css": False,
+        "minify_html": True,
+    }
+
+    EMAIL_SCHEDULE = {
+        "time": "09:00",
+        "timezone": "Asia/Karachi",
+        "days": ["monday", "wednesday", "friday"],
+        "max_sleep_seconds": 300,
+        "catch_up_window_hours": 12,
+    }
+
+# Provider settings copied onto each account's service (an account may override them)
+PROVIDER_SETTINGS = (
+    "transport",
+    "smtp_port",
+    "messages_per_minute",
+    "daily_quota",
+    "daily_recipient_quota",
+    "weight",
+    "max_recipients_per_message",
+    "max_recipients_per_session",
+)
+
+# Placeholders available to subject and body templates (see build_template_variables)
+TEMPLATE_VARIABLES = frozenset(
+    {
+        "reference_number",
+        "date_formatted",
+        "time_formatted",
+        "area_name",
+        "city",
+        "province",
+        "country",
+        "primary_issue",
+        "affected_population",
+        "constitutional_articles",
+        "relevant_laws",
+        "administrative_bodies",
+        "specific_problems_formatted",
+        "constitutional_articles_formatted",
+        "relevant_laws_formatted",
+        "administrative_bodies_formatted",
+    }
+)
+
+
+def load_timezone(name):
+    """Timezone by IANA name from the stdlib tz database, falling back to pytz"""
+    try:
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo(name)
+    except Exception:
+        # No system tz database (e.g. Windows without tzdata) - pytz bundles one
+        import pytz
+
+        return pytz.timezone(name)
+
+
+class GovernmentEmailSender:
+    def __init__(self, email_services=None, cache_dir=None):
         # Validate and set recipient emails
         self.recipient_emails = self._validate_recipient_emails(RECIPIENT_EMAILS)
 
@@ -142,15 +348,27 @@ class GovernmentEmailSender:
         self.anti_spam_config = ANTI_SPAM_CONFIG
         self.email_templates = EMAIL_TEMPLATES
         self.template_config = EMAIL_TEMPLATE_CONFIG
+
+        # Templates are compiled on first use (see get_compiled_template)
+        self.compiled_templates = {}
+        self._compiled_text_cache = {}
+
+        # Template variables shared by every message, built on first render
+        self._static_template_variables = None
+        self._template_context = None
+        self._template_context_date = None
         self.location_info = LOCATION_INFO
         self.issue_details = ISSUE_DETAILS
         self.legal_framework = LEGAL_FRAMEWORK
 
         # Set up timezone
-        self.pakistan_tz = pytz.timezone("Asia/Karachi")
+        self.pakistan_tz = load_timezone("Asia/Karachi")
 
         # Build email services list - only include configured services
-        self.email_services = self._build_email_services()
+        # (callers such as the benchmark may pass their own services instead)
+        self.email_services = (
+            email_services if email_services is not None else self._build_email_services()
+        )
 
         # Check if at least one email service is configured
         if not self.email_services:
@@ -158,6 +376,58 @@ class GovernmentEmailSender:
                 "No email services configured. Please set up at least one email account in GitHub Secrets."
             )
 
+        # Weighted load balancer spreading messages across every service
+        self.load_balancing_config = LOAD_BALANCING_CONFIG
+        self.load_balancer = WeightedServiceBalancer(
+            self.email_services,
+            quota_window_minutes=LOAD_BALANCING_CONFIG.get("quota_window_minutes", 1440),
+            offset=self.get_current_time_pakistan().timetuple().tm_yday,
+        )
+
+        from provider_health import ProviderHealthRegistry
+        from quota_ledger import QuotaLedger
+        from rate_limiter import SendRateLimiter
+        from smtp_pool import SMTPConnectionPool
+        from telemetry import StageTimer
+
+        # Health scores and circuit breakers used for provider failover
+        self.cache_config = CACHE_CONFIG
+        # Callers such as the benchmark may keep state, caches and the outbox elsewhere
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.failover_config = FAILOVER_CONFIG
+        self.provider_health = ProviderHealthRegistry(
+            FAILOVER_CONFIG,
+            state_file=self.get_cache_dir() / FAILOVER_CONFIG.get(
+                "state_file", "provider_health.json"
+            ),
+        )
+
+        # Messages and recipients each service sent within its daily quota window
+        self.quota_config = QUOTA_CONFIG
+        self.quota_ledger = None
+        if QUOTA_CONFIG.get("enabled", True):
+            self.quota_ledger = QuotaLedger(
+                state_file=self.get_cache_dir()
+                / QUOTA_CONFIG.get("state_file", "quota_ledger.json"),
+                window_hours=QUOTA_CONFIG.get("window_hours", 24),
+            )
+
+        # Per-service token buckets pacing consecutive sends
+        self.rate_limiter = SendRateLimiter(ANTI_SPAM_CONFIG)
+
+        # Timing and byte counts for each stage of a run (see export_stage_timings)
+        self.telemetry_config = TELEMETRY_CONFIG
+        self.stage_timer = StageTimer(enabled=TELEMETRY_CONFIG.get("enabled", True))
+
+        # Pool of authenticated SMTP sessions shared by every send in a run
+        self.smtp_pool_config = SMTP_POOL_CONFIG
+        self.smtp_pool = SMTPConnectionPool(SMTP_POOL_CONFIG, stage_timer=self.stage_timer)
+
+        # Sendmail, file and null transports, created when a service first uses them
+        self.transport_config = TRANSPORT_CONFIG
+        self._local_transports = {}
+        self._transports_lock = threading.Lock()
+
         # Email attachment configuration
         self.max_file_size_mb = 25  # Maximum file size in MB
         self.max_total_size_mb = 50  # Maximum total attachment size in MB
@@ -193,6 +463,51 @@ class GovernmentEmailSender:
         # Cache for file sizes to avoid repeated calculations
         self._file_size_cache = {}
 
+        # Stream messages into the DATA phase instead of building one big string
+        self.streaming_config = STREAMING_CONFIG
+
+        # Encoded attachments kept on disk between runs
+        self.attachment_cache = None
+        if ATTACHMENT_CACHE_CONFIG.get("enabled", True):
+            try:
+                self.attachment_cache = AttachmentCache(
+                    self.get_cache_dir() / ATTACHMENT_CACHE_CONFIG.get("directory", "attachments")
+                )
+            except OSError as e:
+                print(f"⚠️  Attachment cache disabled: {e}")
+
+        # Compiled templates kept between runs
+        self.template_cache = None
+        if TEMPLATE_CACHE_CONFIG.get("enabled", True):
+            try:
+                self.template_cache = CompiledTemplateCache(
+                    self.get_cache_dir() / TEMPLATE_CACHE_CONFIG.get("directory", "templates"),
+                    build_options=TEMPLATE_BUILD_CONFIG,
+                )
+            except OSError as e:
+                print(f"⚠️  Template cache disabled: {e}")
+
+        # Index of the media folder kept between runs
+        self.media_manifest = None
+        if MEDIA_MANIFEST_CONFIG.get("enabled", True):
+            self.media_manifest = MediaManifest(
+                state_file=self.get_cache_dir()
+                / MEDIA_MANIFEST_CONFIG.get("state_file", "media_manifest.json"),
+                extensions=self.supported_extensions,
+                trust_directory_mtime=MEDIA_MANIFEST_CONFIG.get("trust_directory_mtime", False),
+            )
+
+        # Durable queue of rendered messages, drained by leasing workers
+        self.outbox_config = OUTBOX_CONFIG
+        self.outbox = None
+        if OUTBOX_CONFIG.get("enabled", True):
+            import sqlite3
+
+            try:
+                self.outbox = self.open_outbox()
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️  Outbox disabled: {e}")
+
         # Print available templates
         available_templates = self.get_available_templates()
         if available_templates:
@@ -210,6 +525,11 @@ class GovernmentEmailSender:
             f"   BCC recipients: {len(self.bcc_emails)} (enabled: {self.email_distribution_config.get('use_bcc', False)})"
         )
 
+        if len(self.email_services) > 1 and LOAD_BALANCING_CONFIG.get("enabled", True):
+            print(f"⚖️  Load balancing across {len(self.email_services)} services:")
+            for share in self.load_balancer.describe():
+                print(f"   {share}")
+
         print("✅ GovernmentEmailSender initialized successfully")
 
     def get_available_templates(self):
@@ -342,59 +662,110 @@ class GovernmentEmailSender:
         return distribution
 
     def _build_email_services(self):
-        """Build list of available email services with validation"""
-        services = []
+        """Build list of available email services with validation
 
-        # Add Gmail if configured
-        if self.gmail_email and self.gmail_password:
-            if self._validate_email(self.gmail_email):
-                services.append(
-                    {
-                        "name": "Gmail",
-                        "email": self.gmail_email,
-                        "password": self.gmail_password,
-                        "smtp_server": "smtp.gmail.com",
-                        "smtp_port": 587,
-                    }
-                )
-            else:
-                print(f"⚠️  Invalid Gmail address: {self.gmail_email}")
+        Every account of every provider is a service of its own, so quotas,
+        health and pooled sessions are tracked per account. Credentials come
+        from GitHub Secrets (GMAIL_EMAIL, GMAIL_EMAIL_2, ...) and the optional
+        credentials file.
+        """
+        from credentials import account_name, load_credentials_file, provider_accounts
+        from transports import LOCAL_SERVICE_DEFAULTS
 
-        # Add Outlook if configured
-        if self.outlook_email and self.outlook_password:
-            if self._validate_email(self.outlook_email):
-                services.append(
-                    {
-                        "name": "Outlook",
-                        "email": self.outlook_email,
-                        "password": self.outlook_password,
-                        "smtp_server": "smtp-mail.outlook.com",
-                        "smtp_port": 587,
-                    }
-                )
+        services = []
+        max_accounts = ACCOUNTS_CONFIG.get("max_accounts_per_provider", 20)
+        file_accounts = load_credentials_file(ACCOUNTS_CONFIG.get("credentials_file"))
+
+        for provider in EMAIL_SERVICES:
+            accounts = provider_accounts(provider, file_accounts, max_accounts)
+            for number, account in enumerate(accounts, 1):
+                if not self._validate_email(account["email"]):
+                    print(f"⚠️  Invalid {provider['name']} address: {account['email']}")
+                    continue
+                service = {
+                    "name": account_name(provider["name"], number),
+                    "provider": provider["name"],
+                    "email": account["email"],
+                    "password": account["password"],
+                    "smtp_server": provider["smtp_server"],
+                    "smtp_port": provider["smtp_port"],
+                }
+                # Per-provider throughput, quota and recipient limits used for weighting
+                for key in PROVIDER_SETTINGS:
+                    if key in account:
+                        service[key] = account[key]
+                    elif key in provider:
+                        service[key] = provider[key]
+                services.append(service)
+
+            if len(accounts) > 1:
+                print(f"🔑 {provider['name']}: {len(accounts)} accounts in rotation")
+
+        # Local relays (sendmail pipe, LMTP, file or null sink)
+        for relay in RELAY_SERVICES:
+            service = dict(LOCAL_SERVICE_DEFAULTS, **relay)
+            if "env_email" in relay:
+                service["email"] = os.getenv(relay["env_email"])
+            if "env_password" in relay:
+                service["password"] = os.getenv(relay["env_password"]) or ""
+            if service.get("email") and self._validate_email(service["email"]):
+                services.append(service)
             else:
-                print(f"⚠️  Invalid Outlook address: {self.outlook_email}")
+                print(f"⚠️  Relay {service.get('name')} has no valid From address - skipping it")
 
-        # Add Yahoo if configured
-        if self.yahoo_email and self.yahoo_password:
-            if self._validate_email(self.yahoo_email):
-                services.append(
-                    {
-                        "name": "Yahoo",
-                        "email": self.yahoo_email,
-                        "password": self.yahoo_password,
-                        "smtp_server": "smtp.mail.yahoo.com",
-                        "smtp_port": 587,
-                    }
+        return services
+
+    def transport_for(self, service):
+        """Pool a service is sent through - the SMTP pool, or its local transport"""
+        from smtp_pool import service_key
+        from transports import LOCAL_TRANSPORTS, create_local_transport
+
+        if service.get("transport", "smtp") not in LOCAL_TRANSPORTS:
+            return self.smtp_pool
+
+        key = service_key(service)
+        with self._transports_lock:
+            if key not in self._local_transports:
+                self._local_transports[key] = create_local_transport(
+                    service, self.transport_config, self.get_cache_dir()
                 )
-            else:
-                print(f"⚠️  Invalid Yahoo address: {self.yahoo_email}")
+            return self._local_transports[key]
 
-        return services
+    def get_cache_dir(self):
+        """Directory for state and caches kept between runs (restored by GitHub Actions)"""
+        cache_dir = self._cache_dir or (
+            Path(__file__).parent.parent / self.cache_config.get("cache_dir", ".cache")
+        )
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"⚠️  Could not create cache directory {cache_dir}: {e}")
+        return cache_dir
+
+    def open_outbox(self, spool_dir=None):
+        """Open the outbox in cache_dir, or a self-contained one in spool_dir"""
+        from outbox import Outbox
+
+        if spool_dir is None:
+            database = self.get_cache_dir() / self.outbox_config.get("database", "outbox.sqlite3")
+            spool_dir = self.get_cache_dir() / self.outbox_config.get("spool_directory", "outbox")
+        else:
+            spool_dir = Path(spool_dir)
+            database = spool_dir / self.outbox_config.get("database", "outbox.sqlite3")
+
+        outbox = Outbox(
+            database,
+            spool_dir,
+            lease_seconds=self.outbox_config.get("lease_seconds", 300),
+            max_attempts=self.outbox_config.get("max_attempts", 5),
+            retry_delay_seconds=self.outbox_config.get("retry_delay_seconds", 30),
+        )
+        outbox.purge(self.outbox_config.get("retention_days", 30))
+        return outbox
 
     def get_current_time_pakistan(self):
         """Get current time in Pakistan timezone"""
-        utc_now = datetime.now(pytz.UTC)
+        utc_now = datetime.now(timezone.utc)
         pakistan_time = utc_now.astimezone(self.pakistan_tz)
         return pakistan_time
 
@@ -406,19 +777,9 @@ class GovernmentEmailSender:
         random_num = random.randint(1000, 9999)
         return f"{prefix}-{date_str}-{random_num}"
 
-    def format_template_variables(self, template_text, reference_number):
-        """Format template with actual values"""
-        today = self.get_current_time_pakistan()
-
-        # Prepare variables for template formatting
+    def _build_static_template_variables(self):
+        """Placeholders derived from LOCATION_INFO, ISSUE_DETAILS and LEGAL_FRAMEWORK"""
         variables = {
-            "reference_number": reference_number,
-            "date_formatted": today.strftime(
-                self.template_config["formatting"]["date_format"]
-            ),
-            "time_formatted": today.strftime(
-                self.template_config["formatting"]["time_format"]
-            ),
             "area_name": self.location_info["area_name"],
             "city": self.location_info["city"],
             "province": self.location_info["province"],
@@ -458,11 +819,90 @@ class GovernmentEmailSender:
             [f"• {body}" for body in admin_bodies]
         )
 
-        try:
-            return template_text.format(**variables)
-        except KeyError as e:
-            print(f"⚠️  Template variable missing: {e}")
-            return template_text
+        return variables
+
+    def get_template_context(self):
+        """Read-only placeholder values shared by every message of the day's run
+
+        Built on first use and again when the Pakistan date changes, so a
+        long-running scheduler picks up the new date and run time.
+        """
+        today = self.get_current_time_pakistan()
+        if self._template_context is None or self._template_context_date != today.date():
+            if self._static_template_variables is None:
+                self._static_template_variables = self._build_static_template_variables()
+            variables = dict(self._static_template_variables)
+            variables["date_formatted"] = today.strftime(
+                self.template_config["formatting"]["date_format"]
+            )
+            variables["time_formatted"] = today.strftime(
+                self.template_config["formatting"]["time_format"]
+            )
+            self._template_context = MappingProxyType(variables)
+            self._template_context_date = today.date()
+        return self._template_context
+
+    def build_template_variables(self, reference_number, **message_fields):
+        """Values for every placeholder in TEMPLATE_VARIABLES
+
+        Per-message fields are layered over the shared context without copying it.
+        """
+        message_fields["reference_number"] = reference_number
+        return ChainMap(message_fields, self.get_template_context())
+
+    def format_template_variables(self, template_text, reference_number):
+        """Format template with actual values"""
+        compiled = self._compiled_text_cache.get(template_text)
+        if compiled is None:
+            compiled = CompiledTemplate(template_text)
+            compiled.validate(TEMPLATE_VARIABLES)
+            self._compiled_text_cache[template_text] = compiled
+        return compiled.render(self.build_template_variables(reference_number))
+
+    def get_compiled_template(self, template_id):
+        """Compiled subject, body and plain-text forms of a template, built on first use
+
+        An unknown placeholder raises TemplateError here, before anything is sent.
+        """
+        compiled = self.compiled_templates.get(template_id)
+        if compiled is not None:
+            return compiled
+
+        template = self.email_templates[template_id]
+        if self.template_cache is not None:
+            compiled = self.template_cache.load(template_id, template)
+
+        if compiled is None:
+            from html_text import html_to_text
+            from template_build import build_html
+
+            compiled = compile_template(template, template_id, TEMPLATE_VARIABLES)
+            # Plain-text alternative converted once, placeholders left to fill per send
+            if template.get("content_type", "plain") == "html":
+                compiled["plain_template"] = compiled["body_template"].transform(
+                    html_to_text, f"Template {template_id} plain_template"
+                )
+                # Minify the HTML (and inline CSS, if enabled) once instead of sending the source as-is
+                if TEMPLATE_BUILD_CONFIG.get("inline_css") or TEMPLATE_BUILD_CONFIG.get("minify_html"):
+                    compiled["body_template"] = compiled["body_template"].transform(
+                        lambda document: build_html(
+                            document,
+                            inline_css=TEMPLATE_BUILD_CONFIG.get("inline_css", False),
+                            minify_html=TEMPLATE_BUILD_CONFIG.get("minify_html", True),
+                        )
+                    )
+            if self.template_cache is not None:
+                self.template_cache.save(template_id, template, compiled)
+        else:
+            for compiled_template in compiled.values():
+                compiled_template.validate(TEMPLATE_VARIABLES)
+
+        # The compiled form holds the text - release the raw body
+        if hasattr(template, "unload"):
+            template.unload()
+
+        self.compiled_templates[template_id] = compiled
+        return compiled
 
     def get_email_template(self, template_type):
         """Get email template based on type (1, 2, or 3) with HTML support"""
@@ -474,16 +914,14 @@ class GovernmentEmailSender:
             template_type = self.template_config["default_template"]
 
         template_config = self.email_templates[template_type]
+        compiled = self.get_compiled_template(template_type)
 
-        # Format subject and body with variables
-        subject = self.format_template_variables(
-            template_config["subject_template"], reference_number
-        )
-        body = self.format_template_variables(
-            template_config["body_template"], reference_number
-        )
+        # Fill the precompiled subject and body from one set of variables
+        variables = self.build_template_variables(reference_number)
+        subject = compiled["subject_template"].render(variables)
+        body = compiled["body_template"].render(variables)
 
-        return {
+        email_template = {
             "subject": subject,
             "body": body,
             "language": template_config["language"],
@@ -491,44 +929,43 @@ class GovernmentEmailSender:
             "content_type": template_config.get("content_type", "plain"),
             "reference_number": reference_number,
         }
+        if "plain_template" in compiled:
+            email_template["plain_body"] = compiled["plain_template"].render(variables)
+        return email_template
 
     def _create_plain_text_fallback(self, html_content):
         """Create plain text version from HTML content"""
-        import re
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^<]+?>', '', html_content)
-        
-        # Replace HTML entities
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&amp;', '&')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&quot;', '"')
-        text = text.replace('&#x27;', "'")
-        
-        # Clean up multiple spaces and newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
-        
-        # Clean up extra whitespace around lines
-        lines = text.split('\n')
-        lines = [line.strip() for line in lines]
-        text = '\n'.join(lines)
-        
-        return text.strip()
+        from html_text import html_to_text
+
+        return html_to_text(html_content)
 
     def select_email_service(self):
-        """Select email service based on day of year for rotation with proper fallback"""
+        """Select email service by weighted load balancing, or day-of-year rotation"""
         if not self.email_services:
             raise ValueError("No email services available")
 
         if len(self.email_services) == 1:
             return self.email_services[0]
 
-        day_of_year = self.get_current_time_pakistan().timetuple().tm_yday
-        service_index = day_of_year % len(self.email_services)
-        return self.email_services[service_index]
+        if self.load_balancing_config.get("enabled", True):
+            service = self.load_balancer.next_service()
+        else:
+            day_of_year = self.get_current_time_pakistan().timetuple().tm_yday
+            service = self.email_services[day_of_year % len(self.email_services)]
+        return self._prefer_capacity(service)
+
+    def _prefer_capacity(self, service):
+        """service, or the account with the most quota left if service has used its quota"""
+        if self.quota_ledger is None or self.quota_ledger.has_capacity(service):
+            return service
+        with_capacity = [s for s in self.email_services if self.quota_ledger.has_capacity(s)]
+        if not with_capacity:
+            return service
+        replacement = max(
+            with_capacity, key=lambda s: self.quota_ledger.remaining(s)["messages"]
+        )
+        print(f"📊 {service['name']} has used its daily quota - routing to {replacement['name']}")
+        return replacement
 
     def select_template(self):
         """Select template based on day of week for Monday/Wednesday/Friday rotation"""
@@ -572,6 +1009,13 @@ class GovernmentEmailSender:
 
     def find_media_directory(self):
         """Find the media directory using proper path resolution"""
+        # Reuse the location found by an earlier run
+        if self.media_manifest is not None:
+            media_dir = self.media_manifest.cached_media_dir()
+            if media_dir:
+                print(f"✅ Media directory found: {media_dir}")
+                return media_dir
+
         # Get the directory where this script is located
         script_dir = Path(__file__).parent.absolute()
 
@@ -602,11 +1046,24 @@ class GovernmentEmailSender:
         total_size_mb = 0
 
         try:
-            for file_path in media_dir.iterdir():
-                # Skip directories and hidden files
-                if file_path.is_dir() or file_path.name.startswith("."):
-                    continue
-
+            if self.media_manifest is not None:
+                # Only new or changed files are stat'ed and hashed again
+                manifest_files = self.media_manifest.refresh(media_dir)
+                if self.media_manifest.rehashed:
+                    print(f"🗂️  Media manifest: re-indexed {self.media_manifest.rehashed} changed files")
+                self.media_manifest.save()
+                for name, entry in manifest_files.items():
+                    self._file_size_cache[media_dir / name] = entry["size"] / (1024 * 1024)
+                candidates = [media_dir / name for name in sorted(manifest_files)]
+            else:
+                candidates = [
+                    file_path
+                    for file_path in media_dir.iterdir()
+                    # Skip directories and hidden files
+                    if not file_path.is_dir() and not file_path.name.startswith(".")
+                ]
+
+            for file_path in candidates:
                 # Check file type
                 if not self.is_valid_file_type(file_path):
                     print(f"⚠️  Skipping unsupported file type: {file_path.name}")
@@ -646,135 +1103,618 @@ class GovernmentEmailSender:
         )
         return valid_files
 
-    def attach_media_files(self, msg):
-        """Attach all valid media files to email"""
-        media_files = self.discover_media_files()
+    def build_attachment_parts(self):
+        """Read and base64-encode all valid media files into MIME parts"""
+        with self.stage_timer.span("discovery") as span:
+            media_files = self.discover_media_files()
+            span.set(files=len(media_files))
 
         if not media_files:
             print("No valid media files found. Sending email without attachments.")
-            return
+            return []
+
+        with self.stage_timer.span("encode", files=len(media_files)) as span:
+            parts = self._build_attachment_parts(media_files, span)
 
-        attached_count = 0
+        print(f"📎 Successfully attached {len(parts)}/{len(media_files)} media files")
+        if self.attachment_cache is not None:
+            print(
+                f"🗄️  Attachment cache: {self.attachment_cache.hits} hits, "
+                f"{self.attachment_cache.misses} misses"
+            )
+            self.attachment_cache.save()
+        return parts
+
+    def _build_attachment_parts(self, media_files, span):
+        """MIME parts for media_files, counting the media bytes on span"""
+        parts = []
         for file_path in media_files:
             try:
                 file_path_obj = Path(file_path)
-                with open(file_path_obj, "rb") as f:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(f.read())
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        "Content-Disposition",
-                        f"attachment; filename= {file_path_obj.name}",
-                    )
-                    msg.attach(part)
-                attached_count += 1
+                span.add("bytes", file_path_obj.stat().st_size)
+                content_hash = (
+                    self.media_manifest.content_hash(file_path_obj)
+                    if self.media_manifest is not None
+                    else None
+                )
+                if self.streaming_config.get("enabled", True):
+                    # Payload stays on disk and is streamed during DATA
+                    if self.attachment_cache is not None:
+                        part = StreamedAttachment(
+                            self.attachment_cache.get_encoded_path(file_path_obj, content_hash),
+                            source_is_encoded=True,
+                        )
+                    else:
+                        part = StreamedAttachment(file_path_obj)
+                elif self.attachment_cache is not None:
+                    # Reuse the encoded payload when the file is unchanged
+                    part = self.attachment_cache.build_part(file_path_obj, content_hash)
+                else:
+                    with open(file_path_obj, "rb") as f:
+                        part = MIMEBase("application", "octet-stream")
+                        part.set_payload(f.read())
+                        encoders.encode_base64(part)
+                part.add_header(
+                    "Content-Disposition",
+                    f"attachment; filename= {file_path_obj.name}",
+                )
+                parts.append(part)
                 print(f"✅ Attached: {file_path_obj.name}")
             except (FileNotFoundError, PermissionError, OSError) as e:
                 print(f"❌ Failed to attach {Path(file_path).name}: {e}")
             except Exception as e:
                 print(f"❌ Unexpected error attaching {Path(file_path).name}: {e}")
+        return parts
 
-        print(
-            f"📎 Successfully attached {attached_count}/{len(media_files)} media files"
-        )
+    def attach_media_files(self, msg):
+        """Attach all valid media files to email"""
+        for part in self.build_attachment_parts():
+            msg.attach(part)
+
+    def build_shared_parts(self, template):
+        """Build the body and attachment parts shared by every copy of a message"""
+        content_type = template.get("content_type", "plain")
+        parts = []
+
+        # Add email content based on type
+        if content_type == "html":
+            # Plain text fallback - precomputed for compiled templates
+            plain_text = template.get("plain_body")
+            if plain_text is None:
+                plain_text = self._create_plain_text_fallback(template["body"])
 
-    def send_email(self, service, template):
-        """Send email using specified service and template with HTML support"""
-        try:
-            content_type = template.get("content_type", "plain")
-            
-            # Create multipart message for better compatibility
-            if content_type == "html":
-                msg = MIMEMultipart('alternative')
-                print(f"📧 Creating multipart HTML email")
-            else:
-                msg = MIMEMultipart()
-                print(f"📧 Creating plain text email")
+            # Add plain text version (fallback)
+            parts.append(MIMEText(plain_text, 'plain', 'utf-8'))
 
-            # Set headers and distribution
-            distribution = self._setup_email_headers(msg, service, template)
+            # Add HTML version (preferred)
+            parts.append(MIMEText(template["body"], 'html', 'utf-8'))
 
-            # Add email content based on type
-            if content_type == "html":
-                # Create plain text fallback
-                plain_text = self._create_plain_text_fallback(template["body"])
-                
-                # Add plain text version (fallback)
-                part1 = MIMEText(plain_text, 'plain', 'utf-8')
-                msg.attach(part1)
-                
-                # Add HTML version (preferred)
-                part2 = MIMEText(template["body"], 'html', 'utf-8')
-                msg.attach(part2)
-                
-                print(f"✅ Added HTML content with plain text fallback")
-            else:
-                # Plain text only
-                msg.attach(MIMEText(template["body"], "plain", "utf-8"))
-                print(f"✅ Added plain text content")
+            print(f"✅ Added HTML content with plain text fallback")
+        else:
+            # Plain text only
+            parts.append(MIMEText(template["body"], "plain", "utf-8"))
+            print(f"✅ Added plain text content")
 
-            # Attach media files
-            self.attach_media_files(msg)
+        # Attach media files
+        parts.extend(self.build_attachment_parts())
 
-            # Connect to SMTP server with specific error handling
-            try:
-                server = smtplib.SMTP(service["smtp_server"], service["smtp_port"], timeout=60)
-                server.ehlo()  # Identify ourselves
-                server.starttls()  # Enable encryption
-                server.ehlo()  # Re-identify as encrypted connection
+        return {"content_type": content_type, "parts": parts}
+
+    def _new_message(self, shared_parts):
+        """Create a multipart message carrying the shared parts"""
+        # Create multipart message for better compatibility
+        if shared_parts["content_type"] == "html":
+            msg = MIMEMultipart('alternative')
+        else:
+            msg = MIMEMultipart()
+
+        for part in shared_parts["parts"]:
+            msg.attach(part)
+        return msg
+
+    def build_message(self, service, template, shared_parts=None):
+        """Build the complete MIME message and its distribution list"""
+        if shared_parts is None:
+            shared_parts = self.build_shared_parts(template)
+
+        if shared_parts["content_type"] == "html":
+            print(f"📧 Creating multipart HTML email")
+        else:
+            print(f"📧 Creating plain text email")
+
+        msg = self._new_message(shared_parts)
+
+        # Set headers and distribution
+        distribution = self._setup_email_headers(msg, service, template)
+
+        return msg, distribution
+
+    def build_recipient_message(self, service, template, shared_parts, recipient):
+        """Build an individual copy of a message addressed to one recipient"""
+        with self.stage_timer.span("build", recipients=1):
+            msg = self._new_message(shared_parts)
+            msg["From"] = service["email"]
+            msg["To"] = recipient
+            msg["Subject"] = template["subject"]
+        return msg
+
+    def build_batch_message(self, service, template, shared_parts, batch):
+        """Build the copy of a message addressed to one recipient batch"""
+        with self.stage_timer.span("build", recipients=len(batch["recipients"])):
+            msg = self._new_message(shared_parts)
+            msg["From"] = service["email"]
+            # A batch without TO addresses (CC/BCC overflow) must not reveal its BCC recipients
+            msg["To"] = ", ".join(batch["to"]) if batch["to"] else UNDISCLOSED_RECIPIENTS
+            if batch["cc"]:
+                msg["Cc"] = ", ".join(batch["cc"])
+            msg["Subject"] = template["subject"]
+        return msg
+
+    def plan_recipient_batches(self):
+        """Distribution list split into batches every configured provider accepts"""
+        distribution = self._get_email_distribution_list()
+        limit = recipient_limit(self.email_services)
+        batches = split_distribution(distribution, limit)
+        if len(batches) > 1:
+            print(
+                f"📦 Splitting {distribution['total']} recipients into {len(batches)} batches "
+                f"of at most {limit}"
+            )
+        return batches
+
+    def _transmit_once(self, service, msg, recipients):
+        """Send a built message over one service; returns 'sent', 'rejected' or 'failed'"""
+        # Imported on first send - the render stage never needs smtplib or ssl
+        import smtplib
+
+        from outbox import StoredMessage
+        from telemetry import ByteCounter
+
+        # Anti-spam pacing - only waits when this service was just used
+        with self.stage_timer.span("pace", service=service["name"]):
+            self.rate_limiter.wait(service)
+        started = time.monotonic()
+
+        # Check out a pooled, already authenticated session
+        try:
+            pool = self.transport_for(service)
+            # New sessions record connect, starttls and auth spans inside this one
+            with self.stage_timer.span("acquire", service=service["name"]):
+                session = pool.acquire(service, len(recipients))
+            if pool is self.smtp_pool:
                 print(f"✅ Connected to {service['name']} SMTP server")
-            except (smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected) as e:
-                print(f"❌ Failed to connect to {service['name']} SMTP server: {e}")
-                return False
-            except Exception as e:
-                print(f"❌ Unexpected connection error with {service['name']}: {e}")
-                return False
+            else:
+                print(f"✅ Handing over to {service['name']} ({service['transport']} transport)")
+        except smtplib.SMTPAuthenticationError as e:
+            print(f"❌ Authentication failed for {service['name']}: {e}")
+            # Bad credentials will not fix themselves - trip the breaker now
+            self.provider_health.record_failure(service, trip=True)
+            return "failed"
+        except (smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected) as e:
+            print(f"❌ Failed to connect to {service['name']} SMTP server: {e}")
+            self.provider_health.record_failure(service)
+            return "failed"
+        except Exception as e:
+            print(f"❌ Unexpected connection error with {service['name']}: {e}")
+            self.provider_health.record_failure(service)
+            return "failed"
+
+        # Send email
+        try:
+            chunk_size = self.streaming_config.get("chunk_size_kb", 64) * 1024
+            with self.stage_timer.span(
+                "data", service=service["name"], recipients=len(recipients)
+            ) as span:
+                counter = ByteCounter()
+                if isinstance(msg, StoredMessage) and msg.dot_stuffed:
+                    header = msg.header_bytes()
+                    span.set(bytes=len(header) + msg.message_file.stat().st_size)
+                    refused = session.send_spool(
+                        service["email"],
+                        recipients,
+                        msg.message_file,
+                        header,
+                        self.streaming_config.get("spool_buffer_kb", 256) * 1024,
+                    )
+                elif isinstance(msg, StoredMessage):
+                    refused = session.send_chunks(
+                        service["email"], recipients, counter.wrap(msg.iter_chunks(chunk_size))
+                    )
+                elif self.streaming_config.get("enabled", True):
+                    # Generated straight into the DATA phase, attachments streamed from disk
+                    refused = session.send_chunks(
+                        service["email"], recipients, counter.wrap(iter_message(msg, chunk_size))
+                    )
+                else:
+                    text = msg.as_string()
+                    counter.bytes = len(text)
+                    refused = session.sendmail(service["email"], recipients, text)
+                span.add("bytes", counter.bytes)
+            pool.release(session)
+        except smtplib.SMTPRecipientsRefused as e:
+            # The recipients are the problem, not the provider
+            print(f"❌ Recipients refused by {service['name']}: {e}")
+            pool.release(session)
+            return "rejected"
+        except smtplib.SMTPDataError as e:
+            print(f"❌ Data error with {service['name']}: {e}")
+            pool.release(session)
+            self.provider_health.record_failure(service)
+            return "failed"
+        except Exception as e:
+            print(f"❌ Unexpected error sending email with {service['name']}: {e}")
+            pool.discard(session)
+            self.provider_health.record_failure(service)
+            return "failed"
+
+        self.provider_health.record_success(service, time.monotonic() - started)
+        if refused:
+            # Accepted for the others - report who will not receive it
+            print(f"⚠️  {len(refused)}/{len(recipients)} recipients refused by {service['name']}:")
+            for recipient, (code, response) in refused.items():
+                print(f"   {recipient}: {code} {response.decode(errors='replace')}")
+        return "sent"
+
+    def transmit_message(self, service, msg, recipients):
+        """Send an already built message, failing over to the next healthy service"""
+        outcome, _ = self._transmit_with_failover(service, msg, recipients)
+        return outcome == "sent"
+
+    def _transmit_with_failover(self, service, msg, recipients):
+        """Outcome of transmit_message and the service that produced it"""
+        if self.failover_config.get("enabled", True):
+            candidates = self.provider_health.failover_order(service, self.email_services)
+        else:
+            candidates = [service]
+
+        if not candidates:
+            print("❌ No healthy email service available - all circuits are open")
+            return "failed", None
+
+        if self.quota_ledger is not None:
+            with_capacity = [
+                c for c in candidates if self.quota_ledger.has_capacity(c, len(recipients))
+            ]
+            if not with_capacity:
+                print("⏸️  Every available service has used its daily quota")
+                return "deferred", None
+            candidates = with_capacity
+
+        for attempt, candidate in enumerate(candidates):
+            if attempt or candidate is not service:
+                print(f"🔁 Failing over to {candidate['name']} ({candidate['email']})")
+            if msg["From"] != candidate["email"]:
+                # Reuse the built message - only the sender changes
+                msg.replace_header("From", candidate["email"])
+
+            quota_token = None
+            if self.quota_ledger is not None:
+                quota_token = self.quota_ledger.reserve(candidate, len(recipients))
+                if quota_token is None:
+                    # Another worker took the last of this account's quota
+                    continue
 
-            # Authenticate
+            if not self.provider_health.allow_request(candidate):
+                # Its circuit opened, or another worker holds its one trial send
+                if quota_token is not None:
+                    self.quota_ledger.release(candidate, len(recipients), quota_token)
+                continue
             try:
-                server.login(service["email"], service["password"])
-                print(f"✅ Authenticated with {service['name']}")
-            except smtplib.SMTPAuthenticationError as e:
-                print(f"❌ Authentication failed for {service['name']}: {e}")
-                server.quit()
-                return False
-            except Exception as e:
-                print(f"❌ Unexpected authentication error with {service['name']}: {e}")
-                server.quit()
-                return False
+                outcome = self._transmit_once(candidate, msg, recipients)
+            finally:
+                self.provider_health.end_request(candidate)
+            if outcome != "sent" and quota_token is not None:
+                self.quota_ledger.release(candidate, len(recipients), quota_token)
+            if outcome in ("sent", "rejected"):
+                return outcome, candidate
+
+        return "failed", None
+
+    def assign_services(self, service, count):
+        """Choose a service for each of count messages, starting with service"""
+        if count == 0:
+            return []
+        if len(self.email_services) == 1 or not self.load_balancing_config.get("enabled", True):
+            return [service] * count
 
-            # Send email
+        # Spread the remaining messages across every configured account
+        return [service] + self.load_balancer.assign(count - 1)
+
+    def send_email_fan_out(self, service, template):
+        """Send an individual copy of the email to each recipient in parallel"""
+        distribution = self._get_email_distribution_list()
+        recipients = distribution["to"] + distribution["cc"] + distribution["bcc"]
+        workers = self.email_distribution_config.get("fan_out_workers", 4)
+
+        # Render the body and encode attachments once for every copy
+        shared_parts = self.build_shared_parts(template)
+        print(f"📧 Fanning out {len(recipients)} individual emails ({workers} workers)")
+
+        services = self.assign_services(service, len(recipients))
+
+        def send_one(recipient, recipient_service):
+            msg = self.build_recipient_message(
+                recipient_service, template, shared_parts, recipient
+            )
+            return self.transmit_message(recipient_service, msg, [recipient])
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(recipients, executor.map(self.stage_timer.propagate(send_one), recipients, services)))
+
+        failed = [recipient for recipient, sent in results.items() if not sent]
+        delivered = len(recipients) - len(failed)
+        print(f"📬 Delivered {delivered}/{len(recipients)} individual emails")
+        for recipient in failed:
+            print(f"⚠️  Not delivered: {recipient}")
+
+        return {"delivered": delivered, "failed": failed, "total": len(recipients)}
+
+    def campaign_id(self, template_type):
+        """Identifies one day's campaign in the outbox"""
+        return f"{self.get_current_time_pakistan():%Y%m%d}-template{template_type}"
+
+    def enqueue_email(self, service, template, campaign):
+        """Render the email and store every copy of it in the outbox"""
+        from outbox import idempotency_key
+        from smtp_pool import service_key
+
+        queued = 0
+
+        if self.email_distribution_config.get("fan_out", False):
+            distribution = self._get_email_distribution_list()
+            recipients = distribution["to"] + distribution["cc"] + distribution["bcc"]
+            shared_parts = self.build_shared_parts(template)
+            services = self.assign_services(service, len(recipients))
+            for recipient, recipient_service in zip(recipients, services):
+                msg = self.build_recipient_message(
+                    recipient_service, template, shared_parts, recipient
+                )
+                queued += self._spool_message(
+                    idempotency_key(campaign, [recipient]),
+                    campaign,
+                    service_key(recipient_service),
+                    [recipient],
+                    msg,
+                )
+        else:
+            batches = self.plan_recipient_batches()
+            shared_parts = self.build_shared_parts(template)
+            services = self.assign_services(service, len(batches))
+            for batch, batch_service in zip(batches, services):
+                msg = self.build_batch_message(batch_service, template, shared_parts, batch)
+                queued += self._spool_message(
+                    idempotency_key(campaign, batch["recipients"]),
+                    campaign,
+                    service_key(batch_service),
+                    batch["recipients"],
+                    msg,
+                )
+
+        return queued
+
+    def _spool_message(self, idempotency_key, campaign, key, recipients, msg):
+        """Serialize one message into the outbox spool, timing it as a stage"""
+        with self.stage_timer.span("spool", recipients=len(recipients)) as span:
+            queued = self.outbox.enqueue(idempotency_key, campaign, key, recipients, msg)
+            if queued:
+                span.set(bytes=self.outbox.spool_path(idempotency_key).stat().st_size)
+        return queued
+
+    def stored_message_service(self, message):
+        """The service a stored message was rendered for, or today's pick if it is gone"""
+        from smtp_pool import service_key
+
+        return next(
+            (s for s in self.email_services if service_key(s) == message.service_key), None
+        ) or self.select_email_service()
+
+    def _deliver_stored(self, message):
+        """Transmit one leased outbox message and record the outcome"""
+        service = self.stored_message_service(message)
+        outcome, sent_via = self._transmit_with_failover(service, message, message.recipients)
+        return self.record_delivery(message, outcome, sent_via)
+
+    def record_delivery(self, message, outcome, sent_via):
+        """Record a leased message's outcome in the outbox; returns its new status"""
+        from outbox import FAILED, PENDING, SENT
+
+        if outcome == "sent":
+            self.outbox.mark_sent(message, sent_via["name"])
+            print(
+                f"📨 Sent {message.idempotency_key} to {len(message.recipients)} recipients "
+                f"via {sent_via['name']}"
+            )
+            return SENT
+        if outcome == "rejected":
+            self.outbox.mark_failed(message, "recipients refused", retry=False)
+            return FAILED
+        if outcome == "deferred":
+            # Queue it for the next quota window without spending an attempt
+            available_at = self.quota_ledger.next_window_at(self.email_services)
+            self.outbox.defer(message, available_at, "daily quota exhausted")
+            print(
+                f"⏸️  Deferred {message.idempotency_key} until "
+                f"{datetime.fromtimestamp(available_at, self.pakistan_tz):%Y-%m-%d %H:%M %Z}"
+            )
+            return PENDING
+
+        delay = self.outbox.mark_failed(message, "delivery failed on every available service")
+        if delay is None:
+            print(f"❌ Giving up on {message.idempotency_key} after {message.attempts} attempts")
+            return FAILED
+        print(f"🔁 Will retry {message.idempotency_key} in {delay:.0f}s (attempt {message.attempts})")
+        return PENDING
+
+    def retry_wait_limits(self):
+        """Longest single retry wait, and the monotonic deadline for all waits of one drain
+
+        A one-shot GitHub Actions run bills every minute it sleeps through a
+        backoff, so by default it leaves retries to the next scheduled run.
+        """
+        if os.getenv("GITHUB_ACTIONS"):
+            max_wait = self.outbox_config.get("one_shot_retry_wait_seconds", 0)
+        else:
+            max_wait = self.outbox_config.get("max_retry_wait_seconds", 120)
+        return max_wait, time.monotonic() + self.outbox_config.get("max_total_wait_seconds", 300)
+
+    @staticmethod
+    def should_wait_for_retry(wait, max_wait, deadline):
+        """Whether a drain worker should sleep until the next retry, wait seconds away"""
+        if wait is None or wait > max_wait:
+            return False
+        return wait <= 0 or time.monotonic() + wait <= deadline
+
+    def drain_outbox(self):
+        """Deliver every ready outbox message with a pool of leasing workers"""
+        from outbox import FAILED, PENDING, SENT
+
+        workers = self.outbox_config.get("workers", 4)
+        max_wait, deadline = self.retry_wait_limits()
+        results = {SENT: 0, PENDING: 0, FAILED: 0}
+        results_lock = threading.Lock()
+
+        def work(worker_id):
             try:
-                text = msg.as_string()
-                all_recipients = distribution["to"] + distribution["cc"] + distribution["bcc"]
-                server.sendmail(service["email"], all_recipients, text)
-                server.quit()
+                while True:
+                    message = self.outbox.lease(worker_id)
+                    if message is None:
+                        # Wait for a retry that is due soon; leave later ones to the next run
+                        wait = self.outbox.next_ready_in()
+                        if not self.should_wait_for_retry(wait, max_wait, deadline):
+                            return
+                        time.sleep(max(wait, 0.1))
+                        continue
+
+                    outcome = self._deliver_stored(message)
+                    with results_lock:
+                        results[outcome] += 1
+            finally:
+                self.outbox.close()
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        print(f"📤 Draining outbox with {workers} workers")
+        with self.stage_timer.span("drain", workers=workers):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self.stage_timer.propagate(work), range(workers)))
+        return results
+
+    def render_campaign(self, service, template, campaign):
+        """Render stage: queue every message of the campaign not already in the outbox
+
+        Idempotency keys are the same on every run, so a run that crashed
+        part-way through rendering is completed here without queueing
+        anything it already queued.
+        """
+        queued = self.enqueue_email(service, template, campaign)
+        self.outbox.write_manifest()
+        print(f"📥 Queued {queued} new message(s) for campaign {campaign} in {self.outbox.spool_dir}")
+        return queued
+
+    def transmit_outbox(self, campaign=None):
+        """Transmit stage: deliver everything ready in the outbox, reporting on a campaign"""
+        return self.summarize_outbox(self.drain_outbox(), campaign)
+
+    def summarize_outbox(self, results, campaign=None):
+        """Write the manifest and report a drain's results, and a campaign's if given"""
+        from outbox import FAILED, LEASED, PENDING, SENT
+
+        self.outbox.write_manifest()
+        print(
+            f"📬 Outbox: {results[SENT]} delivered, {results[PENDING]} awaiting retry, "
+            f"{results[FAILED]} failed this run"
+        )
+        if campaign is None:
+            return results
+
+        counts = self.outbox.counts(campaign)
+        print(
+            f"📬 Campaign {campaign}: {counts[SENT]} sent, "
+            f"{counts[PENDING] + counts[LEASED]} waiting, {counts[FAILED]} failed"
+        )
+        return {"delivered": counts[SENT], "total": self.outbox.recipient_count(campaign, SENT)}
+
+    def send_email_via_outbox(self, service, template, campaign):
+        """Render the campaign into the outbox and transmit it"""
+        self.render_campaign(service, template, campaign)
+        return self.transmit_outbox(campaign)
+
+    def send_email_batched(self, service, template):
+        """Send one copy of the email per recipient batch, batches in parallel"""
+        batches = self.plan_recipient_batches()
+        shared_parts = self.build_shared_parts(template)
+        if shared_parts["content_type"] == "html":
+            print(f"📧 Creating multipart HTML email")
+        else:
+            print(f"📧 Creating plain text email")
+
+        services = self.assign_services(service, len(batches))
+
+        def send_batch(batch, batch_service):
+            msg = self.build_batch_message(batch_service, template, shared_parts, batch)
+            return self.transmit_message(batch_service, msg, batch["recipients"])
+
+        if len(batches) == 1:
+            results = [send_batch(batches[0], services[0])]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            workers = self.email_distribution_config.get("batch_workers", 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(self.stage_timer.propagate(send_batch), batches, services)
+                )
+        return self.summarize_batches(batches, results)
+
+    def summarize_batches(self, batches, results):
+        """Report each batch's outcome; returns delivered/failed/total like the fan-out"""
+        failed = []
+        for number, (batch, sent) in enumerate(zip(batches, results), 1):
+            if len(batches) > 1:
+                status = "✅ sent" if sent else "❌ failed"
+                print(f"📦 Batch {number}/{len(batches)} ({len(batch['recipients'])} recipients): {status}")
+            if not sent:
+                failed.extend(batch["recipients"])
+
+        total = sum(len(batch["recipients"]) for batch in batches)
+        return {"delivered": total - len(failed), "failed": failed, "total": total}
+
+    def send_email(self, service, template, campaign=None):
+        """Send email using specified service and template with HTML support"""
+        try:
+            content_type = template.get("content_type", "plain")
+
+            if self.outbox is not None and campaign is not None:
+                result = self.send_email_via_outbox(service, template, campaign)
+                if not result["delivered"]:
+                    return False
+                total = result["total"]
+            elif self.email_distribution_config.get("fan_out", False):
+                result = self.send_email_fan_out(service, template)
+                if not result["delivered"]:
+                    return False
+                total = result["total"]
+            else:
+                result = self.send_email_batched(service, template)
+                if not result["delivered"]:
+                    return False
                 print(f"✅ Email sent successfully")
-            except smtplib.SMTPRecipientsRefused as e:
-                print(f"❌ Recipients refused by {service['name']}: {e}")
-                server.quit()
-                return False
-            except smtplib.SMTPDataError as e:
-                print(f"❌ Data error with {service['name']}: {e}")
-                server.quit()
-                return False
-            except Exception as e:
-                print(f"❌ Unexpected error sending email with {service['name']}: {e}")
-                server.quit()
-                return False
+                total = result["total"]
 
             print(f"📧 Service: {service['name']}")
             print(f"📧 Template: {template['name']} ({template['language']}) - {content_type.upper()}")
             print(f"📧 Subject: {template['subject'][:50]}...")
-            print(f"👥 Recipients: {distribution['total']}")
+            print(f"👥 Recipients: {total}")
             return True
 
         except Exception as e:
             print(f"❌ Unexpected error in send_email: {e}")
             return False
 
-    def send_daily_emails(self):
-        """Main function to send emails with rotation and anti-spam features"""
+    def prepare_daily_campaign(self):
+        """Select today's service and template; returns (service, template_type, template) or None"""
         current_time = self.get_current_time_pakistan()
         print(
             f"\n🚀 Starting email campaign - {current_time.strftime('%Y-%m-%d %H:%M:%S PKT')}"
@@ -784,35 +1724,125 @@ class GovernmentEmailSender:
         try:
             service = self.select_email_service()
             template_type = self.select_template()
-            template = self.get_email_template(template_type)
+            with self.stage_timer.span("render", template=template_type) as span:
+                template = self.get_email_template(template_type)
+                span.set(bytes=len(template["body"].encode("utf-8")))
         except Exception as e:
             print(f"❌ Error in email/template selection: {e}")
-            return False
+            return None
 
         print(f"📧 Using service: {service['name']}")
         print(
             f"📝 Using template: {template['name']} (Type {template_type}, {template['language']}, {template.get('content_type', 'plain').upper()})"
         )
         print(f"📧 Available services: {len(self.email_services)}")
+        if self.quota_ledger is not None:
+            print("📊 Quota used in the last day:")
+            for usage in self.quota_ledger.describe(self.email_services):
+                print(f"   {usage}")
         print(
             f"📍 Location: {self.location_info['area_name']}, {self.location_info['city']}"
         )
+        return service, template_type, template
+
+    def _finish_run(self):
+        """Close pooled sessions and persist state shared between runs"""
+        # Politely QUIT pooled sessions - the next run is days away
+        self.smtp_pool.close_all()
+        for transport in self._local_transports.values():
+            transport.close_all()
+        self.provider_health.save()
+        if self.quota_ledger is not None:
+            self.quota_ledger.save()
+
+    @contextmanager
+    def timed_run(self, name):
+        """Time a whole run as the root span and export every span when it ends"""
+        self.stage_timer.reset()
+        try:
+            with self.stage_timer.span(name):
+                yield
+        finally:
+            self.export_stage_timings()
+
+    def export_stage_timings(self):
+        """Write the run's spans to the JSON-lines log and the Prometheus textfile"""
+        if not self.stage_timer.enabled:
+            return
+        config = self.telemetry_config
+        if config.get("print_summary", True):
+            print("⏱️  Stage timings:")
+            for line in self.stage_timer.summary():
+                print(f"   {line}")
+
+        # Relative paths are kept in cache_dir; point prometheus_file at the
+        # node_exporter --collector.textfile.directory with an absolute path
+        cache_dir = self.get_cache_dir()
+        if config.get("spans_file"):
+            self.stage_timer.write_jsonl(
+                cache_dir / config["spans_file"],
+                max_bytes=config.get("max_spans_file_mb", 20) * 1024 * 1024,
+            )
+        if config.get("prometheus_file"):
+            self.stage_timer.write_prometheus(
+                cache_dir / config["prometheus_file"],
+                state_file=cache_dir / config["state_file"] if config.get("state_file") else None,
+            )
 
-        # Send email
-        success = self.send_email(service, template)
+    def render_daily_emails(self):
+        """Render today's campaign into the outbox without sending it"""
+        if self.outbox is None:
+            print("❌ The render stage needs the outbox (OUTBOX_CONFIG['enabled'])")
+            return False
+
+        with self.timed_run("run.render"):
+            selection = self.prepare_daily_campaign()
+            if selection is None:
+                return False
+            service, template_type, template = selection
+
+            try:
+                self.render_campaign(service, template, self.campaign_id(template_type))
+            except Exception as e:
+                print(f"❌ Error rendering campaign: {e}")
+                return False
+            return True
+
+    def transmit_pending_emails(self):
+        """Send everything ready in the outbox; False if any message failed for good"""
+        from outbox import FAILED
+
+        if self.outbox is None:
+            print("❌ The transmit stage needs the outbox (OUTBOX_CONFIG['enabled'])")
+            return False
+
+        with self.timed_run("run.transmit"):
+            try:
+                results = self.transmit_outbox()
+            finally:
+                self._finish_run()
+            return results[FAILED] == 0
+
+    def send_daily_emails(self):
+        """Main function to send emails with rotation and anti-spam features"""
+        with self.timed_run("run.send"):
+            selection = self.prepare_daily_campaign()
+            if selection is None:
+                return False
+            service, template_type, template = selection
+
+            # Send email
+            try:
+                success = self.send_email(service, template, self.campaign_id(template_type))
+            finally:
+                self._finish_run()
 
         if success:
             print("✅ Email campaign completed successfully")
         else:
             print("❌ Email campaign failed")
 
-        # Random delay to avoid detection
-        delay = random.randint(
-            self.anti_spam_config["min_delay"], self.anti_spam_config["max_delay"]
-        )
-        print(f"⏱️ Waiting {delay} seconds before next operation...")
-        time.sleep(delay)
-
+        # Sends were paced by the rate limiter - nothing left to wait for
         return success
 
     # Fallback template for testing without configuration
@@ -846,32 +1876,52 @@ Automated Email System
         return fallback_template
 
 
+def run_once():
+    """Send today's email once and return whether it succeeded (GitHub Actions mode)"""
+    if ASYNC_SEND_CONFIG.get("enabled", False):
+        # Send on the asyncio engine
+        import asyncio
+        from async_sender import AsyncGovernmentEmailSender
+
+        print("🤖 Running in GitHub Actions mode (async engine)")
+        sender = AsyncGovernmentEmailSender()
+        return asyncio.run(sender.send_daily_emails())
+
+    sender = GovernmentEmailSender()
+    print("🤖 Running in GitHub Actions mode")
+    return sender.send_daily_emails()
+
+
 def main():
     """Main function to run the email sender"""
     try:
-        sender = GovernmentEmailSender()
-
         # Check if running in GitHub Actions or locally
         if os.getenv("GITHUB_ACTIONS"):
             # GitHub Actions mode - send once
-            print("🤖 Running in GitHub Actions mode")
-            success = sender.send_daily_emails()
-            return success
+            return run_once()
         else:
-            # Local mode - schedule for Monday, Wednesday, and Friday only
-            print("💻 Running in local mode - scheduling emails for Monday, Wednesday, and Friday")
-            schedule.every().monday.at("09:00").do(sender.send_daily_emails)
-            schedule.every().wednesday.at("09:00").do(sender.send_daily_emails)
-            schedule.every().friday.at("09:00").do(sender.send_daily_emails)
+            from scheduler import TimerScheduler, WeeklyTrigger
 
-            print(
-                "📅 Scheduled: Emails will be sent every Monday, Wednesday, and Friday at 9:00 AM PKT"
+            sender = GovernmentEmailSender()
+
+            # Local mode - sleep until each configured send day at the configured time
+            trigger = WeeklyTrigger(
+                EMAIL_SCHEDULE.get("days", ["monday", "wednesday", "friday"]),
+                EMAIL_SCHEDULE.get("time", "09:00"),
+                load_timezone(EMAIL_SCHEDULE.get("timezone", "Asia/Karachi")),
+            )
+            scheduler = TimerScheduler(
+                max_sleep_seconds=EMAIL_SCHEDULE.get("max_sleep_seconds", 300),
+                catch_up_window_hours=EMAIL_SCHEDULE.get("catch_up_window_hours", 12),
             )
-            print("📧 Three emails per week for better advocacy coverage")
+            job = scheduler.add_job("daily emails", trigger, sender.send_daily_emails)
 
-            while True:
-                schedule.run_pending()
-                time.sleep(60)
+            print(f"💻 Running in local mode - scheduling emails for {trigger.describe()}")
+            print(f"📅 Next send: {job.next_run:%A %Y-%m-%d %H:%M %Z}")
+            print(f"📧 {len(trigger.weekdays)} emails per week for better advocacy coverage")
+
+            scheduler.run_forever()
+            return True
     except ValueError as e:
         print(f"❌ Configuration error: {e}")
         return False
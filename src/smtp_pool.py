@@ -0,0 +1,279 @@
+"""
+SMTP Connection Pool for the Automated Government Email System
+Keeps authenticated SMTP sessions alive between messages so a run pays the
+TCP + TLS + AUTH handshake once per email service instead of once per send.
+Serves the "smtp" (STARTTLS), "smtps" (implicit TLS) and "lmtp" transports.
+"""
+
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from mime_stream import send_chunks_streaming, send_message_streaming, send_spool_file
+from telemetry import StageTimer
+
+# smtplib (and the ssl module it loads) is imported on first connection -
+# the render stage builds messages without ever talking to a server
+
+
+def service_key(service):
+    """Build a stable key identifying one email service account
+
+    Built from the provider and address, not the display name - "Gmail #3"
+    becomes "Gmail #2" when an earlier account is removed, but its quota
+    usage, health and queued messages must stay with the account.
+    """
+    return (
+        f"{service.get('provider', service['name'])}:{service['email']}"
+        f"@{service['smtp_server']}:{service['smtp_port']}"
+    )
+
+
+class PooledSMTPSession:
+    """An authenticated SMTP session checked out from the pool"""
+
+    def __init__(self, key, server, max_recipients=None):
+        self.key = key
+        self.server = server
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.messages_sent = 0
+        self.recipients_sent = 0
+        self.max_recipients = max_recipients  # Provider's RCPT limit per session, if any
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        """Send one message over this session and count it towards recycling"""
+        import smtplib
+
+        if isinstance(self.server, smtplib.LMTP):
+            # smtplib's sendmail reads a single reply to DATA - LMTP sends one per recipient
+            if isinstance(msg, str):
+                msg = msg.encode("ascii")
+            msg = re.sub(rb"\r\n|\r|\n", b"\r\n", msg)
+            refused = send_chunks_streaming(self.server, from_addr, to_addrs, [msg])
+        else:
+            refused = self.server.sendmail(from_addr, to_addrs, msg)
+        self.messages_sent += 1
+        self.recipients_sent += len(to_addrs)
+        return refused
+
+    def send_streaming(self, from_addr, to_addrs, msg, chunk_size=64 * 1024):
+        """Send a Message object, generating it straight into the DATA phase"""
+        refused = send_message_streaming(self.server, from_addr, to_addrs, msg, chunk_size)
+        self.messages_sent += 1
+        self.recipients_sent += len(to_addrs)
+        return refused
+
+    def send_chunks(self, from_addr, to_addrs, chunks):
+        """Send a message already serialized into CRLF byte chunks"""
+        refused = send_chunks_streaming(self.server, from_addr, to_addrs, chunks)
+        self.messages_sent += 1
+        self.recipients_sent += len(to_addrs)
+        return refused
+
+    def send_spool(self, from_addr, to_addrs, file_path, header=b"", buffer_size=256 * 1024):
+        """Send a pre-stuffed spool file, copying it straight to the socket"""
+        refused = send_spool_file(self.server, from_addr, to_addrs, file_path, header, buffer_size)
+        self.messages_sent += 1
+        self.recipients_sent += len(to_addrs)
+        return refused
+
+    def has_room_for(self, recipient_count):
+        """Whether another message to recipient_count recipients fits the session limit"""
+        if self.max_recipients is None:
+            return True
+        return self.recipients_sent + recipient_count <= self.max_recipients
+
+
+class SMTPConnectionPool:
+    """Pool of authenticated SMTP sessions keyed by email service"""
+
+    def __init__(self, config=None, stage_timer=None):
+        config = config or {}
+        self.stage_timer = stage_timer or StageTimer(enabled=False)
+        self.timeout = config.get("timeout", 60)
+        self.connect_timeout = config.get("connect_timeout", self.timeout)
+        self.max_idle_seconds = config.get("max_idle_seconds", 120)
+        self.noop_after_seconds = config.get("noop_after_seconds", 15)
+        self.max_messages_per_session = config.get("max_messages_per_session", 50)
+        self.max_sessions_per_service = config.get("max_sessions_per_service", 4)
+
+        self._idle = {}  # service key -> list of idle sessions
+        self._open = {}  # service key -> number of open sessions
+        self._condition = threading.Condition()
+
+    def _connect(self, service):
+        """Open the connection for a service's transport"""
+        import smtplib
+
+        transport = service.get("transport", "smtp")
+        host = service["smtp_server"]
+        # Short connect timeout so an unreachable provider fails fast
+        if transport == "smtp":
+            return smtplib.SMTP(host, service["smtp_port"], timeout=self.connect_timeout)
+        if transport == "smtps":
+            # TLS from the first byte, set up like starttls() would
+            return smtplib.SMTP_SSL(
+                host, service["smtp_port"] or smtplib.SMTP_SSL_PORT, timeout=self.connect_timeout
+            )
+        if transport == "lmtp":
+            # A host starting with "/" is the path of a Unix socket
+            return smtplib.LMTP(
+                host, service["smtp_port"] or smtplib.LMTP_PORT, timeout=self.connect_timeout
+            )
+        raise ValueError(f"{service['name']} uses transport {transport!r}, not SMTP")
+
+    def _open_session(self, service):
+        """Connect, upgrade to TLS and authenticate a new SMTP session"""
+        timer = self.stage_timer
+        transport = service.get("transport", "smtp")
+        with timer.span("connect", service=service["name"], transport=transport):
+            server = self._connect(service)
+        server.sock.settimeout(self.timeout)
+        if server.sock.family in (socket.AF_INET, socket.AF_INET6):
+            # Spool files go out as sendfile() followed by a separate end-of-data
+            # marker, which Nagle's algorithm would hold back until the next ACK
+            server.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            with timer.span("ehlo", service=service["name"]):
+                server.ehlo()  # Identify ourselves (LHLO for LMTP)
+            if transport == "smtp":
+                with timer.span("starttls", service=service["name"]):
+                    server.starttls()  # Enable encryption
+                    server.ehlo()  # Re-identify as encrypted connection
+            if service.get("password"):
+                # A local relay may accept mail without authentication
+                with timer.span("auth", service=service["name"]):
+                    server.login(service["email"], service["password"])
+        except Exception:
+            self._close_server(server)
+            raise
+        return server
+
+    def _close_server(self, server):
+        """Close an SMTP connection, ignoring errors from dead sockets"""
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _is_healthy(self, session, recipient_count=1):
+        """Check whether an idle session can still be used"""
+        idle_for = time.monotonic() - session.last_used
+        if idle_for > self.max_idle_seconds:
+            return False
+        if session.messages_sent >= self.max_messages_per_session:
+            return False
+        if not session.has_room_for(recipient_count):
+            return False
+        if idle_for < self.noop_after_seconds:
+            return True
+
+        # Session has been idle for a while - confirm the server still talks to us
+        try:
+            code, _ = session.server.noop()
+            return code == 250
+        except Exception:
+            return False
+
+    def acquire(self, service, recipient_count=1):
+        """Check out an authenticated session for a service, opening one if needed
+
+        Idle sessions that cannot take recipient_count more recipients under
+        the service's max_recipients_per_session are recycled.
+        """
+        key = service_key(service)
+
+        while True:
+            session = None
+            with self._condition:
+                while True:
+                    idle_sessions = self._idle.setdefault(key, [])
+                    if idle_sessions:
+                        session = idle_sessions.pop()
+                        break
+                    if self._open.get(key, 0) < self.max_sessions_per_service:
+                        # Reserve the slot before releasing the lock to connect
+                        self._open[key] = self._open.get(key, 0) + 1
+                        break
+                    self._condition.wait()
+
+            if session is None:
+                break
+
+            # Checked out, so probed without the lock - a half-dead server
+            # must not stall threads waiting for any other session
+            if self._is_healthy(session, recipient_count):
+                return session
+            self._close_server(session.server)
+            with self._condition:
+                self._open[key] -= 1
+                self._condition.notify()
+
+        try:
+            server = self._open_session(service)
+        except Exception:
+            with self._condition:
+                self._open[key] -= 1
+                self._condition.notify()
+            raise
+
+        return PooledSMTPSession(key, server, service.get("max_recipients_per_session"))
+
+    def release(self, session):
+        """Return a session to the pool after a successful or recoverable send"""
+        session.last_used = time.monotonic()
+
+        if session.messages_sent >= self.max_messages_per_session or not session.has_room_for(1):
+            self.discard(session)
+            return
+
+        with self._condition:
+            self._idle.setdefault(session.key, []).append(session)
+            self._condition.notify()
+
+    def discard(self, session):
+        """Close a session that is broken or has reached its message limit"""
+        self._close_server(session.server)
+        with self._condition:
+            self._open[session.key] -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def session(self, service):
+        """Context manager that checks a session out and returns it afterwards"""
+        import smtplib
+
+        session = self.acquire(service)
+        try:
+            yield session
+        except (
+            smtplib.SMTPRecipientsRefused,
+            smtplib.SMTPSenderRefused,
+            smtplib.SMTPDataError,
+        ):
+            # Server rejected the envelope but the session itself is intact
+            self.release(session)
+            raise
+        except Exception:
+            self.discard(session)
+            raise
+        else:
+            self.release(session)
+
+    def close_all(self):
+        """Quit every idle session in the pool"""
+        with self._condition:
+            idle = [s for sessions in self._idle.values() for s in sessions]
+            for session in idle:
+                self._open[session.key] -= 1
+            self._idle = {}
+            self._condition.notify_all()
+
+        for session in idle:
+            self._close_server(session.server)
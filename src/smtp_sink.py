@@ -0,0 +1,216 @@
+"""
+Local SMTP Sink Server for the Automated Government Email System
+An in-process SMTP server that accepts and discards everything: STARTTLS
+(or implicit TLS) with a throwaway self-signed certificate generated by the
+openssl command when the sink starts, AUTH that accepts
+any credentials, an LMTP mode and optional artificial latency. Used to benchmark the send path without
+a live email account.
+"""
+
+import socketserver
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def self_signed_context(common_name="localhost"):
+    """Server SSL context with a new self-signed certificate
+
+    The key and certificate only exist in a temporary directory while they
+    are loaded, so no private key is ever kept in the repository.
+    """
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    with tempfile.TemporaryDirectory() as directory:
+        cert_file = Path(directory) / "sink_cert.pem"
+        key_file = Path(directory) / "sink_key.pem"
+        try:
+            subprocess.run(
+                [
+                    "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                    "-keyout", str(key_file), "-out", str(cert_file),
+                    "-days", "1", "-subj", f"/CN={common_name}",
+                ],
+                check=True,
+                capture_output=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise RuntimeError(
+                f"Could not generate the sink certificate with openssl ({e}) - "
+                "install openssl or run the sink with --protocol lmtp (no TLS)"
+            ) from e
+        context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+class SinkStats:
+    """Counters shared by all sink connections"""
+
+    def __init__(self):
+        self.connections = 0
+        self.messages = 0
+        self.recipients = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def record_message(self, recipients, size):
+        with self._lock:
+            self.messages += 1
+            self.recipients += recipients
+            self.bytes += size
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough ESMTP to accept mail from smtplib and the async client"""
+
+    def setup(self):
+        super().setup()
+        self.tls_active = False
+
+    def reply(self, line):
+        """Send a reply line after the configured artificial latency"""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+        self.wfile.flush()
+
+    def start_tls(self):
+        """Upgrade the connection using the sink's self-signed certificate"""
+        self.request = self.server.ssl_context.wrap_socket(self.request, server_side=True)
+        self.rfile = self.request.makefile("rb")
+        self.wfile = self.request.makefile("wb")
+        self.tls_active = True
+
+    def read_data(self):
+        """Read a DATA payload up to the terminating dot line; returns its size"""
+        size = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                raise ConnectionError("Client disconnected during DATA")
+            if line in (b".\r\n", b".\n"):
+                return size
+            size += len(line)
+
+    def handle(self):
+        self.server.stats.record_connection()
+        if self.server.protocol == "smtps":
+            self.start_tls()
+        self.reply(f"220 localhost {self.server.protocol.upper()} sink ready")
+        recipients = 0
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb in ("EHLO", "HELO", "LHLO"):
+                features = ["250-localhost", "250-8BITMIME", "250-SIZE 104857600"]
+                if not self.tls_active:
+                    features.append("250-STARTTLS")
+                for feature in features:
+                    self.wfile.write(feature.encode("ascii") + b"\r\n")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif verb == "STARTTLS":
+                self.reply("220 Ready to start TLS")
+                self.start_tls()
+            elif verb == "AUTH":
+                mechanism = command.split()[1].upper() if len(command.split()) > 1 else ""
+                if mechanism == "LOGIN":
+                    self.reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                elif len(command.split()) < 3:
+                    self.reply("334 ")
+                    self.rfile.readline()
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                recipients = 0
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients += 1
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = self.read_data()
+                self.server.stats.record_message(recipients, size)
+                # LMTP reports the delivery to each recipient separately
+                replies = recipients if self.server.protocol == "lmtp" else 1
+                self.reply("\r\n".join(["250 OK queued"] * replies))
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPSinkServer(socketserver.ThreadingTCPServer):
+    """Threaded SMTP sink listening on localhost"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, protocol="smtp"):
+        super().__init__((host, port), SMTPSinkHandler)
+        self.latency = latency
+        self.protocol = protocol  # "smtp" (STARTTLS), "smtps" (implicit TLS) or "lmtp"
+        self.stats = SinkStats()
+        # LMTP is plain text - only the TLS protocols need a certificate
+        self.ssl_context = self_signed_context() if protocol != "lmtp" else None
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket"""
+        self.shutdown()
+        self.server_close()
+
+    def service(self, name="Sink", email="benchmark@localhost.test"):
+        """Service dict, in the shape built by _build_email_services, pointing at the sink"""
+        return {
+            "name": name,
+            "email": email,
+            "password": "sink",
+            "smtp_server": "127.0.0.1",
+            "smtp_port": self.port,
+            "transport": self.protocol,
+            "messages_per_minute": 1_000_000,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local SMTP sink server")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--protocol", choices=["smtp", "smtps", "lmtp"], default="smtp")
+    args = parser.parse_args()
+
+    server = SMTPSinkServer(port=args.port, latency=args.latency_ms / 1000, protocol=args.protocol)
+    print(f"📭 {args.protocol.upper()} sink listening on 127.0.0.1:{server.port} (any AUTH)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 SMTP sink stopped")
+        server.server_close()
@@ -0,0 +1,75 @@
+"""
+Render / Transmit Stages for the Automated Government Email System
+Runs the two halves of a send separately over the outbox spool directory:
+
+    python spool.py render      # today's campaign -> .eml spool files + manifest.json
+    python spool.py transmit    # spool files -> pooled SMTP sessions
+    python spool.py status      # what is queued, sent and failed
+
+Spool files are stored in SMTP DATA format (dot-stuffed, From header added
+when transmitted), so transmitting is a straight file copy to the socket.
+"""
+
+import sys
+
+# The sender imports its outbox, pool, quota ledger and telemetry when it is built
+from send_single_email import GovernmentEmailSender
+
+
+def show_status(outbox):
+    """Print outbox counts and one line per message still waiting or failed"""
+    counts = outbox.counts()
+    print(f"📂 Spool directory: {outbox.spool_dir}")
+    print(
+        f"📬 {counts['pending']} pending, {counts['leased']} in flight, "
+        f"{counts['sent']} sent, {counts['failed']} failed"
+    )
+    for record in outbox.manifest():
+        if record["status"] == "sent":
+            continue
+        detail = f" - {record['last_error']}" if record["last_error"] else ""
+        print(
+            f"   {record['status']:8} {record['idempotency_key']} "
+            f"({len(record['recipients'])} recipients, attempt {record['attempts']}){detail}"
+        )
+
+
+def main():
+    import argparse  # Only the command line needs it, not importers of this module
+
+    parser = argparse.ArgumentParser(description="Render and transmit emails as separate stages")
+    parser.add_argument(
+        "stage", choices=["render", "transmit", "status"], help="Stage to run"
+    )
+    parser.add_argument(
+        "--spool-dir", metavar="DIR", help="Use a self-contained spool in DIR instead of the cache"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Concurrent transmit workers (default: OUTBOX_CONFIG)"
+    )
+    args = parser.parse_args()
+
+    try:
+        sender = GovernmentEmailSender()
+    except ValueError as e:
+        print(f"❌ Configuration error: {e}")
+        return False
+
+    if args.spool_dir:
+        sender.outbox = sender.open_outbox(args.spool_dir)
+    if sender.outbox is None:
+        print("❌ The outbox is disabled (OUTBOX_CONFIG['enabled'])")
+        return False
+    if args.workers:
+        sender.outbox_config = dict(sender.outbox_config, workers=args.workers)
+
+    if args.stage == "render":
+        return sender.render_daily_emails()
+    if args.stage == "transmit":
+        return sender.transmit_pending_emails()
+    show_status(sender.outbox)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
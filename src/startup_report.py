@@ -0,0 +1,82 @@
+"""
+Start-up Import Report for the Automated Government Email System
+Imports the GitHub Actions entry point (spool.py) under `python -X importtime`
+and reports its total import time and slowest modules against the budget in
+STARTUP_CONFIG.
+
+Usage:
+    python startup_report.py --runs 5 --top 15 --enforce
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+
+def measure_imports(module, runs):
+    """[(self_us, cumulative_us, name, depth)] for the fastest of several cold imports"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+        entries = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip())) // 2
+            entries.append((int(self_us), int(cumulative_us), name.strip(), depth))
+
+        total = next(cumulative for _, cumulative, name, _ in entries if name == module)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report start-up import time against the budget")
+    parser.add_argument("--module", help="Module to import (default: STARTUP_CONFIG entry_module)")
+    parser.add_argument("--runs", type=int, default=3, help="Measure several runs and keep the fastest")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    parser.add_argument("--enforce", action="store_true", help="Exit with status 1 when over budget")
+    args = parser.parse_args()
+
+    try:
+        from config import STARTUP_CONFIG
+    except ImportError:
+        STARTUP_CONFIG = {"import_budget_ms": 250, "entry_module": "spool"}
+
+    module = args.module or STARTUP_CONFIG.get("entry_module", "spool")
+    budget_ms = STARTUP_CONFIG.get("import_budget_ms", 250)
+
+    try:
+        total_us, entries = measure_imports(module, max(1, args.runs))
+    except RuntimeError as e:
+        print(f"❌ Could not import {module}: {e}")
+        return 1
+
+    total_ms = total_us / 1000
+    print(f"\n⏱️  Start-up import report for {module}")
+    print("=" * 60)
+    print(f"{'self ms':>9} {'total ms':>9}  module")
+    for self_us, cumulative_us, name, depth in sorted(entries, reverse=True)[: args.top]:
+        print(f"{self_us / 1000:9.2f} {cumulative_us / 1000:9.2f}  {name}")
+
+    within_budget = total_ms <= budget_ms
+    status = "✅" if within_budget else "❌"
+    print(f"\n{status} Importing {module} took {total_ms:.1f}ms (budget {budget_ms}ms)")
+    if not within_budget and args.enforce:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
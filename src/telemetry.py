@@ -0,0 +1,302 @@
+"""
+Stage Timing for the Automated Government Email System
+Times each stage of a run (media discovery, rendering, encoding, connect,
+STARTTLS, AUTH, the DATA upload...) as nested spans with byte counts, and
+exports them as JSON lines plus a Prometheus textfile-collector file whose
+histograms accumulate across runs, so latency percentiles can be charted.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def _metric(lines, name, kind, help_text, samples):
+    """Append one metric family in the Prometheus text exposition format"""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    lines.extend(f"{name}{suffix} {value}" for suffix, value in samples)
+
+
+class Span:
+    """One timed stage; attributes such as bytes can be added while it runs"""
+
+    __slots__ = (
+        "name", "span_id", "parent_id", "started_at", "_start", "duration", "attributes", "error"
+    )
+
+    def __init__(self, name, parent_id=None, attributes=None):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add(self, name, amount):
+        """Add to a numeric attribute, e.g. span.add("bytes", len(chunk))"""
+        self.attributes[name] = self.attributes.get(name, 0) + amount
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._start
+
+    def to_dict(self, run_id):
+        record = {
+            "run_id": run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.started_at, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+        }
+        if self.error:
+            record["error"] = self.error
+        record.update(self.attributes)
+        return record
+
+
+class _NoopSpan:
+    """Stands in for Span when timing is disabled"""
+
+    def set(self, **attributes):
+        pass
+
+    def add(self, name, amount):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class ByteCounter:
+    """Counts the bytes of a chunk iterator as it is consumed"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def wrap(self, chunks):
+        for chunk in chunks:
+            self.bytes += len(chunk)
+            yield chunk
+
+
+class StageTimer:
+    """Collects the spans of one run and exports them"""
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(4).hex()}"
+        self.started_at = time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Time the enclosed block as a stage nested under the current span"""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(name, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.finish()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def propagate(self, function):
+        """Wrap function so spans it records in worker threads nest under the current span"""
+        context = contextvars.copy_context()
+
+        def run(*args):
+            # A context can only be entered by one thread at a time - copy it per call
+            return context.copy().run(function, *args)
+
+        return run
+
+    def stage_totals(self):
+        """Per stage: number of spans, total seconds, total bytes and errors"""
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stage = totals.setdefault(
+                span.name, {"count": 0, "seconds": 0.0, "bytes": 0, "errors": 0}
+            )
+            stage["count"] += 1
+            stage["seconds"] += span.duration
+            stage["bytes"] += span.attributes.get("bytes", 0)
+            stage["errors"] += 1 if span.error else 0
+        return totals
+
+    def summary(self):
+        """Human-readable per-stage totals, slowest first"""
+        lines = []
+        totals = sorted(self.stage_totals().items(), key=lambda item: -item[1]["seconds"])
+        for name, stage in totals:
+            line = f"{name}: {stage['seconds'] * 1000:.1f}ms"
+            if stage["count"] > 1:
+                line += f" over {stage['count']} spans"
+            if stage["bytes"]:
+                line += f", {stage['bytes'] / 1024:.1f} KB"
+            if stage["errors"]:
+                line += f", {stage['errors']} failed"
+            lines.append(line)
+        return lines
+
+    def write_jsonl(self, path, max_bytes=None):
+        """Append this run's spans to a JSON-lines file, rotating it past max_bytes"""
+        with self._lock:
+            spans = list(self.spans)
+        if not spans:
+            return 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if max_bytes and path.exists() and path.stat().st_size > max_bytes:
+                path.replace(path.with_name(path.name + ".1"))
+            with open(path, "a", encoding="utf-8") as f:
+                for span in sorted(spans, key=lambda s: s.started_at):
+                    f.write(json.dumps(span.to_dict(self.run_id), ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️  Could not write span log {path}: {e}")
+            return 0
+        return len(spans)
+
+    def _load_state(self, state_file):
+        if not state_file or not state_file.exists():
+            return {}
+        try:
+            with open(state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("buckets") != list(self.buckets):
+                print("⚠️  Histogram buckets changed - restarting stage metrics")
+                return {}
+            return state.get("stages", {})
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️  Could not load stage metrics: {e}")
+            return {}
+
+    def write_prometheus(self, path, state_file=None):
+        """Write cumulative stage metrics for the node_exporter textfile collector
+
+        Histogram counts are carried between runs in state_file, so rates and
+        histogram_quantile() work across the short-lived runs.
+        """
+        import socket  # Only the exporter needs the host name
+
+        stages = self._load_state(state_file)
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stage = stages.setdefault(
+                span.name,
+                {
+                    "buckets": [0] * len(self.buckets),
+                    "count": 0,
+                    "sum": 0.0,
+                    "bytes": 0,
+                    "errors": 0,
+                },
+            )
+            for index, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    stage["buckets"][index] += 1
+            stage["count"] += 1
+            stage["sum"] += span.duration
+            stage["bytes"] += span.attributes.get("bytes", 0)
+            stage["errors"] += 1 if span.error else 0
+
+        ordered = sorted(stages.items())
+        histogram = []
+        for name, stage in ordered:
+            label = f'stage="{name}"'
+            for bound, count in zip(self.buckets, stage["buckets"]):
+                histogram.append((f'_bucket{{{label},le="{bound}"}}', count))
+            histogram.append((f'_bucket{{{label},le="+Inf"}}', stage["count"]))
+            histogram.append((f"_sum{{{label}}}", f"{stage['sum']:.6f}"))
+            histogram.append((f"_count{{{label}}}", stage["count"]))
+
+        by_stage = [(f'{{stage="{name}"}}', stage) for name, stage in ordered]
+        host = f'{{host="{socket.gethostname()}"}}'
+        finished_at = time.time()
+
+        lines = []
+        _metric(
+            lines,
+            "email_stage_duration_seconds",
+            "histogram",
+            "Time spent in each stage of an email run",
+            histogram,
+        )
+        _metric(
+            lines,
+            "email_stage_bytes_total",
+            "counter",
+            "Bytes handled by each stage",
+            [(label, stage["bytes"]) for label, stage in by_stage],
+        )
+        _metric(
+            lines,
+            "email_stage_errors_total",
+            "counter",
+            "Stage executions that raised an error",
+            [(label, stage["errors"]) for label, stage in by_stage],
+        )
+        _metric(
+            lines,
+            "email_last_run_timestamp_seconds",
+            "gauge",
+            "When the last run finished",
+            [(host, f"{finished_at:.3f}")],
+        )
+        _metric(
+            lines,
+            "email_last_run_duration_seconds",
+            "gauge",
+            "How long the last run took",
+            [(host, f"{finished_at - self.started_at:.3f}")],
+        )
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # The collector may read at any moment - never let it see a partial file
+            tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            tmp_file.replace(path)
+
+            if state_file:
+                tmp_file = state_file.with_suffix(".tmp")
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump({"buckets": list(self.buckets), "stages": stages}, f, indent=2)
+                tmp_file.replace(state_file)
+        except OSError as e:
+            print(f"⚠️  Could not write Prometheus metrics {path}: {e}")
+
+    def reset(self):
+        """Start a new run (the local scheduler reuses one sender for many runs)"""
+        with self._lock:
+            self.spans = []
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(4).hex()}"
+        self.started_at = time.time()
@@ -0,0 +1,373 @@
+"""
+Template Build Stage for the Automated Government Email System
+Drops CSS rules that match nothing and collapses insignificant whitespace,
+so every message carries a compact body, and optionally inlines <style>
+rules into style attributes for mail clients that ignore <style> blocks
+(which makes bodies larger). Runs once per template; the result is kept in
+the compiled template cache.
+
+Usage:
+    python template_build.py --output ../build/templates
+    python template_build.py --inline     # also inline the CSS
+"""
+
+import re
+from html.parser import HTMLParser
+
+from html_text import BLOCK_TAGS, PARAGRAPH_TAGS, VOID_TAGS
+
+# Whitespace next to these tags never renders
+LAYOUT_TAGS = BLOCK_TAGS | PARAGRAPH_TAGS | {
+    "html", "head", "body", "meta", "title", "link", "base", "style", "script",
+    "br", "table", "thead", "tbody", "tfoot", "td", "th", "center",
+}
+RAW_TEXT_TAGS = {"pre", "textarea", "script"}
+
+STYLE_BLOCK_PATTERN = re.compile(r"<style[^>]*>(.*?)</style>", re.IGNORECASE | re.DOTALL)
+CSS_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+COMPOUND_PATTERN = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<qualifiers>(?:[.#][\w-]+)*)"
+    r"(?P<pseudo>(?::{1,2}[\w-]+(?:\([^)]*\))?)*)$"
+)
+QUALIFIER_PATTERN = re.compile(r"([.#])([\w-]+)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+LONG_HEX_COLOR_PATTERN = re.compile(r"#([0-9a-fA-F])\1([0-9a-fA-F])\2([0-9a-fA-F])\3\b")
+
+
+def parse_declarations(text):
+    """[(property, value)] from a CSS declaration block or style attribute"""
+    declarations = []
+    for declaration in text.split(";"):
+        name, sep, value = declaration.partition(":")
+        if sep and name.strip() and value.strip():
+            value = LONG_HEX_COLOR_PATTERN.sub(r"#\1\2\3", " ".join(value.split()))
+            declarations.append((name.strip().lower(), value))
+    return declarations
+
+
+def escape_attribute(value):
+    """Escape a double-quoted attribute value (quotes in CSS font names stay readable)"""
+    return value.replace("&", "&amp;").replace('"', "&quot;")
+
+
+def format_declarations(declarations):
+    return ";".join(f"{name}:{value}" for name, value in declarations)
+
+
+class Selector:
+    """A CSS selector of type, class and id compounds joined by descendant or child combinators"""
+
+    def __init__(self, text):
+        self.text = " ".join(text.split())
+        self.compounds = []  # (combinator before this compound, tag, classes, element id)
+        self.pseudo = ""
+        self.supported = True
+        self.specificity = (0, 0, 0)
+
+        ids = classes = tags = 0
+        combinator = " "
+        tokens = self.text.replace(">", " > ").split()
+        for position, token in enumerate(tokens):
+            if token == ">":
+                combinator = ">"
+                continue
+            match = COMPOUND_PATTERN.match(token)
+            if not match or (match["pseudo"] and position != len(tokens) - 1):
+                # Attribute selectors, sibling combinators, pseudo-classes mid-selector...
+                self.supported = False
+                return
+            tag = match["tag"].lower() if match["tag"] and match["tag"] != "*" else None
+            qualifiers = QUALIFIER_PATTERN.findall(match["qualifiers"])
+            element_classes = frozenset(name for kind, name in qualifiers if kind == ".")
+            element_ids = [name for kind, name in qualifiers if kind == "#"]
+            self.compounds.append((combinator, tag, element_classes, element_ids[0] if element_ids else None))
+            self.pseudo = match["pseudo"]
+            combinator = " "
+
+            ids += len(element_ids)
+            classes += len(element_classes)
+            tags += 1 if tag else 0
+
+        pseudo_elements = self.pseudo.count(":")
+        self.specificity = (ids, classes, tags + pseudo_elements)
+        if not self.compounds:
+            self.supported = False
+
+    @property
+    def inlinable(self):
+        # Pseudo-elements and states (:before, :hover) cannot go in a style attribute
+        return self.supported and not self.pseudo
+
+    def matches(self, chain):
+        """Whether the last element of chain (root first) matches, ignoring any pseudo part"""
+        return self.supported and self._matches_from(len(self.compounds) - 1, chain, len(chain) - 1)
+
+    def _matches_from(self, position, chain, index):
+        combinator, tag, classes, element_id = self.compounds[position]
+        element_tag, element_classes, element_own_id = chain[index]
+        if tag and tag != element_tag:
+            return False
+        if element_id and element_id != element_own_id:
+            return False
+        if not classes <= element_classes:
+            return False
+        if position == 0:
+            return True
+        if combinator == ">":
+            return index > 0 and self._matches_from(position - 1, chain, index - 1)
+        return any(self._matches_from(position - 1, chain, i) for i in range(index - 1, -1, -1))
+
+
+def parse_stylesheet(css):
+    """Split CSS into [(Selector, declarations)] rules and @-rules kept verbatim"""
+    css = CSS_COMMENT_PATTERN.sub("", css)
+    rules = []
+    at_rules = []
+    position = 0
+    while True:
+        brace = css.find("{", position)
+        if brace == -1:
+            break
+        prelude = css[position:brace].strip()
+
+        if prelude.startswith("@"):
+            # Copy nested blocks (@media, @font-face) through untouched
+            depth, end = 0, brace
+            while end < len(css):
+                depth += {"{": 1, "}": -1}.get(css[end], 0)
+                if depth == 0:
+                    break
+                end += 1
+            at_rules.append(" ".join(css[position : end + 1].split()))
+            position = end + 1
+            continue
+
+        end = css.find("}", brace)
+        if end == -1:
+            end = len(css)
+        declarations = parse_declarations(css[brace + 1 : end])
+        for selector_text in prelude.split(","):
+            if selector_text.strip():
+                rules.append((Selector(selector_text), declarations))
+        position = end + 1
+    return rules, at_rules
+
+
+class TemplateBuilder(HTMLParser):
+    """Rewrites an HTML document with collapsed whitespace and, optionally, inlined CSS"""
+
+    def __init__(self, rules, at_rules, inline_css=False, minify_html=True):
+        super().__init__(convert_charrefs=False)
+        self.rules = rules
+        self.at_rules = at_rules
+        self.inline_css = inline_css
+        self.minify_html = minify_html
+        self.used_rules = set()
+        self.tokens = []  # (kind, text, tag)
+        self.stack = []  # (tag, classes, id) of open elements
+        self.in_style = False
+        self.raw_depth = 0
+        # Once inlined, only classes still named by a style-block rule are worth sending
+        self.kept_classes = {
+            name
+            for selector, _ in rules
+            if not (inline_css and selector.inlinable)
+            for compound in selector.compounds
+            for name in compound[2]
+        }
+
+    def _append(self, kind, text, tag=None):
+        if kind == "data" and self.tokens and self.tokens[-1][0] == "data":
+            self.tokens[-1] = ("data", self.tokens[-1][1] + text, None)
+        else:
+            self.tokens.append((kind, text, tag))
+
+    def _cascade(self, chain, inline_style):
+        """Declarations for an element, in cascade order, as an ordered dict"""
+        matched = []
+        for order, (selector, declarations) in enumerate(self.rules):
+            if selector.matches(chain):
+                self.used_rules.add(order)
+                if self.inline_css and selector.inlinable:
+                    matched.append((selector.specificity, order, declarations))
+
+        styles = {}
+        matched.sort(key=lambda item: (item[0], item[1]))
+        for *_, declarations in matched:
+            for name, value in declarations:
+                styles.pop(name, None)
+                styles[name] = value
+        for name, value in parse_declarations(inline_style or ""):
+            styles.pop(name, None)
+            styles[name] = value
+        return styles
+
+    def _start_tag_text(self, tag, attrs, chain):
+        attrs = list(attrs)
+        inline_style = next((value for name, value in attrs if name == "style"), None)
+        styles = self._cascade(chain, inline_style)
+        if not self.inline_css or (not styles and inline_style is None):
+            return self.get_starttag_text()
+
+        attrs = [(name, value) for name, value in attrs if name != "style"]
+        if self.minify_html:
+            attrs = [(name, self._strip_classes(value) if name == "class" else value) for name, value in attrs]
+            attrs = [(name, value) for name, value in attrs if name != "class" or value]
+        if styles:
+            attrs.append(("style", format_declarations(styles.items())))
+        rendered = "".join(
+            f" {name}" if value is None else f' {name}="{escape_attribute(value)}"'
+            for name, value in attrs
+        )
+        return f"<{tag}{rendered}>"
+
+    def _strip_classes(self, value):
+        return " ".join(name for name in (value or "").split() if name in self.kept_classes)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "style":
+            self.in_style = True
+            # The first style block is replaced by whatever cannot be inlined
+            if not any(kind == "style" for kind, _, _ in self.tokens):
+                self._append("style", None, tag)
+            return
+
+        attributes = dict(attrs)
+        element = (
+            tag,
+            frozenset((attributes.get("class") or "").split()),
+            attributes.get("id"),
+        )
+        self._append("start", self._start_tag_text(tag, attrs, self.stack + [element]), tag)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+            if tag in RAW_TEXT_TAGS:
+                self.raw_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == "style":
+            self.in_style = False
+            return
+        # Close back to the matching element, tolerating unclosed children
+        if any(element[0] == tag for element in self.stack):
+            while self.stack:
+                if self.stack.pop()[0] == tag:
+                    break
+            if tag in RAW_TEXT_TAGS:
+                self.raw_depth = max(0, self.raw_depth - 1)
+        self._append("end", f"</{tag}>", tag)
+
+    def handle_data(self, data):
+        if self.in_style:
+            return
+        self._append("raw" if self.raw_depth else "data", data)
+
+    def handle_entityref(self, name):
+        self._append("data", f"&{name};")
+
+    def handle_charref(self, name):
+        self._append("data", f"&#{name};")
+
+    def handle_comment(self, data):
+        # Conditional comments carry Outlook-specific markup - keep those
+        if self.minify_html and not data.strip().startswith("[if"):
+            return
+        self._append("comment", f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._append("decl", f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._append("decl", f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._append("decl", f"<![{data}]>")
+
+    def _residual_css(self):
+        """CSS that still needs a style block: pseudo rules, unsupported selectors, @-rules"""
+        blocks = []
+        for order, (selector, declarations) in enumerate(self.rules):
+            if self.inline_css and selector.inlinable:
+                continue
+            # Rules nothing in the document matches are dropped
+            if selector.supported and order not in self.used_rules:
+                continue
+            blocks.append(f"{selector.text}{{{format_declarations(declarations)}}}")
+        blocks.extend(self.at_rules)
+        return "".join(blocks)
+
+    def _is_layout_boundary(self, index):
+        if index < 0 or index >= len(self.tokens):
+            return True
+        kind, _, tag = self.tokens[index]
+        return kind in ("style", "decl", "comment") or (kind in ("start", "end") and tag in LAYOUT_TAGS)
+
+    def get_html(self):
+        self.close()
+        output = []
+        for index, (kind, text, tag) in enumerate(self.tokens):
+            if kind == "style":
+                css = self._residual_css()
+                text = f"<style>{css}</style>" if css else ""
+            elif kind == "data" and self.minify_html:
+                text = WHITESPACE_PATTERN.sub(" ", text)
+                if self._is_layout_boundary(index - 1):
+                    text = text.lstrip()
+                if self._is_layout_boundary(index + 1):
+                    text = text.rstrip()
+            output.append(text)
+        return "".join(output)
+
+
+def build_html(document, inline_css=False, minify_html=True):
+    """Compact version of an HTML email: unused rules and whitespace removed, CSS optionally inlined"""
+    rules, at_rules = parse_stylesheet("\n".join(STYLE_BLOCK_PATTERN.findall(document)))
+    builder = TemplateBuilder(rules, at_rules, inline_css, minify_html)
+    builder.feed(document)
+    return builder.get_html()
+
+
+def main():
+    import argparse
+    from pathlib import Path
+
+    from config import EMAIL_TEMPLATES
+    from template_engine import CompiledTemplate
+
+    parser = argparse.ArgumentParser(description="Minify the HTML email templates")
+    parser.add_argument("--output", metavar="DIR", help="Write each built template body to DIR")
+    parser.add_argument(
+        "--inline", action="store_true", help="Also inline the <style> rules into style attributes"
+    )
+    args = parser.parse_args()
+
+    output_dir = Path(args.output) if args.output else None
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    for template_id, template in EMAIL_TEMPLATES.items():
+        if template.get("content_type", "plain") != "html":
+            continue
+        source = CompiledTemplate(template["body_template"], f"Template {template_id}")
+        built = source.transform(
+            lambda document: build_html(document, inline_css=args.inline)
+        )
+        before = len(template["body_template"].encode("utf-8"))
+        after = len(built.text.encode("utf-8"))
+        print(
+            f"📝 Template {template_id}: {before:,} -> {after:,} bytes "
+            f"({100 * (after - before) / before:+.0f}%)"
+        )
+        if output_dir:
+            path = output_dir / f"template_{template_id}.html"
+            path.write_text(built.text, encoding="utf-8")
+            print(f"   💾 {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Compiled Email Templates for the Automated Government Email System
+Parses each str.format-style template once into literal chunks and
+placeholder slots, validates the placeholders against the known variables
+at load time and renders with a single join.
+"""
+
+import re
+import string
+
+_FORMATTER = string.Formatter()
+
+# Private-use characters standing in for placeholders while literal text is transformed
+_SLOT_MARKER = "\ue000{}\ue001"
+_SLOT_PATTERN = re.compile("\ue000(\\d+)\ue001")
+
+
+class TemplateError(ValueError):
+    """A template is malformed or uses variables that are never provided"""
+
+
+def _root_name(field_name):
+    """Variable a field refers to: "a" for "a", "a.b" or "a[0]" """
+    return field_name.split(".", 1)[0].split("[", 1)[0]
+
+
+class CompiledTemplate:
+    """A str.format template pre-split into literal and placeholder segments"""
+
+    def __init__(self, text, name="template"):
+        self.text = text
+        self.name = name
+        self.segments = []  # str for literals, (field, conversion, spec) for slots
+        self.fields = set()
+
+        try:
+            parsed = list(_FORMATTER.parse(text))
+        except ValueError as e:
+            raise TemplateError(f"{name}: {e}") from e
+
+        literal = []
+        for literal_text, field_name, format_spec, conversion in parsed:
+            if literal_text:
+                literal.append(literal_text)
+            if field_name is None:
+                continue
+            if not field_name or field_name.isdigit():
+                raise TemplateError(f"{name}: positional placeholder {{{field_name}}} is not supported")
+
+            if literal:
+                self.segments.append("".join(literal))
+                literal = []
+
+            # Nested placeholders in the format spec ("{value:{width}}") compile too
+            if format_spec and "{" in format_spec:
+                format_spec = CompiledTemplate(format_spec, name)
+                self.fields |= format_spec.fields
+            self.segments.append((field_name, conversion, format_spec))
+            self.fields.add(_root_name(field_name))
+
+        if literal:
+            self.segments.append("".join(literal))
+
+    def _slot_source(self, segment):
+        """str.format source of a placeholder slot"""
+        field_name, conversion, format_spec = segment
+        if isinstance(format_spec, CompiledTemplate):
+            format_spec = format_spec.text
+        return (
+            "{" + field_name
+            + (f"!{conversion}" if conversion else "")
+            + (f":{format_spec}" if format_spec else "")
+            + "}"
+        )
+
+    def transform(self, function, name=None):
+        """New template whose literal text is function(literal text), slots kept intact
+
+        Placeholders are replaced by private-use markers while function runs,
+        so the result can be precomputed once instead of after every render.
+        """
+        slots = []
+        marked = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                marked.append(segment)
+            else:
+                marked.append(_SLOT_MARKER.format(len(slots)))
+                slots.append(segment)
+
+        source = []
+        for index, piece in enumerate(_SLOT_PATTERN.split(function("".join(marked)))):
+            if index % 2:
+                source.append(self._slot_source(slots[int(piece)]))
+            else:
+                source.append(piece.replace("{", "{{").replace("}", "}}"))
+        return CompiledTemplate("".join(source), name or self.name)
+
+    def to_dict(self):
+        """JSON-serializable form, restored with from_dict without re-parsing"""
+        segments = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                segments.append(segment)
+                continue
+            field_name, conversion, format_spec = segment
+            segments.append(
+                {
+                    "field": field_name,
+                    "conversion": conversion,
+                    "spec": format_spec.text if isinstance(format_spec, CompiledTemplate) else format_spec,
+                    "nested": isinstance(format_spec, CompiledTemplate),
+                }
+            )
+        return {"name": self.name, "text": self.text, "segments": segments}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a template saved with to_dict"""
+        template = cls.__new__(cls)
+        template.text = data["text"]
+        template.name = data["name"]
+        template.segments = []
+        template.fields = set()
+        for segment in data["segments"]:
+            if isinstance(segment, str):
+                template.segments.append(segment)
+                continue
+            format_spec = segment["spec"]
+            if segment["nested"]:
+                format_spec = cls(format_spec, template.name)
+                template.fields |= format_spec.fields
+            template.segments.append((segment["field"], segment["conversion"], format_spec))
+            template.fields.add(_root_name(segment["field"]))
+        return template
+
+    def validate(self, known_variables):
+        """Raise TemplateError if the template uses variables outside known_variables"""
+        missing = self.fields - set(known_variables)
+        if missing:
+            raise TemplateError(f"{self.name}: unknown template variables {sorted(missing)}")
+
+    def render(self, variables):
+        """Fill the placeholders - same result as text.format(**variables)"""
+        missing = [field for field in self.fields if field not in variables]
+        if missing:
+            raise TemplateError(f"{self.name}: missing template variables {sorted(missing)}")
+
+        pieces = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                pieces.append(segment)
+                continue
+
+            field_name, conversion, format_spec = segment
+            if field_name in variables:
+                value = variables[field_name]
+            else:
+                value, _ = _FORMATTER.get_field(field_name, (), variables)
+            if conversion:
+                value = _FORMATTER.convert_field(value, conversion)
+            if isinstance(format_spec, CompiledTemplate):
+                format_spec = format_spec.render(variables)
+            pieces.append(format(value, format_spec or ""))
+        return "".join(pieces)
+
+
+def compile_template(template, template_id, known_variables):
+    """Compile and validate the subject and body of one EMAIL_TEMPLATES entry"""
+    compiled = {}
+    for key in ("subject_template", "body_template"):
+        compiled_template = CompiledTemplate(template[key], f"Template {template_id} {key}")
+        compiled_template.validate(known_variables)
+        compiled[key] = compiled_template
+    return compiled
+
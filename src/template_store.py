@@ -0,0 +1,151 @@
+"""
+Template Storage for the Automated Government Email System
+EMAIL_TEMPLATES bodies live in src/templates/ and are read only when a
+template is actually used. Compiled templates are cached on disk, keyed by
+the source they were compiled from.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+from template_engine import CompiledTemplate
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+CACHE_VERSION = 2
+
+
+class LazyTemplate(Mapping):
+    """One EMAIL_TEMPLATES entry whose body_template is read from body_file on first access"""
+
+    def __init__(self, definition, template_dir=TEMPLATE_DIR):
+        self._definition = dict(definition)
+        self.body_path = None
+        if "body_file" in self._definition:
+            self.body_path = Path(template_dir) / self._definition.pop("body_file")
+            self._definition["body_template"] = None  # Loaded on demand
+
+    def __getitem__(self, key):
+        value = self._definition[key]
+        if key == "body_template" and value is None and self.body_path is not None:
+            value = self.body_path.read_text(encoding="utf-8")
+            self._definition[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._definition)
+
+    def __len__(self):
+        return len(self._definition)
+
+    def unload(self):
+        """Drop the body text again once a compiled form exists"""
+        if self.body_path is not None:
+            self._definition["body_template"] = None
+
+
+class TemplateStore(Mapping):
+    """EMAIL_TEMPLATES: template id -> LazyTemplate"""
+
+    def __init__(self, definitions, template_dir=TEMPLATE_DIR):
+        self.template_dir = Path(template_dir)
+        self._templates = {
+            template_id: LazyTemplate(definition, self.template_dir)
+            for template_id, definition in definitions.items()
+        }
+
+    def __getitem__(self, template_id):
+        return self._templates[template_id]
+
+    def __iter__(self):
+        return iter(self._templates)
+
+    def __len__(self):
+        return len(self._templates)
+
+
+def _hash_text(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class CompiledTemplateCache:
+    """Compiled templates persisted as one JSON file per template id"""
+
+    def __init__(self, cache_dir, build_options=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Options of the template build stage - changing them invalidates the cache
+        self.build_options = json.dumps(build_options or {}, sort_keys=True)
+
+    def _cache_file(self, template_id):
+        return self.cache_dir / f"template_{template_id}.json"
+
+    def _source_stamp(self, template):
+        """Cheap identity of a template body file, or None for inline bodies"""
+        body_path = getattr(template, "body_path", None)
+        if body_path is None:
+            return None
+        stat = body_path.stat()
+        return {"file": str(body_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _metadata_hash(self, template):
+        """Hash of everything except the body that affects compilation"""
+        return _hash_text(
+            template["subject_template"], template.get("content_type", "plain"), self.build_options
+        )
+
+    def load(self, template_id, template):
+        """Cached compiled forms for a template, or None if missing or stale"""
+        cache_file = self._cache_file(template_id)
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") != CACHE_VERSION:
+                return None
+            if saved["metadata_hash"] != self._metadata_hash(template):
+                return None
+
+            # An untouched body file is trusted by size and mtime; anything else
+            # (fresh checkout, inline body) is compared by content hash
+            stamp = self._source_stamp(template)
+            if stamp is None or stamp != saved.get("source_stamp"):
+                if _hash_text(template["body_template"]) != saved["body_hash"]:
+                    return None
+                if stamp is not None:
+                    saved["source_stamp"] = stamp
+                    self._write(cache_file, saved)
+
+            return {
+                key: CompiledTemplate.from_dict(data)
+                for key, data in saved["compiled"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Compiled template cache for template {template_id} unreadable: {e}")
+            return None
+
+    def save(self, template_id, template, compiled):
+        """Store compiled forms for a template"""
+        saved = {
+            "version": CACHE_VERSION,
+            "metadata_hash": self._metadata_hash(template),
+            "body_hash": _hash_text(template["body_template"]),
+            "source_stamp": self._source_stamp(template),
+            "compiled": {key: value.to_dict() for key, value in compiled.items()},
+        }
+        try:
+            self._write(self._cache_file(template_id), saved)
+        except OSError as e:
+            print(f"⚠️  Could not save compiled template {template_id}: {e}")
+
+    def _write(self, cache_file, saved):
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(saved, f, ensure_ascii=False)
+        tmp_file.replace(cache_file)
@@ -22,7 +22,7 @@ def test_dependencies():
     """Test if all required dependencies are available"""
     print("🧪 Testing Dependencies...")
 
-    required_modules = ["schedule", "pytz"]
+    required_modules = ["pytz"]
     missing_modules = []
 
     for module in required_modules:
@@ -36,7 +36,7 @@ def test_dependencies():
     if missing_modules:
         print(f"❌ Missing dependencies: {', '.join(missing_modules)}")
         print("💡 Run: pip install -r requirements.txt")
-        print("💡 Or run: pip install schedule pytz")
+        print("💡 Or run: pip install pytz")
         return False
 
     return True
@@ -224,7 +224,9 @@ def generate_html_previews():
             has_email_services = (
                 os.getenv("GMAIL_EMAIL") or 
                 os.getenv("OUTLOOK_EMAIL") or 
-                os.getenv("YAHOO_EMAIL")
+                os.getenv("YAHOO_EMAIL") or
+                os.getenv("EMAIL_CREDENTIALS_FILE") or
+                os.getenv("EMAIL_CREDENTIALS_JSON")
             )
             
             if has_email_services:
@@ -638,7 +640,9 @@ def test_template_generation():
         has_email_services = (
             os.getenv("GMAIL_EMAIL") or 
             os.getenv("OUTLOOK_EMAIL") or 
-            os.getenv("YAHOO_EMAIL")
+            os.getenv("YAHOO_EMAIL") or
+            os.getenv("EMAIL_CREDENTIALS_FILE") or
+            os.getenv("EMAIL_CREDENTIALS_JSON")
         )
 
         if not has_email_services:
@@ -0,0 +1,83 @@
+"""
+Tests for the HTML Build and Plain Text Stages of the Automated Government Email System
+The text/plain alternative drops style and script content, and the build
+stage shrinks bodies without changing what they say.
+"""
+
+from html_text import html_to_text
+from template_build import build_html
+
+DOCUMENT = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Ignored title</title>
+    <style>
+        .urgent { color: #ff0000; font-weight: bold; }
+        .unused { margin: 0; }
+        p { margin: 0 0 12px 0; }
+    </style>
+    <script>var tracking = "never shown";</script>
+</head>
+<body>
+    <h1>Road   Repair Request</h1>
+    <p class="urgent">Bedian Road &amp; Ali View Garden</p>
+    <!-- editor comment -->
+    <ul>
+        <li>Potholes</li>
+        <li>Flooding</li>
+    </ul>
+    <ol><li>First</li><li>Second</li></ol>
+    <p>Details: <a href="https://example.org/report">the report</a><br>Line two</p>
+    <script type="text/javascript">document.write("hidden");</script>
+</body>
+</html>"""
+
+
+def test_style_and_script_are_dropped():
+    """Test head, style and script content never reaches the text version"""
+    text = html_to_text(DOCUMENT)
+    for hidden in ("Ignored title", "color", ".urgent", "tracking", "hidden", "editor comment"):
+        assert hidden not in text
+
+
+def test_text_layout():
+    """Test entities, block spacing, bullets, numbering, links and line breaks"""
+    assert html_to_text(DOCUMENT) == "\n".join(
+        [
+            "Road Repair Request",
+            "",
+            "Bedian Road & Ali View Garden",
+            "",
+            "• Potholes",
+            "• Flooding",
+            "",
+            "1. First",
+            "2. Second",
+            "",
+            "Details: the report (https://example.org/report)",
+            "Line two",
+        ]
+    )
+
+
+def test_self_closing_style_does_not_swallow_text():
+    """Test an empty <style/> or <script/> does not hide the rest of the document"""
+    assert html_to_text("<p>before</p><script/><p>after</p>") == "before\n\nafter"
+
+
+def test_minified_body_is_smaller_and_reads_the_same():
+    """Test minify-only output is smaller, drops unused rules and keeps the text"""
+    built = build_html(DOCUMENT)
+    assert len(built) < len(DOCUMENT)
+    assert "editor comment" not in built
+    assert ".unused" not in built
+    assert "<style" in built and 'class="urgent"' in built
+    assert html_to_text(built) == html_to_text(DOCUMENT)
+
+
+def test_inlining_is_opt_in():
+    """Test CSS is copied into style attributes only when inline_css is set"""
+    assert "style=" not in build_html(DOCUMENT)
+    inlined = build_html(DOCUMENT, inline_css=True)
+    assert "font-weight:bold" in inlined.replace(" ", "")
+    assert html_to_text(inlined) == html_to_text(DOCUMENT)
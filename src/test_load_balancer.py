@@ -0,0 +1,142 @@
+"""
+Tests for the Weighted Load Balancing of the Automated Government Email System
+Smooth weighted round-robin gives each service its share of every rotation
+period, interleaved rather than in runs.
+"""
+
+from collections import Counter
+
+import pytest
+
+from credentials import account_name, provider_accounts
+from load_balancer import WeightedServiceBalancer, service_weight
+
+
+def services(*weights):
+    return [
+        {"name": name, "email": f"{name}@example.com", "weight": weight}
+        for name, weight in zip("abcdefgh", weights)
+    ]
+
+
+def names(assigned):
+    return "".join(service["name"] for service in assigned)
+
+
+def test_service_weight_from_rate_and_quota():
+    """Test an explicit weight wins, otherwise the lower of rate and quota per minute"""
+    assert service_weight({"weight": 3}) == 3.0
+    assert service_weight({"messages_per_minute": 20, "daily_quota": 1440}) == 1.0
+    assert service_weight({"messages_per_minute": 0.5, "daily_quota": 1440}) == 0.5
+    assert service_weight({"daily_quota": 600}, quota_window_minutes=60) == 10.0
+
+
+@pytest.mark.parametrize("weights", [(5, 3, 2), (1, 1, 1), (7, 1), (2, 4, 6, 8)])
+def test_every_period_matches_the_weights(weights):
+    """Test each rotation period assigns every service exactly its weight"""
+    balancer = WeightedServiceBalancer(services(*weights))
+    period = sum(balancer.weights)
+    expected = dict(zip("abcdefgh", balancer.weights))
+    for _ in range(3):
+        assert Counter(names(balancer.assign(period))) == expected
+
+
+def test_fractional_weights_keep_their_ratio():
+    """Test rate-derived weights are scaled to small integers with the same ratio"""
+    balancer = WeightedServiceBalancer(services(0.35, 0.7, 1.05))
+    assert balancer.weights == [1, 2, 3]
+    assert Counter(names(balancer.assign(600))) == {"a": 100, "b": 200, "c": 300}
+
+
+def test_assignments_are_interleaved():
+    """Test the nginx sequence for 5:1:1, with the light services spread out"""
+    balancer = WeightedServiceBalancer(services(5, 1, 1))
+    assert names(balancer.assign(14)) == "aabacaa" * 2
+
+
+def test_offset_rotates_the_starting_point():
+    """Test an offset starts partway through the same sequence"""
+    sequence = names(WeightedServiceBalancer(services(3, 2)).assign(10))
+    for offset in range(7):
+        balancer = WeightedServiceBalancer(services(3, 2), offset=offset)
+        start = offset % 5
+        assert names(balancer.assign(5)) == sequence[start : start + 5]
+
+
+def test_next_service_continues_the_rotation():
+    """Test next_service and assign share one rotation"""
+    balancer = WeightedServiceBalancer(services(2, 1))
+    picked = [balancer.next_service()["name"]] + [s["name"] for s in balancer.assign(2)]
+    assert Counter(picked) == {"a": 2, "b": 1}
+
+
+def test_provider_accounts_rotate_by_quota(monkeypatch):
+    """Test several accounts of one provider share traffic in proportion to their quotas"""
+    provider = {
+        "name": "Gmail",
+        "env_email": "GMAIL_EMAIL",
+        "env_password": "GMAIL_PASSWORD",
+        "messages_per_minute": 20,
+        "daily_quota": 500,
+    }
+    monkeypatch.delenv("GMAIL_EMAIL_3", raising=False)  # A gap in the numbering is skipped
+    for suffix, email in (("", "first"), ("_2", "second"), ("_4", "FIRST")):
+        monkeypatch.setenv(f"GMAIL_EMAIL{suffix}", f"{email}@gmail.com")
+        monkeypatch.setenv(f"GMAIL_PASSWORD{suffix}", "app password")
+    file_accounts = {"Gmail": [{"email": "new@gmail.com", "password": "x", "daily_quota": 250}]}
+
+    accounts = provider_accounts(provider, file_accounts, max_accounts=4)
+    assert [account["email"] for account in accounts] == [
+        "first@gmail.com",
+        "second@gmail.com",
+        "new@gmail.com",
+    ]
+
+    accounts_as_services = [
+        dict(provider, name=account_name(provider["name"], number), **account)
+        for number, account in enumerate(accounts, 1)
+    ]
+    balancer = WeightedServiceBalancer(accounts_as_services)
+    shares = Counter(service["name"] for service in balancer.assign(500))
+    assert shares == {"Gmail": 200, "Gmail #2": 200, "Gmail #3": 100}
+
+
+def test_describe_and_empty_services():
+    """Test describe reports traffic shares and an empty list is refused"""
+    assert WeightedServiceBalancer(services(3, 1)).describe() == [
+        "a (a@example.com): 75%",
+        "b (b@example.com): 25%",
+    ]
+    with pytest.raises(ValueError):
+        WeightedServiceBalancer([])
+
+
+def test_account_state_key_survives_renumbering(monkeypatch):
+    """Test removing an earlier account renames later ones but keeps their service_key"""
+    from smtp_pool import service_key
+
+    provider = {
+        "name": "Gmail",
+        "env_email": "GMAIL_EMAIL",
+        "env_password": "GMAIL_PASSWORD",
+        "smtp_server": "smtp.gmail.com",
+        "smtp_port": 587,
+    }
+
+    def keys_by_name():
+        keys = {}
+        for number, account in enumerate(provider_accounts(provider, {}, max_accounts=3), 1):
+            name = account_name(provider["name"], number)
+            service = dict(provider, provider=provider["name"], name=name, **account)
+            keys[name] = service_key(service)
+        return keys
+
+    for suffix in ("", "_2", "_3"):
+        monkeypatch.setenv(f"GMAIL_EMAIL{suffix}", f"account{suffix or '_1'}@gmail.com")
+        monkeypatch.setenv(f"GMAIL_PASSWORD{suffix}", "app password")
+    before = keys_by_name()
+    monkeypatch.delenv("GMAIL_EMAIL_2")
+    after = keys_by_name()
+
+    assert list(after) == ["Gmail", "Gmail #2"]
+    assert after["Gmail #2"] == before["Gmail #3"]
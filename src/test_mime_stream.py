@@ -0,0 +1,97 @@
+"""
+Tests for the Streaming MIME Serialization of the Automated Government Email System
+Dot-stuffing across chunk boundaries and the spool file round trip.
+"""
+
+import io
+import os
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from mime_stream import DotStuffer, StreamedAttachment, iter_message, iter_spool_file, write_spool_file
+
+DOTTED = b".starts with a dot\r\nplain\r\n.\r\n..two dots\r\nend.\r\n.\r\nlast"
+
+
+def stuff_whole(data):
+    """Reference dot-stuffing of a complete message (RFC 5321 4.5.2)"""
+    data = data.replace(b"\r\n.", b"\r\n..")
+    return b"." + data if data.startswith(b".") else data
+
+
+def stuff_chunks(chunks):
+    stuffer = DotStuffer()
+    return b"".join(stuffer.stuff(chunk) for chunk in chunks)
+
+
+def build_message(attachment_path):
+    msg = MIMEMultipart()
+    msg["From"] = "sender@example.com"
+    msg["To"] = "recipient@example.com"
+    msg["Subject"] = "Streaming test"
+    msg.attach(MIMEText(".leading dot\n..two\nmiddle\n.\nend", "plain", "utf-8"))
+    part = StreamedAttachment(attachment_path)
+    part.add_header("Content-Disposition", "attachment; filename= media.bin")
+    msg.attach(part)
+    return msg
+
+
+def test_dot_stuffing_every_split_point():
+    """Test stuffing is the same wherever the data is cut into two chunks"""
+    expected = stuff_whole(DOTTED)
+    for cut in range(len(DOTTED) + 1):
+        assert stuff_chunks([DOTTED[:cut], DOTTED[cut:]]) == expected, f"cut at {cut}"
+
+
+def test_dot_stuffing_crlf_dot_spanning_chunks():
+    """Test "\\r\\n." split as "\\r" | "\\n." and as "\\r\\n" | "." and byte by byte"""
+    expected = b"a\r\n..b"
+    assert stuff_chunks([b"a\r", b"\n.b"]) == expected
+    assert stuff_chunks([b"a\r\n", b".b"]) == expected
+    assert stuff_chunks([b"a\r", b"\n", b".b"]) == expected
+    assert stuff_chunks([bytes([byte]) for byte in DOTTED]) == stuff_whole(DOTTED)
+
+
+def test_dot_stuffing_ignores_empty_chunks():
+    """Test empty chunks do not reset the line-start state"""
+    assert stuff_chunks([b"a\r\n", b"", b".b"]) == b"a\r\n..b"
+    stuffer = DotStuffer()
+    assert stuffer.at_line_start
+    stuffer.stuff(b"x")
+    assert not stuffer.at_line_start
+
+
+def test_iter_message_matches_as_bytes(tmp_path):
+    """Test the streamed message equals the standard generator's output"""
+    attachment = tmp_path / "media.bin"
+    attachment.write_bytes(os.urandom(200 * 1024 + 7))
+    msg = build_message(attachment)
+
+    streamed = b"".join(iter_message(msg, chunk_size=4096))
+    assert streamed == msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+
+
+def test_spool_file_round_trip(tmp_path):
+    """Test write_spool_file stores the DATA wire form and iter_spool_file undoes it"""
+    attachment = tmp_path / "media.bin"
+    attachment.write_bytes(os.urandom(100 * 1024))
+    msg = build_message(attachment)
+    expected = msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+    if not expected.endswith(b"\r\n"):
+        expected += b"\r\n"
+
+    spool_file = tmp_path / "message.eml"
+    with open(spool_file, "wb") as f:
+        written = write_spool_file(f, iter_message(msg, chunk_size=1000))
+
+    spooled = spool_file.read_bytes()
+    assert written == len(spooled)
+    assert spooled == stuff_whole(expected)
+    assert b"".join(iter_spool_file(spool_file, chunk_size=512)) == expected
+
+
+def test_spool_file_ends_with_crlf():
+    """Test a message without a final line ending is terminated for DATA"""
+    buffer = io.BytesIO()
+    write_spool_file(buffer, [b".a\r\nb"])
+    assert buffer.getvalue() == b"..a\r\nb\r\n"
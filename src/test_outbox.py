@@ -0,0 +1,208 @@
+"""
+Tests for the Persistent Outbox of the Automated Government Email System
+Leases, retry backoff, deferral and idempotent enqueueing.
+"""
+
+from email.mime.text import MIMEText
+
+import pytest
+
+import outbox as outbox_module
+from outbox import FAILED, LEASED, PENDING, SENT, Outbox, idempotency_key
+
+CAMPAIGN = "20250131-template1"
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(outbox_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def outbox(tmp_path, clock):
+    outbox = Outbox(
+        tmp_path / "outbox.db",
+        tmp_path / "spool",
+        lease_seconds=300,
+        max_attempts=3,
+        retry_delay_seconds=30,
+    )
+    yield outbox
+    outbox.close()
+
+
+def build_message(subject="Outbox test"):
+    msg = MIMEText("body", "plain", "utf-8")
+    msg["From"] = "sender@example.com"
+    msg["Subject"] = subject
+    return msg
+
+
+def enqueue(outbox, recipients=("a@example.com",)):
+    key = idempotency_key(CAMPAIGN, recipients)
+    return outbox.enqueue(key, CAMPAIGN, "smtp.example.com:587", list(recipients), build_message())
+
+
+def status(outbox):
+    return [(record["status"], record["attempts"]) for record in outbox.manifest()]
+
+
+def test_idempotency_key_is_deterministic():
+    """Test keys depend only on the campaign and the set of recipients"""
+    recipients = ["a@example.com", "B@example.com"]
+    key = idempotency_key(CAMPAIGN, recipients)
+    assert key.startswith(CAMPAIGN + ":")
+    assert key == idempotency_key(CAMPAIGN, ["b@example.com", "a@example.com"])
+    assert key != idempotency_key(CAMPAIGN, ["a@example.com"])
+    assert key != idempotency_key("20250201-template1", recipients)
+
+
+def test_duplicate_key_is_not_queued_twice(outbox):
+    """Test enqueueing the same key again is refused and leaves one message"""
+    assert enqueue(outbox) is True
+    assert enqueue(outbox) is False
+    assert outbox.counts() == {PENDING: 1, LEASED: 0, SENT: 0, FAILED: 0}
+    assert len(list(outbox.spool_dir.glob("*.eml"))) == 1
+
+
+def test_expired_lease_is_reclaimed(outbox, clock):
+    """Test another worker claims a message whose lease expired, and the old lease is void"""
+    enqueue(outbox)
+    first = outbox.lease("worker-1")
+    assert first.attempts == 1
+    assert outbox.lease("worker-2") is None
+
+    clock.now += 301
+    second = outbox.lease("worker-2")
+    assert second.id == first.id
+    assert second.attempts == 2
+
+    assert outbox.mark_sent(first, "Gmail") is False
+    assert outbox.mark_sent(second, "Gmail") is True
+    assert status(outbox) == [(SENT, 2)]
+    assert not second.message_file.exists()
+
+
+def test_expired_last_attempt_is_not_reclaimed(outbox, clock):
+    """Test a lease that expires on the last allowed attempt fails the message"""
+    enqueue(outbox)
+    for attempt in range(1, 4):
+        message = outbox.lease("worker")
+        assert message.attempts == attempt
+        clock.now += 301
+
+    assert outbox.lease("worker") is None
+    assert status(outbox) == [(FAILED, 3)]
+    assert outbox.next_ready_in() is None
+
+
+def test_mark_failed_backs_off_exponentially(outbox, clock):
+    """Test retries wait 30s, 60s, ... and the message fails after max_attempts"""
+    enqueue(outbox)
+    delays = []
+    while True:
+        message = outbox.lease("worker")
+        delay = outbox.mark_failed(message, "connection refused")
+        if delay is None:
+            break
+        delays.append(delay)
+        assert outbox.lease("worker") is None
+        assert outbox.next_ready_in() == pytest.approx(delay)
+        clock.now += delay
+
+    assert delays == [30, 60]
+    assert status(outbox) == [(FAILED, 3)]
+    assert outbox.manifest()[0]["last_error"] == "connection refused"
+
+
+def test_rejected_message_fails_without_retry(outbox):
+    """Test mark_failed with retry=False gives up on the first attempt"""
+    enqueue(outbox)
+    assert outbox.mark_failed(outbox.lease("worker"), "recipients refused", retry=False) is None
+    assert status(outbox) == [(FAILED, 1)]
+
+
+def test_defer_does_not_count_an_attempt(outbox, clock):
+    """Test a deferred message keeps its attempt count and waits until available_at"""
+    enqueue(outbox)
+    message = outbox.lease("worker")
+    assert outbox.defer(message, clock.now + 3600, "daily quota exhausted") is True
+    assert status(outbox) == [(PENDING, 0)]
+
+    clock.now += 3599
+    assert outbox.lease("worker") is None
+    clock.now += 1
+    assert outbox.lease("worker").attempts == 1
+
+
+SINK_SERVICE = {
+    "name": "Sink",
+    "email": "sender@example.com",
+    "password": "x",
+    "smtp_server": "127.0.0.1",
+    "smtp_port": 2525,
+    "max_recipients_per_message": 2,
+}
+
+
+def test_render_completes_a_campaign_a_crashed_run_started(tmp_path, monkeypatch):
+    """Test rendering again queues only the batches a crashed render did not reach"""
+    from send_single_email import GovernmentEmailSender
+
+    service = dict(SINK_SERVICE)
+    sender = GovernmentEmailSender(email_services=[service], cache_dir=tmp_path)
+    sender.recipient_emails = [f"r{number}@example.com" for number in range(6)]
+    sender.email_distribution_config = dict(
+        sender.email_distribution_config, fan_out=False, use_cc=False, use_bcc=False
+    )
+    template = sender.get_email_template(1)
+
+    spool_message = sender._spool_message
+    calls = []
+
+    def crash_on_second(*args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise OSError("runner cancelled")
+        return spool_message(*args)
+
+    monkeypatch.setattr(sender, "_spool_message", crash_on_second)
+    with pytest.raises(OSError):
+        sender.render_campaign(service, template, CAMPAIGN)
+    assert sender.outbox.counts()[PENDING] == 1
+
+    monkeypatch.setattr(sender, "_spool_message", spool_message)
+    assert sender.render_campaign(service, template, CAMPAIGN) == 2
+    assert sender.render_campaign(service, template, CAMPAIGN) == 0
+
+    queued = sender.outbox.manifest()
+    assert sorted(r for record in queued for r in record["recipients"]) == sender.recipient_emails
+    sender.outbox.close()
+
+
+def test_one_shot_run_leaves_retries_to_the_next_run(tmp_path, monkeypatch):
+    """Test a GitHub Actions drain does not sleep through backoff, and total waits are capped"""
+    from send_single_email import GovernmentEmailSender
+
+    sender = GovernmentEmailSender(email_services=[dict(SINK_SERVICE)], cache_dir=tmp_path)
+    monkeypatch.delenv("GITHUB_ACTIONS", raising=False)
+    max_wait, deadline = sender.retry_wait_limits()
+    assert sender.should_wait_for_retry(30, max_wait, deadline)
+    assert not sender.should_wait_for_retry(None, max_wait, deadline)
+    assert not sender.should_wait_for_retry(30, max_wait, deadline - 300)
+
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    max_wait, deadline = sender.retry_wait_limits()
+    assert not sender.should_wait_for_retry(30, max_wait, deadline)
+    assert sender.should_wait_for_retry(0, max_wait, deadline)
+    sender.outbox.close()
@@ -0,0 +1,108 @@
+"""
+Tests for the Quota Ledger of the Automated Government Email System
+Reservations are counted in hourly buckets, released into the bucket they
+were taken from, and expire with the rolling window.
+"""
+
+import pytest
+
+import quota_ledger as quota_ledger_module
+from quota_ledger import BUCKET_SECONDS, QuotaLedger
+from smtp_pool import service_key
+
+HOUR_START = 1_700_002_800  # A multiple of BUCKET_SECONDS
+SERVICE = {
+    "name": "Gmail",
+    "email": "sender@example.com",
+    "smtp_server": "smtp.example.com",
+    "smtp_port": 587,
+    "daily_quota": 3,
+    "daily_recipient_quota": 10,
+}
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(HOUR_START + BUCKET_SECONDS - 1)  # One second before the hour ends
+    monkeypatch.setattr(quota_ledger_module.time, "time", clock)
+    return clock
+
+
+def test_release_after_the_hour_returns_to_the_reserved_bucket(clock):
+    """Test a reservation released in the next hour is taken back from its own bucket"""
+    ledger = QuotaLedger()
+    token = ledger.reserve(SERVICE, 4)
+    assert token == HOUR_START
+
+    clock.now += 2  # Into the next hour
+    later = ledger.reserve(SERVICE, 1)
+    assert later == HOUR_START + BUCKET_SECONDS
+    assert ledger.usage(SERVICE) == {"messages": 2, "recipients": 5}
+
+    ledger.release(SERVICE, 4, token)
+    assert ledger.usage(SERVICE) == {"messages": 1, "recipients": 1}
+    assert ledger._usage[service_key(SERVICE)] == {
+        HOUR_START: [0, 0],
+        HOUR_START + BUCKET_SECONDS: [1, 1],
+    }
+
+
+def test_limits_count_every_bucket_in_the_window(clock):
+    """Test message and recipient limits apply to the sum of the hourly buckets"""
+    ledger = QuotaLedger()
+    assert ledger.reserve(SERVICE, 6) is not None
+    clock.now += 2
+    assert ledger.reserve(SERVICE, 5) is None  # 11 recipients > 10
+    assert ledger.reserve(SERVICE, 4) is not None
+    assert ledger.remaining(SERVICE) == {"messages": 1, "recipients": 0}
+    assert not ledger.has_capacity(SERVICE, 1)
+
+
+def test_bucket_expires_an_hour_after_the_window(clock):
+    """Test usage is kept until its whole bucket has left the window"""
+    ledger = QuotaLedger(window_hours=24)
+    for _ in range(3):
+        assert ledger.reserve(SERVICE, 1) is not None
+    assert ledger.reserve(SERVICE, 1) is None
+
+    reopens = HOUR_START + BUCKET_SECONDS + 24 * 3600
+    assert ledger.next_window_at([SERVICE]) == reopens
+
+    clock.now = reopens - 1
+    assert ledger.reserve(SERVICE, 1) is None
+    clock.now = reopens
+    assert ledger.usage(SERVICE) == {"messages": 0, "recipients": 0}
+    assert ledger.reserve(SERVICE, 1) == reopens // BUCKET_SECONDS * BUCKET_SECONDS
+
+
+def test_release_of_an_expired_bucket_is_ignored(clock):
+    """Test releasing a reservation whose bucket already expired changes nothing"""
+    ledger = QuotaLedger(window_hours=1)
+    token = ledger.reserve(SERVICE, 2)
+    clock.now += 2 * BUCKET_SECONDS
+    fresh = ledger.reserve(SERVICE, 1)
+    ledger.release(SERVICE, 2, token)
+    assert fresh != token
+    assert ledger.usage(SERVICE) == {"messages": 1, "recipients": 1}
+
+
+def test_usage_survives_save_and_load(tmp_path, clock):
+    """Test buckets are persisted with their start times"""
+    state_file = tmp_path / "quota_ledger.json"
+    ledger = QuotaLedger(state_file)
+    ledger.reserve(SERVICE, 2)
+    clock.now += 2
+    ledger.reserve(SERVICE, 3)
+    ledger.save()
+
+    restored = QuotaLedger(state_file)
+    assert restored.usage(SERVICE) == {"messages": 2, "recipients": 5}
+    assert restored.next_window_at([SERVICE]) == ledger.next_window_at([SERVICE])
@@ -0,0 +1,87 @@
+"""
+Tests for the Local Daemon Scheduler of the Automated Government Email System
+Due times stay on the configured wall-clock time when the timezone changes
+between standard and daylight saving time.
+"""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytz
+
+from scheduler import TimerScheduler, WeeklyTrigger
+
+EVERY_DAY = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+TIMEZONES = [ZoneInfo("America/New_York"), pytz.timezone("America/New_York")]
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def in_utc(*moments):
+    # Aware datetimes sharing a zoneinfo tzinfo compare and subtract by wall time
+    return [moment.astimezone(timezone.utc) for moment in moments]
+
+
+@pytest.mark.parametrize("tz", TIMEZONES, ids=["zoneinfo", "pytz"])
+def test_next_after_spring_forward(tz):
+    """Test the run after clocks go forward keeps 09:00 local, 23 hours later"""
+    trigger = WeeklyTrigger(EVERY_DAY, "09:00", tz)
+    saturday = trigger.next_after(utc(2025, 3, 8, 12, 0))
+    saturday, sunday = in_utc(saturday, trigger.next_after(saturday))
+
+    assert saturday == utc(2025, 3, 8, 14, 0)  # 09:00 EST
+    assert sunday == utc(2025, 3, 9, 13, 0)  # 09:00 EDT
+    assert sunday - saturday == timedelta(hours=23)
+    assert sunday.astimezone(tz).strftime("%H:%M %Z") == "09:00 EDT"
+
+
+@pytest.mark.parametrize("tz", TIMEZONES, ids=["zoneinfo", "pytz"])
+def test_next_after_fall_back(tz):
+    """Test the run after clocks go back keeps 09:00 local, 25 hours later"""
+    trigger = WeeklyTrigger(EVERY_DAY, "09:00", tz)
+    saturday = trigger.next_after(utc(2025, 11, 1, 12, 0))
+    saturday, sunday = in_utc(saturday, trigger.next_after(saturday))
+
+    assert saturday == utc(2025, 11, 1, 13, 0)  # 09:00 EDT
+    assert sunday == utc(2025, 11, 2, 14, 0)  # 09:00 EST
+    assert sunday - saturday == timedelta(hours=25)
+
+
+@pytest.mark.parametrize("tz", TIMEZONES, ids=["zoneinfo", "pytz"])
+def test_next_after_skipped_wall_time(tz):
+    """Test a time that does not exist on the spring-forward day still fires that day"""
+    trigger = WeeklyTrigger(["sunday"], "02:30", tz)
+    (due,) = in_utc(trigger.next_after(utc(2025, 3, 9, 0, 0)))
+    assert due == utc(2025, 3, 9, 7, 30)  # 03:30 EDT, the instant 02:30 EST would have been
+
+
+def test_repeated_wall_time_fires_once():
+    """Test a time that occurs twice on the fall-back day fires only once"""
+    trigger = WeeklyTrigger(EVERY_DAY, "01:30", ZoneInfo("America/New_York"))
+    first = trigger.next_after(utc(2025, 11, 2, 0, 0))
+    first, following = in_utc(first, trigger.next_after(first))
+
+    assert first == utc(2025, 11, 2, 5, 30)  # 01:30 EDT, the first occurrence
+    assert following == utc(2025, 11, 3, 6, 30)  # 01:30 EST the next day, not 06:30 UTC on the 2nd
+
+
+def test_scheduler_runs_across_dst_change():
+    """Test TimerScheduler runs at 09:00 local on both sides of the change"""
+    tz = ZoneInfo("America/New_York")
+    now = [utc(2025, 3, 8, 12, 0)]
+    runs = []
+    scheduler = TimerScheduler(clock=lambda: now[0], sleep=lambda seconds: None)
+    scheduler.add_job("daily", WeeklyTrigger(EVERY_DAY, "09:00", tz), lambda: runs.append(now[0]))
+
+    for expected in (utc(2025, 3, 8, 14, 0), utc(2025, 3, 9, 13, 0), utc(2025, 3, 10, 13, 0)):
+        assert in_utc(scheduler.next_due()) == [expected]
+        now[0] = expected - timedelta(seconds=1)
+        assert scheduler.run_pending() == 0
+        now[0] = expected
+        assert scheduler.run_pending() == 1
+
+    assert runs == [utc(2025, 3, 8, 14, 0), utc(2025, 3, 9, 13, 0), utc(2025, 3, 10, 13, 0)]
+    assert [moment.astimezone(tz).hour for moment in runs] == [9, 9, 9]
@@ -0,0 +1,84 @@
+"""
+Tests for the Compiled Email Templates of the Automated Government Email System
+CompiledTemplate.render must give exactly what str.format gives.
+"""
+
+from datetime import date
+
+import pytest
+
+from template_engine import CompiledTemplate, TemplateError, compile_template
+
+VARIABLES = {
+    "name": "Ali View Garden",
+    "count": 1234.5678,
+    "width": 12,
+    "precision": 2,
+    "items": ["first", "second"],
+    "mapping": {"key": "value"},
+    "date": date(2025, 1, 31),
+}
+
+TEMPLATES = [
+    "",
+    "no placeholders at all",
+    "Hello {name}!",
+    "{name}{name}",
+    "Escaped {{braces}} around {name} and {{{name}}}",
+    "{{}} {{{{ }}}}",
+    "repr {name!r}, str {name!s}, ascii {name!a}",
+    "aligned [{name:>20}] [{name:^20}] [{name:*<20}]",
+    "number {count:,.2f} {count:10.1f} {count:e}",
+    "nested [{name:>{width}}] [{count:.{precision}f}] [{count:{width}.{precision}f}]",
+    "conversion and spec [{name!r:>{width}}]",
+    "index {items[0]} and {items[1]}, key {mapping[key]}",
+    "attribute {date.year}-{date.month:02d} and {date:%d %B %Y}",
+    "Urdu text {name} سڑک کی مرمت",
+]
+
+
+@pytest.mark.parametrize("text", TEMPLATES)
+def test_render_matches_str_format(text):
+    """Test render gives the same result as str.format for each template"""
+    assert CompiledTemplate(text).render(VARIABLES) == text.format(**VARIABLES)
+
+
+def test_fields_are_root_variable_names():
+    """Test fields include nested spec variables and strip index and attribute access"""
+    template = CompiledTemplate("{items[0]} {date.year} {count:{width}.{precision}f}")
+    assert template.fields == {"items", "date", "count", "width", "precision"}
+
+
+def test_round_trip_through_dict():
+    """Test a template restored by from_dict renders the same"""
+    for text in TEMPLATES:
+        template = CompiledTemplate.from_dict(CompiledTemplate(text).to_dict())
+        assert template.render(VARIABLES) == text.format(**VARIABLES)
+
+
+def test_transform_keeps_placeholders():
+    """Test transform changes literal text only, including escaped braces"""
+    template = CompiledTemplate("<p>{{x}} {name!r:>{width}}</p>").transform(str.upper)
+    assert template.render(VARIABLES) == "<P>{{X}} {name!r:>{width}}</P>".format(**VARIABLES)
+
+
+def test_missing_variable_is_reported():
+    """Test rendering without a variable raises TemplateError instead of KeyError"""
+    with pytest.raises(TemplateError):
+        CompiledTemplate("{name} {unknown}").render(VARIABLES)
+
+
+def test_malformed_and_positional_templates_are_rejected():
+    """Test unbalanced braces and positional placeholders fail at compile time"""
+    for text in ("{name", "name}", "{}", "{0}"):
+        with pytest.raises(TemplateError):
+            CompiledTemplate(text)
+
+
+def test_compile_template_validates_known_variables():
+    """Test compile_template rejects variables outside the known set"""
+    template = {"subject_template": "{name}", "body_template": "{name} {typo}"}
+    with pytest.raises(TemplateError):
+        compile_template(template, 1, {"name"})
+    compiled = compile_template(template, 1, {"name", "typo"})
+    assert compiled["body_template"].render({"name": "a", "typo": "b"}) == "a b"
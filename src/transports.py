@@ -0,0 +1,226 @@
+"""
+Local Transports for the Automated Government Email System
+Backends that hand a message to something other than a remote SMTP server:
+a local MTA's sendmail program, a directory of .eml files, or nothing at
+all (for benchmarks). Each one offers the same interface as the SMTP
+connection pool and its sessions, so the sender can use either.
+
+SMTP, implicit-TLS SMTPS and LMTP services are served by SMTPConnectionPool.
+"""
+
+import abc
+import itertools
+import os
+import threading
+import time
+from pathlib import Path
+
+from mime_stream import iter_message, iter_spool_file
+
+SMTP_TRANSPORTS = ("smtp", "smtps", "lmtp")
+LOCAL_TRANSPORTS = ("sendmail", "file", "null")
+
+EX_NOUSER = 67  # sendmail exit status for an unknown recipient (sysexits.h)
+
+# Defaults for RELAY_SERVICES entries - a local relay queues mail itself, so it
+# is not paced and its quota is whatever the remote delivery side allows
+LOCAL_SERVICE_DEFAULTS = {
+    "transport": "sendmail",
+    "smtp_server": "localhost",
+    "smtp_port": 0,
+    "password": "",
+    "paced": False,
+    "messages_per_minute": 600,
+    "daily_quota": 100000,
+}
+
+
+def _unix_newlines(chunks):
+    """Convert CRLF chunks to LF line endings, handling CRLF split across chunks"""
+    carry = b""
+    for chunk in chunks:
+        chunk = carry + chunk
+        carry = b"\r" if chunk.endswith(b"\r") else b""
+        if carry:
+            chunk = chunk[:-1]
+        yield chunk.replace(b"\r\n", b"\n")
+    if carry:
+        yield carry
+
+
+class LocalTransport(abc.ABC):
+    """Pool and session interface around a deliver() method
+
+    acquire() returns the transport itself - there is no connection to
+    check out, so release, discard and close_all have nothing to do.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.messages_sent = 0
+        self.recipients_sent = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    # Pool interface
+    def acquire(self, service, recipient_count=1):
+        return self
+
+    def release(self, session):
+        pass
+
+    def discard(self, session):
+        pass
+
+    def close_all(self):
+        pass
+
+    # Session interface
+    def has_room_for(self, recipient_count):
+        return True
+
+    @abc.abstractmethod
+    def deliver(self, from_addr, to_addrs, chunks):
+        """Hand over one message given as CRLF byte chunks; returns refused recipients"""
+
+    def _count(self, to_addrs, size):
+        with self._lock:
+            self.messages_sent += 1
+            self.recipients_sent += len(to_addrs)
+            self.bytes_sent += size
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        if isinstance(msg, str):
+            msg = msg.encode("utf-8")
+        msg = msg.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+        return self.deliver(from_addr, to_addrs, [msg])
+
+    def send_streaming(self, from_addr, to_addrs, msg, chunk_size=64 * 1024):
+        return self.deliver(from_addr, to_addrs, iter_message(msg, chunk_size))
+
+    def send_chunks(self, from_addr, to_addrs, chunks):
+        return self.deliver(from_addr, to_addrs, chunks)
+
+    def send_spool(self, from_addr, to_addrs, file_path, header=b"", buffer_size=256 * 1024):
+        # Spool files are dot-stuffed for SMTP - undo it for local delivery
+        chunks = itertools.chain([header], iter_spool_file(file_path, buffer_size))
+        return self.deliver(from_addr, to_addrs, chunks)
+
+
+class SendmailTransport(LocalTransport):
+    """Pipes each message into a local MTA's sendmail program (Postfix, Exim, msmtp...)"""
+
+    name = "sendmail"
+
+    def __init__(self, command="/usr/sbin/sendmail", timeout=60):
+        super().__init__()
+        self.command = command
+        self.timeout = timeout
+
+    # shutil, smtplib and subprocess are imported here - most runs never use this transport
+
+    def acquire(self, service, recipient_count=1):
+        import shutil
+        import smtplib
+
+        if not shutil.which(self.command):
+            raise smtplib.SMTPConnectError(421, f"sendmail program not found: {self.command}")
+        return self
+
+    def deliver(self, from_addr, to_addrs, chunks):
+        import smtplib
+        import subprocess
+
+        # -i: a line holding a single "." does not end the message
+        process = subprocess.Popen(
+            [self.command, "-i", "-f", from_addr, "--", *to_addrs],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        size = 0
+        try:
+            for chunk in _unix_newlines(chunks):
+                process.stdin.write(chunk)
+                size += len(chunk)
+        except BrokenPipeError:
+            pass  # The MTA gave up early - its exit status says why
+
+        try:
+            # Closes stdin, ending the message, and waits for the MTA to queue it
+            _, errors = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise smtplib.SMTPDataError(451, f"{self.command} timed out")
+
+        reason = errors.decode("utf-8", "replace").strip() or f"exit status {process.returncode}"
+        if process.returncode == EX_NOUSER:
+            raise smtplib.SMTPRecipientsRefused(
+                {recipient: (550, reason.encode()) for recipient in to_addrs}
+            )
+        if process.returncode != 0:
+            raise smtplib.SMTPDataError(451, reason)
+
+        self._count(to_addrs, size)
+        return {}
+
+
+class FileTransport(LocalTransport):
+    """Writes each message to a .eml file instead of sending it"""
+
+    name = "file"
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sequence = itertools.count(1)
+
+    def deliver(self, from_addr, to_addrs, chunks):
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._sequence):06d}.eml"
+        message_file = self.directory / name
+        tmp_file = message_file.with_suffix(".tmp")
+
+        size = 0
+        with open(tmp_file, "wb") as f:
+            # Envelope recorded ahead of the message, as a delivery agent would
+            f.write(f"X-Envelope-From: <{from_addr}>\r\n".encode("utf-8"))
+            f.write(f"X-Envelope-To: {', '.join(to_addrs)}\r\n".encode("utf-8"))
+            for chunk in chunks:
+                size += f.write(chunk)
+        tmp_file.replace(message_file)
+
+        self._count(to_addrs, size)
+        return {}
+
+
+class NullTransport(LocalTransport):
+    """Accepts and discards every message - measures everything but the network"""
+
+    name = "null"
+
+    def deliver(self, from_addr, to_addrs, chunks):
+        self._count(to_addrs, sum(len(chunk) for chunk in chunks))
+        return {}
+
+
+def create_local_transport(service, config, cache_dir):
+    """Build the local transport named by a service's "transport" setting
+
+    A service may override TRANSPORT_CONFIG's sendmail_command or file_directory.
+    """
+    transport = service.get("transport", "smtp")
+    if transport == "sendmail":
+        return SendmailTransport(
+            service.get("sendmail_command", config.get("sendmail_command", "/usr/sbin/sendmail")),
+            timeout=config.get("sendmail_timeout", 60),
+        )
+    if transport == "file":
+        directory = service.get("file_directory", config.get("file_directory", "sent_mail"))
+        return FileTransport(Path(cache_dir) / directory)
+    if transport == "null":
+        return NullTransport()
+    raise ValueError(f"Unknown transport: {transport}")
+